@@ -1,10 +1,10 @@
 from django.contrib import admin
 from .models import (
-    BrandKit, Asset, PresentationTemplate,
+    BrandKit, Asset, AssetBlob, AssetDerivative, AssetUpload, PresentationTemplate,
     Presentation, PresentationAccess,
     Frame, FrameConnection, Element,
-    Comment, PresentationVersion, Recording,
-    CollaborationSession, StudentGroup, Student
+    Comment, DeletedRecord, PresentationVersion, Recording,
+    CollaborationSession, StudentGroup, Student, BackgroundJob
 )
 
 
@@ -18,10 +18,31 @@ class BrandKitAdmin(admin.ModelAdmin):
 
 @admin.register(Asset)
 class AssetAdmin(admin.ModelAdmin):
-    list_display = ("name", "asset_type", "group", "uploaded_by", "created_at")
+    list_display = ("name", "asset_type", "file_size", "group", "uploaded_by", "created_at")
     list_filter = ("asset_type", "created_at")
-    search_fields = ("name",)
-    raw_id_fields = ("uploaded_by", "group")
+    search_fields = ("name", "content_hash")
+    raw_id_fields = ("uploaded_by", "group", "blob")
+
+
+@admin.register(AssetBlob)
+class AssetBlobAdmin(admin.ModelAdmin):
+    list_display = ("content_hash", "file_path", "size", "ref_count", "unreferenced_at")
+    list_filter = ("unreferenced_at",)
+    search_fields = ("content_hash", "file_path")
+
+
+@admin.register(AssetDerivative)
+class AssetDerivativeAdmin(admin.ModelAdmin):
+    list_display = ("asset", "kind", "format", "width", "height", "file_size", "created_at")
+    list_filter = ("kind", "format")
+    raw_id_fields = ("asset",)
+
+
+@admin.register(AssetUpload)
+class AssetUploadAdmin(admin.ModelAdmin):
+    list_display = ("name", "status", "received_bytes", "total_size", "uploaded_by", "updated_at")
+    list_filter = ("status",)
+    raw_id_fields = ("uploaded_by", "group", "asset")
 
 
 @admin.register(PresentationTemplate)
@@ -84,10 +105,17 @@ class CommentAdmin(admin.ModelAdmin):
     text_preview.short_description = "Text"
 
 
+@admin.register(DeletedRecord)
+class DeletedRecordAdmin(admin.ModelAdmin):
+    list_display = ("kind", "object_id", "presentation", "deleted_at")
+    list_filter = ("kind", "deleted_at")
+    raw_id_fields = ("presentation",)
+
+
 @admin.register(PresentationVersion)
 class PresentationVersionAdmin(admin.ModelAdmin):
-    list_display = ("presentation", "version_number", "created_by", "created_at")
-    list_filter = ("created_at",)
+    list_display = ("presentation", "version_number", "is_autosave", "is_keyframe", "encoding", "created_by", "created_at")
+    list_filter = ("is_autosave", "created_at")
     search_fields = ("presentation__title", "notes")
     raw_id_fields = ("presentation", "created_by")
 
@@ -121,3 +149,11 @@ class StudentAdmin(admin.ModelAdmin):
     search_fields = ("first_name", "last_name", "email")
     list_filter = ("group",)
     raw_id_fields = ("group", "user")
+
+
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "status", "progress", "created_by", "created_at", "finished_at")
+    list_filter = ("kind", "status", "created_at")
+    raw_id_fields = ("created_by",)
+    readonly_fields = ("created_at", "started_at", "finished_at")
@@ -0,0 +1,159 @@
+"""
+Response cache for AI calls.
+
+Results are keyed by (method, normalized input, model, parameters), expire
+after a TTL and are evicted least-recently-used beyond a size cap. Identical
+requests that arrive while the first one is still running wait for its result
+instead of issuing another upstream call.
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_input(value):
+    """Collapse insignificant whitespace so trivially different prompts share a key."""
+    if isinstance(value, str):
+        return _WHITESPACE.sub(' ', value).strip()
+    if isinstance(value, dict):
+        return {key: normalize_input(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize_input(item) for item in value]
+    return value
+
+
+def make_cache_key(method, payload, model, params=None):
+    raw = json.dumps(
+        {
+            'method': method,
+            'input': normalize_input(payload),
+            'model': model,
+            'params': params or {},
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class _InFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class AIResponseCache:
+    """Thread-safe TTL + LRU cache with request coalescing."""
+
+    def __init__(self, ttl=3600, max_entries=1000, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, key):
+        with self._lock:
+            return self._get_locked(key)
+
+    def _get_locked(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_call(self, key, fn):
+        """
+        Return the cached value for key, or compute it with fn().
+
+        Concurrent callers with the same key share a single fn() call. Errors
+        are propagated to every waiter and are not cached.
+        """
+        with self._lock:
+            value = self._get_locked(key)
+            if value is not None:
+                self.hits += 1
+                return value
+            pending = self._in_flight.get(key)
+            if pending is None:
+                pending = self._in_flight[key] = _InFlight()
+                owner = True
+                self.misses += 1
+            else:
+                owner = False
+                self.coalesced += 1
+
+        if not owner:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.value
+
+        try:
+            pending.value = fn()
+        except Exception as exc:
+            pending.error = exc
+            raise
+        else:
+            self.set(key, pending.value)
+            return pending.value
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            pending.done.set()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'in_flight': len(self._in_flight),
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+            }
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_ai_response_cache():
+    """Process-wide cache configured from settings."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = AIResponseCache(
+                ttl=settings.AI_CACHE_TTL,
+                max_entries=settings.AI_CACHE_MAX_ENTRIES,
+            )
+        return _default_cache
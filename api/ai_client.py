@@ -0,0 +1,237 @@
+"""
+Process-wide manager for the Anthropic client.
+
+A single client (and therefore a single HTTP connection pool with keep-alive)
+is shared by every PresentationAIService instead of creating one per request.
+The manager also bounds the number of concurrent upstream calls, retries
+transient failures with jittered exponential backoff, applies a per-user rate
+limit and records in-flight / queued / latency metrics.
+"""
+
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import anthropic
+from django.conf import settings
+
+RETRYABLE_ERRORS = (
+    anthropic.APIConnectionError,  # include și APITimeoutError
+    anthropic.RateLimitError,
+    anthropic.InternalServerError,
+)
+
+
+class AIRateLimitError(Exception):
+    """The user exceeded AI_RATE_LIMIT_PER_USER requests in the current window."""
+
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        super().__init__(f"Too many AI requests. Try again in {retry_after} seconds.")
+
+
+class AIQueueTimeout(Exception):
+    """No concurrency slot became free within AI_QUEUE_TIMEOUT."""
+
+
+class AIClientManager:
+    """Shared client with bounded concurrency, retries and per-user rate limiting."""
+
+    def __init__(
+        self,
+        client_factory=None,
+        max_concurrency=8,
+        queue_timeout=30,
+        max_retries=3,
+        backoff_base=0.5,
+        backoff_max=8.0,
+        rate_limit=20,
+        rate_window=60,
+        retry_on=RETRYABLE_ERRORS,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        self.client_factory = client_factory or self._default_client
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.retry_on = retry_on
+        self.clock = clock
+        self.sleep = sleep
+
+        self._client = None
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._user_calls = defaultdict(deque)
+
+        self.in_flight = 0
+        self.queued = 0
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.rate_limited = 0
+        self._latencies = deque(maxlen=500)
+
+    @staticmethod
+    def _default_client():
+        # Reîncercările sunt făcute de manager, cu jitter
+        return anthropic.Anthropic(
+            api_key=settings.ANTHROPIC_API_KEY,
+            base_url=getattr(settings, 'ANTHROPIC_BASE_URL', None),
+            timeout=settings.AI_REQUEST_TIMEOUT,
+            max_retries=0,
+        )
+
+    @property
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                self._client = self.client_factory()
+            return self._client
+
+    def managed_client(self):
+        """Anthropic-compatible client whose calls go through this manager."""
+        return _ManagedClient(self)
+
+    # ----- rate limiting -----
+    def check_rate_limit(self, user_id):
+        """Record a request for user_id, raising AIRateLimitError over the limit."""
+        if user_id is None or not self.rate_limit:
+            return
+        now = self.clock()
+        with self._lock:
+            calls = self._user_calls[user_id]
+            while calls and calls[0] <= now - self.rate_window:
+                calls.popleft()
+            if len(calls) >= self.rate_limit:
+                self.rate_limited += 1
+                retry_after = max(1, round(calls[0] + self.rate_window - now))
+                raise AIRateLimitError(retry_after)
+            calls.append(now)
+
+    # ----- concurrency + retry -----
+    @contextmanager
+    def _slot(self):
+        with self._lock:
+            self.queued += 1
+        acquired = self._slots.acquire(timeout=self.queue_timeout)
+        with self._lock:
+            self.queued -= 1
+            if acquired:
+                self.in_flight += 1
+        if not acquired:
+            raise AIQueueTimeout("AI service is busy, try again later")
+
+        started = self.clock()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.requests += 1
+                self._latencies.append(self.clock() - started)
+            self._slots.release()
+
+    def _backoff(self, attempt):
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, delay)  # full jitter
+
+    def call(self, fn):
+        """Run fn() in a concurrency slot, retrying transient API errors."""
+        attempt = 0
+        while True:
+            try:
+                with self._slot():
+                    return fn()
+            except self.retry_on:
+                if attempt >= self.max_retries:
+                    with self._lock:
+                        self.failures += 1
+                    raise
+                with self._lock:
+                    self.retries += 1
+            except Exception:
+                with self._lock:
+                    self.failures += 1
+                raise
+            self.sleep(self._backoff(attempt))
+            attempt += 1
+
+    def metrics(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            in_flight = self.in_flight
+            queued = self.queued
+            counters = {
+                'requests': self.requests,
+                'retries': self.retries,
+                'failures': self.failures,
+                'rate_limited': self.rate_limited,
+            }
+
+        def percentile(fraction):
+            if not latencies:
+                return None
+            index = min(len(latencies) - 1, int(fraction * len(latencies)))
+            return round(latencies[index], 3)
+
+        return {
+            'in_flight': in_flight,
+            'queued': queued,
+            'max_concurrency': self.max_concurrency,
+            **counters,
+            'latency_seconds': {
+                'avg': round(sum(latencies) / len(latencies), 3) if latencies else None,
+                'p50': percentile(0.5),
+                'p95': percentile(0.95),
+                'samples': len(latencies),
+            },
+        }
+
+
+class _ManagedMessages:
+    def __init__(self, manager):
+        self.manager = manager
+
+    def create(self, **params):
+        return self.manager.call(lambda: self.manager.client.messages.create(**params))
+
+    @contextmanager
+    def stream(self, **params):
+        # Un stream nu poate fi reîncercat după ce a început să emită text,
+        # deci ocupă un slot pe toată durata lui, fără retry.
+        with self.manager._slot():
+            with self.manager.client.messages.stream(**params) as stream:
+                yield stream
+
+
+class _ManagedClient:
+    def __init__(self, manager):
+        self.messages = _ManagedMessages(manager)
+
+
+_default_manager = None
+_default_manager_lock = threading.Lock()
+
+
+def get_ai_client_manager():
+    """Process-wide manager configured from settings."""
+    global _default_manager
+    with _default_manager_lock:
+        if _default_manager is None:
+            _default_manager = AIClientManager(
+                max_concurrency=settings.AI_MAX_CONCURRENCY,
+                queue_timeout=settings.AI_QUEUE_TIMEOUT,
+                max_retries=settings.AI_MAX_RETRIES,
+                backoff_base=settings.AI_RETRY_BACKOFF,
+                backoff_max=settings.AI_RETRY_BACKOFF_MAX,
+                rate_limit=settings.AI_RATE_LIMIT_PER_USER,
+                rate_window=settings.AI_RATE_LIMIT_WINDOW,
+            )
+        return _default_manager
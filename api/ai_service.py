@@ -2,64 +2,81 @@
 AI Service for Presentation Generation using Anthropic Claude API.
 """
 
+import copy
 import json
 import anthropic
 from django.conf import settings
 
+from .ai_cache import get_ai_response_cache, make_cache_key
+from .ai_client import get_ai_client_manager
+from .json_stream import JSONObjectStream
+
 
 class PresentationAIService:
     """Service for generating presentation content using AI."""
 
-    def __init__(self):
-        self.api_key = settings.ANTHROPIC_API_KEY
-        if not self.api_key:
-            raise ValueError("ANTHROPIC_API_KEY not configured in settings")
-        self.client = anthropic.Anthropic(api_key=self.api_key)
-
-    def generate_presentation_structure(self, prompt: str, num_slides: int = None) -> dict:
+    def __init__(self, client=None, cache=None):
         """
-        Generate a complete presentation structure from a user prompt.
-
         Args:
-            prompt: User's description of what presentation they want
-            num_slides: Optional number of slides to generate (if not specified, AI decides)
+            client: Optional Anthropic-compatible client (e.g. a local stub in tests);
+                    defaults to the shared client from AIClientManager.
+            cache: Optional AIResponseCache; defaults to the process-wide cache
+                   when AI_CACHE_ENABLED is set.
+        """
+        if client is None:
+            self.api_key = settings.ANTHROPIC_API_KEY
+            if not self.api_key:
+                raise ValueError("ANTHROPIC_API_KEY not configured in settings")
+            # Client comun pe proces (connection pool, retry, limită de concurență)
+            client = get_ai_client_manager().managed_client()
+        self.client = client
+
+        if cache is None and getattr(settings, 'AI_CACHE_ENABLED', False):
+            cache = get_ai_response_cache()
+        self.cache = cache
+
+    def _complete(self, method: str, parse=None, use_cache: bool = False, **params):
+        """
+        Call the Messages API and return the response text (or parse(text)).
 
-        Returns:
-            dict with structure:
-            {
-                "title": "Presentation Title",
-                "description": "Brief description",
-                "frames": [
-                    {
-                        "title": "Frame Title",
-                        "order": 0,
-                        "background_color": "#ffffff",
-                        "elements": [
-                            {
-                                "type": "TEXT",
-                                "content": {
-                                    "text": "Content here",
-                                    "fontSize": 48,
-                                    "fontFamily": "Arial",
-                                    "color": "#000000",
-                                    "align": "center",
-                                    "fontWeight": "bold"
-                                },
-                                "position": {
-                                    "x": 100,
-                                    "y": 100,
-                                    "width": 800,
-                                    "height": 100,
-                                    "rotation": 0,
-                                    "z_index": 1
-                                }
-                            }
-                        ]
-                    }
-                ]
-            }
+        With use_cache, results are cached per (method, normalized input,
+        model, parameters) and identical in-flight calls are coalesced. Only
+        successfully parsed results are cached.
         """
+        def call():
+            message = self.client.messages.create(**params)
+            response_text = message.content[0].text.strip()
+            return parse(response_text) if parse else response_text
+
+        if not use_cache or self.cache is None:
+            return call()
 
+        payload = {
+            'system': params.get('system', ''),
+            'messages': params.get('messages', []),
+        }
+        options = {
+            key: value for key, value in params.items()
+            if key not in ('model', 'system', 'messages')
+        }
+        key = make_cache_key(method, payload, params.get('model'), options)
+        # Copie, ca apelanții să nu poată modifica valoarea din cache
+        return copy.deepcopy(self.cache.get_or_call(key, call))
+
+    @staticmethod
+    def _parse_json_response(response_text: str):
+        """Parse a JSON answer, tolerating a surrounding markdown code block."""
+        if response_text.startswith("```json"):
+            response_text = response_text[7:]
+        if response_text.startswith("```"):
+            response_text = response_text[3:]
+        if response_text.endswith("```"):
+            response_text = response_text[:-3]
+        return json.loads(response_text.strip())
+
+    @staticmethod
+    def _presentation_structure_prompt(prompt: str, num_slides: int = None):
+        """System prompt and user message for generating a presentation."""
         system_prompt = """You are an expert presentation designer. Generate structured presentation content based on user prompts.
 
 Your output MUST be valid JSON with this exact structure:
@@ -117,8 +134,57 @@ IMPORTANT: Return ONLY the JSON, no other text."""
         else:
             user_message += "\n\nCreate an appropriate number of slides (typically 5-10) for this topic."
 
+        return system_prompt, user_message
+
+    def generate_presentation_structure(self, prompt: str, num_slides: int = None) -> dict:
+        """
+        Generate a complete presentation structure from a user prompt.
+
+        Args:
+            prompt: User's description of what presentation they want
+            num_slides: Optional number of slides to generate (if not specified, AI decides)
+
+        Returns:
+            dict with structure:
+            {
+                "title": "Presentation Title",
+                "description": "Brief description",
+                "frames": [
+                    {
+                        "title": "Frame Title",
+                        "order": 0,
+                        "background_color": "#ffffff",
+                        "elements": [
+                            {
+                                "type": "TEXT",
+                                "content": {
+                                    "text": "Content here",
+                                    "fontSize": 48,
+                                    "fontFamily": "Arial",
+                                    "color": "#000000",
+                                    "align": "center",
+                                    "fontWeight": "bold"
+                                },
+                                "position": {
+                                    "x": 100,
+                                    "y": 100,
+                                    "width": 800,
+                                    "height": 100,
+                                    "rotation": 0,
+                                    "z_index": 1
+                                }
+                            }
+                        ]
+                    }
+                ]
+            }
+        """
+
+        system_prompt, user_message = self._presentation_structure_prompt(prompt, num_slides)
+
         try:
-            message = self.client.messages.create(
+            response_text = self._complete(
+                'generate_presentation_structure',
                 model="claude-sonnet-4-5",
                 max_tokens=4096,
                 temperature=0.7,
@@ -132,7 +198,6 @@ IMPORTANT: Return ONLY the JSON, no other text."""
             )
 
             # Extract JSON from response
-            response_text = message.content[0].text.strip()
 
             # Remove markdown code blocks if present
             if response_text.startswith("```json"):
@@ -160,6 +225,38 @@ IMPORTANT: Return ONLY the JSON, no other text."""
         except Exception as e:
             raise Exception(f"AI generation failed: {str(e)}")
 
+    def stream_presentation_structure(self, prompt: str, num_slides: int = None):
+        """
+        Streaming variant of generate_presentation_structure.
+
+        Yields (key, index, value) events as soon as each part of the JSON is
+        complete: ('title', None, '...'), ('frames', 0, {...}), ...
+        """
+        system_prompt, user_message = self._presentation_structure_prompt(prompt, num_slides)
+        parser = JSONObjectStream()
+
+        try:
+            with self.client.messages.stream(
+                model="claude-sonnet-4-5",
+                max_tokens=4096,
+                temperature=0.7,
+                system=system_prompt,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": user_message
+                    }
+                ]
+            ) as stream:
+                for text in stream.text_stream:
+                    yield from parser.feed(text)
+            parser.close()
+
+        except anthropic.APIError as e:
+            raise Exception(f"Anthropic API error: {str(e)}")
+        except ValueError as e:
+            raise Exception(f"Failed to parse AI response as JSON: {str(e)}")
+
     def generate_quiz_from_slides(self, slides: list[str], num_questions: int = 6) -> dict:
         """
         Generate quiz questions (Kahoot-style) from provided slide summaries.
@@ -206,7 +303,8 @@ Guidelines:
         user_message = f"""Slides:\n{slide_context}\n\nCreate {clamped_questions} quiz questions."""
 
         try:
-            message = self.client.messages.create(
+            response_text = self._complete(
+                'generate_quiz_from_slides',
                 model="claude-sonnet-4-5",
                 max_tokens=3072,
                 temperature=0.6,
@@ -219,7 +317,6 @@ Guidelines:
                 ]
             )
 
-            response_text = message.content[0].text.strip()
             if response_text.startswith("```json"):
                 response_text = response_text[7:]
             if response_text.startswith("```"):
@@ -266,7 +363,9 @@ Guidelines:
         prompt = style_prompts.get(style, style_prompts["professional"])
 
         try:
-            message = self.client.messages.create(
+            return self._complete(
+                'enhance_slide_content',
+                use_cache=True,
                 model="claude-sonnet-4-5",
                 max_tokens=1024,
                 temperature=0.7,
@@ -278,8 +377,6 @@ Guidelines:
                 ]
             )
 
-            return message.content[0].text.strip()
-
         except Exception as e:
             raise Exception(f"Text enhancement failed: {str(e)}")
 
@@ -294,7 +391,10 @@ Guidelines:
             List of visual suggestions with type and keywords
         """
         try:
-            message = self.client.messages.create(
+            return self._complete(
+                'suggest_visuals',
+                parse=self._parse_json_response,
+                use_cache=True,
                 model="claude-sonnet-4-5",
                 max_tokens=1024,
                 temperature=0.7,
@@ -319,22 +419,6 @@ Suggest 3-5 visual elements that would enhance the message. Return ONLY the JSON
                 ]
             )
 
-            response_text = message.content[0].text.strip()
-
-            # Remove markdown code blocks if present
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-
-            response_text = response_text.strip()
-
-            import json
-            suggestions = json.loads(response_text)
-            return suggestions
-
         except Exception as e:
             raise Exception(f"Visual suggestion failed: {str(e)}")
 
@@ -350,7 +434,10 @@ Suggest 3-5 visual elements that would enhance the message. Return ONLY the JSON
             Dict with advice and suggestions
         """
         try:
-            message = self.client.messages.create(
+            return self._complete(
+                'give_slide_advice',
+                parse=self._parse_json_response,
+                use_cache=True,
                 model="claude-sonnet-4-5",
                 max_tokens=2048,
                 temperature=0.7,
@@ -381,21 +468,5 @@ Provide specific, actionable advice to make this slide more effective."""
                 ]
             )
 
-            response_text = message.content[0].text.strip()
-
-            # Remove markdown code blocks if present
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-
-            response_text = response_text.strip()
-
-            import json
-            advice = json.loads(response_text)
-            return advice
-
         except Exception as e:
             raise Exception(f"Slide advice failed: {str(e)}")
@@ -0,0 +1,257 @@
+"""
+AI operations shared by the synchronous endpoints and the background job queue.
+
+Each operation takes plain arguments and returns a JSON-serializable dict, so
+the same code runs inline in a view or inside a BackgroundJob worker.
+"""
+
+import json
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+from game_module.serializers import GameSerializer
+
+from .ai_service import PresentationAIService
+from .jobs import job_handler
+from .materializers import materialize_frames, materialize_game, materialize_presentation
+from .models import Presentation
+from .revisions import next_revision
+from .presentation_serializers import FrameSerializer
+from .thumbnail_service import schedule_thumbnails
+
+logger = logging.getLogger(__name__)
+
+
+class AITaskError(Exception):
+    """The AI call succeeded technically but produced unusable output."""
+
+
+def rewrite_text(text, mode='professional'):
+    ai_service = PresentationAIService()
+    rewritten = ai_service.enhance_slide_content(text, style=mode)
+    return {
+        'original': text,
+        'rewritten': rewritten,
+        'mode': mode
+    }
+
+
+def suggest_visuals(text):
+    ai_service = PresentationAIService()
+    return {'suggestions': ai_service.suggest_visuals(text)}
+
+
+def get_slide_advice(slide_content, context=''):
+    ai_service = PresentationAIService()
+    return ai_service.give_slide_advice(slide_content, context)
+
+
+def broadcast_frame_created(frame):
+    """Push a new frame to editors connected to the presentation group."""
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    message = {
+        'type': 'frame_create',
+        'frame': FrameSerializer(frame).data,
+    }
+    try:
+        async_to_sync(channel_layer.group_send)(
+            f'presentation_{frame.presentation_id}',
+            # sender_id None: mesajul ajunge la toți clienții din grup
+            {'type': 'broadcast_message', 'message': message, 'sender_id': None},
+        )
+    except Exception:
+        logger.exception("Could not broadcast frame %s", frame.id)
+
+
+def generate_full_presentation(user, prompt, num_slides=None, progress=None, stream=False):
+    """
+    Generate a presentation with AI and store it with its frames and elements.
+
+    Args:
+        progress: optional callback(percent, message, event=None)
+        stream: create each frame as soon as the model has produced it and
+                broadcast it to the presentation WebSocket group
+    """
+    progress = progress or (lambda percent, message, event=None: None)
+
+    # Initialize AI service
+    ai_service = PresentationAIService()
+
+    if stream:
+        return _generate_full_presentation_streaming(ai_service, user, prompt, num_slides, progress)
+
+    # Generate presentation structure
+    progress(10, 'Generating presentation structure')
+    presentation_data = ai_service.generate_presentation_structure(
+        prompt=prompt,
+        num_slides=num_slides
+    )
+    progress(80, 'Saving frames')
+
+    # Frames, elements și presentation_path într-o singură tranzacție
+    presentation = materialize_presentation(user, presentation_data)
+    frame_ids = json.loads(presentation.presentation_path)
+
+    schedule_thumbnails(presentation.id)
+
+    return {
+        'presentation_id': presentation.id,
+        'title': presentation.title,
+        'num_frames': len(frame_ids),
+        'message': 'Presentation generated successfully'
+    }
+
+
+def _is_frame_data(value):
+    if not isinstance(value, dict):
+        return False
+    elements = value.get('elements') or []
+    return isinstance(elements, list) and all(isinstance(item, dict) for item in elements)
+
+
+def _generate_full_presentation_streaming(ai_service, user, prompt, num_slides, progress):
+    # Validat înainte de a crea prezentarea, ca o eroare să nu lase una goală
+    expected_frames = int(num_slides) if num_slides else None
+
+    # Prezentarea există de la început: clientul intră în grupul
+    # presentation_<id> din primul eveniment, înainte de primul slide
+    presentation = materialize_presentation(user, {'title': prompt})
+    progress(5, 'Generating presentation structure', {'presentation_id': presentation.id})
+
+    frame_ids = []
+
+    try:
+        for key, index, value in ai_service.stream_presentation_structure(prompt, num_slides):
+            if key == 'frames' and index is not None:
+                # Aceleași reguli ca materialize_presentation; un slide invalid e sărit
+                if not _is_frame_data(value):
+                    logger.warning("Skipping malformed streamed frame %s", index)
+                    continue
+                with transaction.atomic():
+                    (frame,), _ = materialize_frames(presentation, [value], start_order=index)
+                frame_ids.append(frame.id)
+                Presentation.objects.filter(pk=presentation.pk).update(
+                    presentation_path=json.dumps(frame_ids), revision=next_revision()
+                )
+                broadcast_frame_created(frame)
+
+                total = expected_frames or max(len(frame_ids) + 1, 8)
+                percent = 10 + 85 * min(len(frame_ids), total) // total
+                progress(percent, f'Created slide {len(frame_ids)}', {
+                    'presentation_id': presentation.id,
+                    'frame_id': frame.id,
+                })
+            elif key in ('title', 'description') and isinstance(value, str):
+                setattr(presentation, key, value[:255] if key == 'title' else value)
+    except Exception:
+        # O prezentare parțială fără slide-uri nu are valoare
+        if not frame_ids:
+            presentation.delete()
+        raise
+
+    if not frame_ids:
+        presentation.delete()
+        raise AITaskError("AI nu a generat niciun slide. Încearcă din nou.")
+
+    presentation.presentation_path = json.dumps(frame_ids)
+    presentation.save()
+
+    schedule_thumbnails(presentation.id)
+
+    return {
+        'presentation_id': presentation.id,
+        'title': presentation.title,
+        'num_frames': len(frame_ids),
+        'message': 'Presentation generated successfully'
+    }
+
+
+def collect_slide_texts(presentation):
+    """Concatenated text content of every frame that has text."""
+    slide_texts = []
+    for frame in presentation.frames.prefetch_related('elements'):
+        snippets = []
+        for element in frame.elements.all():
+            if element.element_type != 'TEXT':
+                continue
+            raw_content = element.content or ''
+            text_content = ''
+            try:
+                parsed = json.loads(raw_content)
+                text_content = parsed.get('text', '')
+            except (ValueError, TypeError):
+                text_content = raw_content
+            text_content = (text_content or '').strip()
+            if text_content:
+                snippets.append(text_content)
+        if snippets:
+            slide_texts.append(" ".join(snippets))
+    return slide_texts
+
+
+def generate_game(presentation, user, slide_texts, num_questions=6, base_points=1000):
+    """Generate a Kahoot-style game from slide texts and store it."""
+    ai_service = PresentationAIService()
+    try:
+        quiz_payload = ai_service.generate_quiz_from_slides(slide_texts, num_questions=num_questions)
+    except Exception as exc:
+        raise AITaskError(str(exc))
+
+    title = quiz_payload.get('title') or f"{presentation.title} Quiz"
+    description = quiz_payload.get('description') or presentation.description or ''
+    questions = quiz_payload.get('questions', [])
+
+    if not questions:
+        raise AITaskError("AI nu a generat nicio întrebare. Încearcă din nou.")
+
+    game = materialize_game(user, title, description, questions, base_points=base_points)
+
+    return GameSerializer(game).data
+
+
+# ===== JOB HANDLERS =====
+@job_handler('ai_rewrite')
+def _rewrite_job(job):
+    job.report_progress(10, 'Rewriting text')
+    return rewrite_text(job.payload['text'], job.payload.get('mode', 'professional'))
+
+
+@job_handler('ai_suggest_visuals')
+def _suggest_visuals_job(job):
+    job.report_progress(10, 'Suggesting visuals')
+    return suggest_visuals(job.payload['text'])
+
+
+@job_handler('ai_slide_advice')
+def _slide_advice_job(job):
+    job.report_progress(10, 'Analyzing slide')
+    return get_slide_advice(job.payload['slide_content'], job.payload.get('context', ''))
+
+
+@job_handler('ai_generate_full_presentation')
+def _generate_full_presentation_job(job):
+    return generate_full_presentation(
+        job.user,
+        job.payload['prompt'],
+        job.payload.get('num_slides'),
+        progress=job.report_progress,
+        stream=job.payload.get('stream', False),
+    )
+
+
+@job_handler('ai_generate_game')
+def _generate_game_job(job):
+    presentation = Presentation.objects.get(pk=job.payload['presentation_id'])
+    job.report_progress(10, 'Generating quiz questions')
+    return generate_game(
+        presentation,
+        job.user,
+        job.payload['slide_texts'],
+        num_questions=job.payload.get('num_questions', 6),
+        base_points=job.payload.get('base_points', 1000),
+    )
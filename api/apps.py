@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        # Înregistrează handler-ele pentru job-urile din background
+        from . import ai_tasks, assignments  # noqa: F401
+        from . import signals  # noqa: F401
+        # Număr de query-uri și latență per request / mesaj WebSocket
+        from .instrumentation import install
+        install()
@@ -0,0 +1,388 @@
+"""
+Content-addressed blob store beneath Asset.
+
+Every distinct file (by sha256) is stored once, as an AssetBlob pointing at
+a path under MEDIA_ROOT (ASSET_STORAGE_DIR/ab/<sha256>.ext for uploads, the
+original location for files found by the duplicate scan). ref_count is the
+number of assets using the blob plus the number of brand kits listing it
+among their logos; reference changes go through acquire() / release().
+
+A blob whose count reaches zero is only marked (unreferenced_at) and
+collect_garbage() removes it, with its file and derivatives, after
+ASSET_BLOB_GC_GRACE seconds, so an upload racing with a delete can still
+pick it up. scan_assets() / merge_duplicate_assets() bring assets that
+predate the store into it:
+
+    python manage.py dedupe_assets [--dry-run]
+    python manage.py collect_asset_blobs [--recount]
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from collections import Counter
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Min
+from django.utils import timezone
+
+from .models import Asset, AssetBlob, AssetUpload, BrandKit, Element, Frame
+from .revisions import bump_revision
+
+logger = logging.getLogger(__name__)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for piece in iter(lambda: handle.read(settings.ASSET_UPLOAD_READ_SIZE), b''):
+            digest.update(piece)
+    return digest.hexdigest()
+
+
+def media_relative(url):
+    """Path relative to MEDIA_ROOT for a MEDIA_URL link, or None."""
+    if not url or not url.startswith(settings.MEDIA_URL):
+        return None
+    return url[len(settings.MEDIA_URL):]
+
+
+def source_path(asset):
+    """Local path of the asset file, or None when it is not stored under MEDIA_ROOT."""
+    relative = media_relative(asset.file_url)
+    if relative is None:
+        return None
+    path = Path(settings.MEDIA_ROOT, relative).resolve()
+    if Path(settings.MEDIA_ROOT).resolve() not in path.parents or not path.is_file():
+        return None
+    return path
+
+
+def blob_url(blob):
+    return settings.MEDIA_URL + blob.file_path
+
+
+def acquire(blob_ids):
+    """Add one reference per occurrence of each id; returns the number of blobs found."""
+    found = 0
+    for blob_id, count in Counter(filter(None, blob_ids)).items():
+        found += AssetBlob.objects.filter(pk=blob_id).update(
+            ref_count=F('ref_count') + count, unreferenced_at=None
+        )
+    return found
+
+
+def release(blob_ids):
+    """Drop references; blobs left without any are marked for garbage collection."""
+    counts = Counter(filter(None, blob_ids))
+    for blob_id, count in counts.items():
+        AssetBlob.objects.filter(pk=blob_id).update(ref_count=F('ref_count') - count)
+    if counts:
+        AssetBlob.objects.filter(
+            pk__in=counts, ref_count__lte=0, unreferenced_at__isnull=True
+        ).update(unreferenced_at=timezone.now())
+
+
+def store_blob(path, content_hash, extension=''):
+    """
+    Move a verified file into the store (or drop it when the content is
+    already stored) and return its blob with one reference taken.
+    """
+    for _ in range(3):
+        blob = AssetBlob.objects.filter(content_hash=content_hash).first()
+        if blob is None:
+            file_path = f"{settings.ASSET_STORAGE_DIR}/{content_hash[:2]}/{content_hash}{extension}"
+            target = Path(settings.MEDIA_ROOT, file_path)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(path, target)
+            try:
+                with transaction.atomic():
+                    return AssetBlob.objects.create(
+                        content_hash=content_hash, file_path=file_path, size=target.stat().st_size,
+                        ref_count=1, created_at=timezone.now(),
+                    )
+            except IntegrityError:
+                # Încărcare concurentă a aceluiași conținut: fișierul devine din nou temporar
+                os.replace(target, path)
+                continue
+
+        if acquire([blob.id]):
+            stored = Path(settings.MEDIA_ROOT, blob.file_path)
+            if stored.exists():
+                Path(path).unlink(missing_ok=True)
+            else:
+                stored.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(path, stored)
+            return blob
+        # Blob-ul a fost șters de GC între timp; îl recreăm
+    raise IntegrityError(f"Could not store blob {content_hash}")
+
+
+def link_asset_blob(asset):
+    """Point asset.blob at the blob stored at asset.file_url (if any), moving the reference."""
+    relative = media_relative(asset.file_url)
+    blob = AssetBlob.objects.filter(file_path=relative).first() if relative else None
+    blob_id = blob.id if blob else None
+    if blob_id == asset.blob_id:
+        return
+    with transaction.atomic():
+        acquire([blob_id])
+        release([asset.blob_id])
+        asset.blob_id = blob_id
+        if blob:
+            asset.content_hash = blob.content_hash
+        Asset.objects.filter(pk=asset.pk).update(blob_id=blob_id, content_hash=asset.content_hash)
+
+
+# ----- brand kit logos -----
+
+def _parse_logos(raw):
+    try:
+        logos = json.loads(raw) if raw else []
+    except (TypeError, ValueError):
+        return []
+    return logos if isinstance(logos, list) else []
+
+
+def _logo_url(logo):
+    return logo.get('url', '') if isinstance(logo, dict) else str(logo)
+
+
+def _blobs_by_path(urls):
+    paths = {media_relative(url) for url in urls} - {None}
+    return {blob.file_path: blob for blob in AssetBlob.objects.filter(file_path__in=paths)} if paths else {}
+
+
+def logo_blob_ids(raw_logos):
+    """Distinct blobs referenced by a BrandKit.logos value."""
+    blobs = _blobs_by_path(_logo_url(logo) for logo in _parse_logos(raw_logos))
+    return {blob.id for blob in blobs.values()}
+
+
+def normalize_logos(raw_logos):
+    """
+    Logos with asset links rewritten to their blob URL and duplicates
+    removed (order kept). Returns the JSON text.
+    """
+    logos = _parse_logos(raw_logos)
+    urls = [_logo_url(logo) for logo in logos]
+    asset_blobs = dict(
+        Asset.objects.filter(file_url__in=urls, blob__isnull=False).values_list('file_url', 'blob__file_path')
+    )
+    seen = set()
+    normalized = []
+    for logo, url in zip(logos, urls):
+        if url in asset_blobs:
+            url = settings.MEDIA_URL + asset_blobs[url]
+            logo = {**logo, 'url': url} if isinstance(logo, dict) else url
+        if url in seen:
+            continue
+        seen.add(url)
+        normalized.append(logo)
+    return json.dumps(normalized)
+
+
+def sync_brand_kit_logos(brand_kit, previous_logos='[]'):
+    """Normalize the saved logos and move blob references from the previous value."""
+    logos = normalize_logos(brand_kit.logos)
+    old_ids = logo_blob_ids(previous_logos)
+    new_ids = logo_blob_ids(logos)
+    with transaction.atomic():
+        if logos != brand_kit.logos:
+            brand_kit.logos = logos
+            BrandKit.objects.filter(pk=brand_kit.pk).update(logos=logos)
+        acquire(new_ids - old_ids)
+        release(old_ids - new_ids)
+
+
+# ----- maintenance -----
+
+def _remove_blob_files(content_hash, file_path):
+    Path(settings.MEDIA_ROOT, file_path).unlink(missing_ok=True)
+    shutil.rmtree(
+        Path(settings.MEDIA_ROOT, settings.ASSET_DERIVATIVE_DIR, content_hash[:2], content_hash),
+        ignore_errors=True,
+    )
+
+
+def collect_garbage(grace=None, now=None):
+    """Delete blobs unreferenced for longer than `grace` seconds; returns how many."""
+    grace = settings.ASSET_BLOB_GC_GRACE if grace is None else grace
+    cutoff = (now or timezone.now()) - timedelta(seconds=grace)
+    candidates = AssetBlob.objects.filter(ref_count__lte=0, unreferenced_at__lte=cutoff)
+
+    removed = 0
+    for blob_id in list(candidates.values_list('id', flat=True)):
+        with transaction.atomic():
+            blob = candidates.select_for_update().filter(pk=blob_id).first()
+            if blob is None:
+                continue
+            if blob.assets.exists():
+                logger.warning("Blob %s has assets but ref_count %s; run with --recount", blob.id, blob.ref_count)
+                continue
+            blob.delete()
+            transaction.on_commit(lambda blob=blob: _remove_blob_files(blob.content_hash, blob.file_path))
+        removed += 1
+    return removed
+
+
+def recount_references():
+    """Recompute every ref_count from assets and brand kits; returns the blobs fixed."""
+    counts = Counter(dict(
+        Asset.objects.filter(blob__isnull=False).values('blob_id')
+        .annotate(count=Count('id')).values_list('blob_id', 'count')
+    ))
+    for logos in BrandKit.objects.values_list('logos', flat=True).iterator():
+        counts.update(logo_blob_ids(logos))
+
+    fixed = 0
+    now = timezone.now()
+    for blob in AssetBlob.objects.only('id', 'ref_count', 'unreferenced_at').iterator():
+        count = counts.get(blob.id, 0)
+        if count != blob.ref_count:
+            AssetBlob.objects.filter(pk=blob.pk).update(
+                ref_count=count, unreferenced_at=None if count else (blob.unreferenced_at or now)
+            )
+            fixed += 1
+    return fixed
+
+
+def _replace_url(old_url, new_url):
+    """
+    Rewrite links to a duplicate file in element content, frame backgrounds and
+    logos. The writes bypass the model signals, so updated_at is stamped here
+    and the revisions of the affected presentations are bumped once.
+    """
+    now = timezone.now()
+    presentation_ids = set()
+
+    elements = list(
+        Element.objects.filter(content__contains=old_url)
+        .select_related('frame').only('id', 'content', 'frame__presentation')
+    )
+    for element in elements:
+        element.content = element.content.replace(old_url, new_url)
+        element.updated_at = now
+        presentation_ids.add(element.frame.presentation_id)
+    Element.objects.bulk_update(elements, ['content', 'updated_at'], batch_size=500)
+
+    frames = Frame.objects.filter(background_image=old_url)
+    presentation_ids.update(frames.values_list('presentation_id', flat=True))
+    frames.update(background_image=new_url, updated_at=now)
+
+    for brand_kit in BrandKit.objects.filter(logos__contains=old_url):
+        previous = brand_kit.logos
+        brand_kit.logos = previous.replace(old_url, new_url)
+        BrandKit.objects.filter(pk=brand_kit.pk).update(logos=brand_kit.logos, updated_at=now)
+        sync_brand_kit_logos(brand_kit, previous)
+        presentation_ids.update(brand_kit.presentation_set.values_list('id', flat=True))
+
+    if presentation_ids:
+        bump_revision(presentation_ids)
+
+
+def scan_assets(dry_run=False, batch_size=500):
+    """
+    Hash local assets that are not in the store yet and attach them to blobs.
+    Files whose content is already stored are replaced by the stored copy
+    (links rewritten, duplicate file deleted).
+
+    Returns {'scanned', 'duplicates', 'reclaimed_bytes'}.
+    """
+    stats = {'scanned': 0, 'duplicates': 0, 'reclaimed_bytes': 0}
+    seen = {}  # dry run: content_hash -> primul fișier găsit
+    last_id = 0
+    while True:
+        asset_ids = list(
+            Asset.objects.filter(blob__isnull=True, id__gt=last_id)
+            .order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+        if not asset_ids:
+            return stats
+        last_id = asset_ids[-1]
+
+        for asset_id in asset_ids:
+            asset = Asset.objects.filter(pk=asset_id, blob__isnull=True).first()
+            path = source_path(asset) if asset else None
+            if path is None:
+                continue
+            stats['scanned'] += 1
+            content_hash = file_sha256(path)
+            relative = path.relative_to(Path(settings.MEDIA_ROOT).resolve()).as_posix()
+            blob = AssetBlob.objects.filter(content_hash=content_hash).first()
+            stored_path = blob.file_path if blob else seen.setdefault(content_hash, relative)
+            if stored_path != relative:
+                stats['duplicates'] += 1
+                stats['reclaimed_bytes'] += path.stat().st_size
+            if dry_run:
+                continue
+
+            with transaction.atomic():
+                if blob is None:
+                    blob = AssetBlob.objects.create(
+                        content_hash=content_hash, file_path=relative, size=path.stat().st_size,
+                        ref_count=0, created_at=timezone.now(),
+                    )
+                # Toate asset-urile cu același fișier sunt mutate odată
+                old_url = asset.file_url
+                moved = Asset.objects.filter(file_url=old_url, blob__isnull=True).update(
+                    blob=blob, content_hash=content_hash, file_url=blob_url(blob)
+                )
+                acquire([blob.id] * moved)
+                if blob.file_path != relative:
+                    _replace_url(old_url, blob_url(blob))
+                    transaction.on_commit(lambda path=path: path.unlink(missing_ok=True))
+
+
+def _merged_tags(raw_values):
+    tags = []
+    for raw in raw_values:
+        try:
+            values = json.loads(raw) if raw else []
+        except ValueError:
+            values = raw.split(',')
+        for tag in values if isinstance(values, list) else []:
+            if tag not in tags:
+                tags.append(tag)
+    return json.dumps(tags)
+
+
+def merge_duplicate_assets(dry_run=False):
+    """
+    Merge assets of the same uploader and group that share a blob into the
+    oldest one (tags combined, uploads repointed). Returns the rows removed.
+    """
+    groups = (
+        Asset.objects.filter(blob__isnull=False)
+        .values('blob_id', 'uploaded_by_id', 'group_id')
+        .annotate(copies=Count('id'), keep_id=Min('id'))
+        .filter(copies__gt=1)
+    )
+    removed = 0
+    for group in groups:
+        if dry_run:
+            removed += group['copies'] - 1
+            continue
+        with transaction.atomic():
+            copies = list(
+                Asset.objects.select_for_update().filter(
+                    blob_id=group['blob_id'], uploaded_by_id=group['uploaded_by_id'],
+                    group_id=group['group_id'],
+                ).order_by('id')
+            )
+            keep, duplicates = copies[0], copies[1:]
+            duplicate_ids = [asset.id for asset in duplicates]
+            AssetUpload.objects.filter(asset_id__in=duplicate_ids).update(asset=keep)
+            tags = _merged_tags(asset.tags for asset in copies)
+            # Ștergerea eliberează referințele (semnalul post_delete)
+            Asset.objects.filter(pk__in=duplicate_ids).delete()
+            if tags != keep.tags:
+                keep.tags = tags
+                keep.save(update_fields=['tags'])
+            removed += len(duplicates)
+    return removed
@@ -0,0 +1,201 @@
+"""
+Derivatives for image assets: a thumbnail and responsive widths.
+
+For every image stored under MEDIA_ROOT a worker pool renders a thumbnail
+(ASSET_THUMBNAIL_WIDTH) and one copy per ASSET_DERIVATIVE_WIDTHS entry that
+is narrower than the original, plus one at the original width (capped at the
+largest configured width), each as JPEG (PNG when the image has
+transparency) and, with ASSET_DERIVATIVE_WEBP, as WebP. Images are never
+upscaled.
+
+Files live under ASSET_DERIVATIVE_DIR/ab/<sha256>/, so assets sharing the
+same content share their derivatives, and every file is recorded in
+AssetDerivative. Generation is idempotent: an asset whose rows already
+match its current file is skipped. AssetSerializer exposes the rows as
+`srcset` / `srcset_webp`, and Asset.thumbnail_url is filled in when the
+client did not provide one.
+"""
+
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .asset_blobs import file_sha256, source_path
+from .models import Asset, AssetDerivative
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = set()
+
+_EXTENSIONS = {'jpeg': 'jpg', 'png': 'png', 'webp': 'webp'}
+
+
+def _derivative_url(content_hash, name):
+    return f"{settings.MEDIA_URL}{settings.ASSET_DERIVATIVE_DIR}/{content_hash[:2]}/{content_hash}/{name}"
+
+
+def _derivative_path(content_hash, name):
+    return Path(settings.MEDIA_ROOT, settings.ASSET_DERIVATIVE_DIR, content_hash[:2], content_hash, name)
+
+
+def plan_derivatives(width, height, has_alpha):
+    """(kind, format, width, height) for every derivative of an image of this size."""
+    base_format = 'png' if has_alpha else 'jpeg'
+    formats = [base_format] + (['webp'] if settings.ASSET_DERIVATIVE_WEBP else [])
+
+    largest = max(settings.ASSET_DERIVATIVE_WIDTHS)
+    widths = {target for target in settings.ASSET_DERIVATIVE_WIDTHS if target < width}
+    widths.add(min(width, largest))
+
+    def scaled(target):
+        return target, max(1, round(height * target / width))
+
+    plan = [(AssetDerivative.KIND_THUMBNAIL, base_format, *scaled(min(width, settings.ASSET_THUMBNAIL_WIDTH)))]
+    for target in sorted(widths):
+        plan.extend((AssetDerivative.KIND_RESPONSIVE, fmt, *scaled(target)) for fmt in formats)
+    return plan
+
+
+def _encode(image, fmt):
+    buffer = io.BytesIO()
+    if fmt == 'jpeg':
+        image.convert('RGB').save(buffer, 'JPEG', quality=settings.ASSET_DERIVATIVE_QUALITY,
+                                  optimize=True, progressive=True)
+    elif fmt == 'png':
+        image.save(buffer, 'PNG', optimize=True)
+    else:
+        image.save(buffer, 'WEBP', quality=settings.ASSET_DERIVATIVE_QUALITY, method=4)
+    return buffer.getvalue()
+
+
+def generate_asset_derivatives(asset_id, force=False):
+    """
+    Render the missing derivatives of an image asset and record them.
+
+    Returns the number of files written (0 when everything was up to date or
+    the asset is not a local image).
+    """
+    asset = Asset.objects.filter(pk=asset_id, asset_type='image').first()
+    path = source_path(asset) if asset else None
+    if path is None:
+        return 0
+
+    content_hash = asset.content_hash
+    if not content_hash:
+        content_hash = file_sha256(path)
+        # update() nu declanșează post_save (și deci nici o nouă programare)
+        Asset.objects.filter(pk=asset.pk).update(content_hash=content_hash)
+
+    try:
+        with Image.open(path) as original:
+            original = ImageOps.exif_transpose(original)
+            has_alpha = original.mode in ('RGBA', 'LA', 'PA') or 'transparency' in original.info
+            if original.mode not in ('RGB', 'RGBA'):
+                original = original.convert('RGBA' if has_alpha else 'RGB')
+            plan = plan_derivatives(original.width, original.height, has_alpha)
+
+            existing = {
+                (row.kind, row.format, row.width): row.file_url
+                for row in AssetDerivative.objects.filter(asset=asset)
+            }
+            names = {
+                (kind, fmt, width): f"{kind}-{width}.{_EXTENSIONS[fmt]}"
+                for kind, fmt, width, _ in plan
+            }
+            up_to_date = existing == {
+                key: _derivative_url(content_hash, name) for key, name in names.items()
+            } and all(_derivative_path(content_hash, name).exists() for name in names.values())
+            if up_to_date and not force:
+                return 0
+
+            written = 0
+            rows = []
+            resized = {}
+            for kind, fmt, width, height in plan:
+                name = names[(kind, fmt, width)]
+                target = _derivative_path(content_hash, name)
+                if force or not target.exists():
+                    if width not in resized:
+                        resized[width] = (
+                            original if width == original.width
+                            else original.resize((width, height), Image.Resampling.LANCZOS)
+                        )
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    target.write_bytes(_encode(resized[width], fmt))
+                    written += 1
+                rows.append(AssetDerivative(
+                    asset=asset, kind=kind, format=fmt, width=width, height=height,
+                    file_url=_derivative_url(content_hash, name),
+                    file_size=target.stat().st_size, created_at=timezone.now(),
+                ))
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        logger.warning("Asset %s is not a readable image, no derivatives generated", asset_id)
+        return 0
+
+    thumbnail_url = rows[0].file_url
+    with transaction.atomic():
+        AssetDerivative.objects.filter(asset=asset).delete()
+        AssetDerivative.objects.bulk_create(rows)
+        # Thumbnail-ul trimis de client rămâne; altfel folosim derivatul
+        if not asset.thumbnail_url or asset.thumbnail_url in existing.values():
+            Asset.objects.filter(pk=asset.pk).update(thumbnail_url=thumbnail_url)
+    return written
+
+
+def srcset(derivatives, fmt):
+    """'url 480w, url 960w' from the responsive derivatives of one format."""
+    candidates = sorted(
+        (row.width, row.file_url) for row in derivatives
+        if row.kind == AssetDerivative.KIND_RESPONSIVE and row.format == fmt
+    )
+    return ', '.join(f"{url} {width}w" for width, url in candidates)
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.ASSET_DERIVATIVE_WORKERS,
+                thread_name_prefix='asset-derivatives',
+            )
+        return _executor
+
+
+def _run_in_background(asset_id):
+    with _executor_lock:
+        _pending.discard(asset_id)
+    close_old_connections()
+    try:
+        generate_asset_derivatives(asset_id)
+    except Exception:
+        logger.exception("Derivative generation failed for asset %s", asset_id)
+    finally:
+        close_old_connections()
+
+
+def schedule_asset_derivatives(asset_id):
+    """
+    Queue derivative generation for an asset once the current transaction
+    commits. Repeated calls while a job is pending are merged.
+    """
+    if not asset_id or not settings.ASSET_DERIVATIVES_ENABLED:
+        return
+
+    def submit():
+        with _executor_lock:
+            if asset_id in _pending:
+                return
+            _pending.add(asset_id)
+        _get_executor().submit(_run_in_background, asset_id)
+
+    transaction.on_commit(submit)
@@ -0,0 +1,170 @@
+"""
+Asset search index.
+
+Asset names and tags are split into normalized tokens (lowercase, without
+diacritics) stored in AssetSearchToken with a weight per source field, and
+tags are stored one per row in AssetTag. A search matches whole tokens, so
+"cat" no longer matches "education"; the last query term also matches as a
+prefix for autocomplete. Every term must match; results are ranked by the
+sum of the matched weights (exact matches count double) and paginated in
+the database.
+
+The index is kept up to date on Asset.save (see api/signals.py); assets
+written with bulk operations can be reindexed with index_assets() or
+`python manage.py rebuild_asset_index`.
+"""
+
+import json
+import re
+import unicodedata
+
+from django.db import transaction
+from django.db.models import Case, Count, Exists, F, IntegerField, Max, OuterRef, Q, Value, When
+
+from .models import Asset, AssetSearchToken, AssetTag
+
+NAME_WEIGHT = 3
+TAG_WEIGHT = 2
+MAX_TOKEN_LENGTH = 64
+MAX_TAG_LENGTH = 100
+MAX_QUERY_TERMS = 8
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def normalize_text(value):
+    """Lowercase text without diacritics ("Școală" -> "scoala")."""
+    decomposed = unicodedata.normalize('NFKD', str(value or ''))
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def tokenize(value):
+    return [token[:MAX_TOKEN_LENGTH] for token in _NON_WORD.split(normalize_text(value)) if token]
+
+
+def parse_tags(raw):
+    """Tags from the JSON text column (a list), tolerating comma-separated strings."""
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw) if raw.strip() else []
+        except ValueError:
+            raw = raw.split(',')
+    if isinstance(raw, str):
+        raw = [raw]
+    if not isinstance(raw, list):
+        return []
+    tags = []
+    for tag in raw:
+        tag = ' '.join(tokenize(tag))[:MAX_TAG_LENGTH]
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+
+def index_entries(name, raw_tags):
+    """(tags, {token: weight}) for an asset's name and tags."""
+    tags = parse_tags(raw_tags)
+    weights = {}
+    for tag in tags:
+        for token in tag.split():
+            weights[token] = max(weights.get(token, 0), TAG_WEIGHT)
+    for token in tokenize(name):
+        weights[token] = NAME_WEIGHT
+    return tags, weights
+
+
+def index_assets(assets):
+    """Rebuild the index rows of the given assets (4 statements)."""
+    assets = list(assets)
+    if not assets:
+        return
+    asset_ids = [asset.id for asset in assets]
+    tag_rows, token_rows = [], []
+    for asset in assets:
+        tags, weights = index_entries(asset.name, asset.tags)
+        tag_rows.extend(AssetTag(asset_id=asset.id, tag=tag) for tag in tags)
+        token_rows.extend(
+            AssetSearchToken(asset_id=asset.id, token=token, weight=weight)
+            for token, weight in weights.items()
+        )
+
+    with transaction.atomic():
+        AssetTag.objects.filter(asset_id__in=asset_ids).delete()
+        AssetSearchToken.objects.filter(asset_id__in=asset_ids).delete()
+        AssetTag.objects.bulk_create(tag_rows, batch_size=1000)
+        AssetSearchToken.objects.bulk_create(token_rows, batch_size=1000)
+
+
+def _prefix_condition(prefix):
+    # Interval în loc de LIKE 'prefix%', ca să folosească indexul pe orice backend
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return Q(token__gte=prefix, token__lt=upper)
+
+
+def search_assets(assets, query='', tags=None, asset_type=None, prefix=True, limit=20, offset=0):
+    """
+    Ranked search within `assets` (a queryset, e.g. the assets a user can see).
+
+    Returns (total, page) where page is a list of Asset objects carrying a
+    `search_score` attribute (None when there is no text query).
+    """
+    scoped = assets
+    if asset_type:
+        scoped = scoped.filter(asset_type=asset_type)
+    for tag in parse_tags(tags or []):
+        scoped = scoped.filter(id__in=AssetTag.objects.filter(tag=tag).values('asset_id'))
+
+    terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+    if not terms:
+        total = scoped.count()
+        page = list(scoped.order_by('-created_at', '-id')[offset:offset + limit])
+        for asset in page:
+            asset.search_score = None
+        return total, page
+
+    # Pornește de la index (tokens selective); vizibilitatea e verificată
+    # per candidat prin EXISTS, nu prin IN (toate assets vizibile)
+    matches = Q()
+    scores = {}
+    for index, term in enumerate(terms):
+        whens = [When(token=term, then=F('weight') * 2)]
+        condition = Q(token=term)
+        if prefix and index == len(terms) - 1:
+            condition = _prefix_condition(term)
+            whens.append(When(condition, then=F('weight')))
+        matches |= condition
+        scores[f'term_{index}'] = Max(Case(*whens, default=Value(0), output_field=IntegerField()))
+
+    ranked = (
+        AssetSearchToken.objects.filter(matches)
+        .filter(Exists(scoped.filter(pk=OuterRef('asset_id'))))
+        .values('asset_id')
+        .annotate(**scores)
+        .filter(**{f'{name}__gt': 0 for name in scores})
+        .annotate(score=sum((F(name) for name in scores), Value(0)))
+        .order_by('-score', '-asset_id')
+    )
+    total = ranked.count()
+    rows = list(ranked.values_list('asset_id', 'score')[offset:offset + limit])
+
+    assets_by_id = Asset.objects.select_related('uploaded_by').in_bulk([asset_id for asset_id, _ in rows])
+    page = []
+    for asset_id, score in rows:
+        asset = assets_by_id[asset_id]
+        asset.search_score = score
+        page.append(asset)
+    return total, page
+
+
+def suggest(assets, prefix, limit=10):
+    """Autocomplete: index tokens starting with prefix, by number of assets."""
+    terms = tokenize(prefix)
+    if not terms:
+        return []
+    return list(
+        AssetSearchToken.objects.filter(_prefix_condition(terms[-1]))
+        .filter(Exists(assets.filter(pk=OuterRef('asset_id'))))
+        .values('token')
+        .annotate(count=Count('asset_id', distinct=True))
+        .order_by('-count', 'token')[:limit]
+    )
@@ -0,0 +1,176 @@
+"""
+Chunked, resumable asset uploads on local storage.
+
+    POST  /api/assets/uploads/                 {name, size, sha256?, asset_type?, tags?, group?}
+    PUT   /api/assets/uploads/<id>/chunk/      raw bytes, ?offset=<received_bytes>
+    GET   /api/assets/uploads/<id>/            resume: current received_bytes
+    POST  /api/assets/uploads/<id>/complete/   verify and create the Asset
+
+Chunks are streamed from the request to a partial file under
+MEDIA_ROOT/ASSET_UPLOAD_DIR in ASSET_UPLOAD_READ_SIZE pieces, never holding
+the whole body in memory. A chunk may carry an X-Chunk-SHA256 header; on a
+mismatch it is discarded and the client resends it. On completion the file
+is hashed and handed to the blob store (api/asset_blobs.py), so identical
+files are stored once whatever group uploads them, and an uploader
+re-sending a file they already have gets their existing asset back.
+Thumbnails and resized copies are generated in the background once the
+Asset is saved (see api/asset_derivatives.py).
+"""
+
+import hashlib
+import mimetypes
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .asset_blobs import blob_url, file_sha256, store_blob
+from .models import Asset, AssetUpload
+
+
+class UploadError(ValueError):
+    """The upload cannot accept this chunk or cannot be completed."""
+
+
+class UploadOffsetMismatch(UploadError):
+    """The chunk does not start where the upload left off."""
+
+    def __init__(self, expected):
+        self.expected = expected
+        super().__init__(f"Expected a chunk at offset {expected}")
+
+
+def _media_path(*parts):
+    return Path(settings.MEDIA_ROOT, *parts)
+
+
+def partial_path(upload):
+    return _media_path(settings.ASSET_UPLOAD_DIR, f'{upload.id}.part')
+
+
+def _extension(name):
+    ext = os.path.splitext(name)[1].lower()
+    return ext if ext[1:].isalnum() and len(ext) <= 10 else ''
+
+
+def guess_asset_type(name):
+    mime = mimetypes.guess_type(name)[0] or ''
+    if mime.startswith('image/'):
+        return 'image'
+    if mime.startswith('video/'):
+        return 'video'
+    if mime.startswith('audio/'):
+        return 'audio'
+    return 'file'
+
+
+def start_upload(user, name, size, sha256='', asset_type='', tags='[]', group=None):
+    if size <= 0 or size > settings.ASSET_UPLOAD_MAX_SIZE:
+        raise UploadError(f"size must be between 1 and {settings.ASSET_UPLOAD_MAX_SIZE} bytes")
+    now = timezone.now()
+    upload = AssetUpload.objects.create(
+        name=name[:255],
+        asset_type=(asset_type or guess_asset_type(name))[:20],
+        tags=tags,
+        total_size=size,
+        expected_sha256=(sha256 or '').lower(),
+        group=group,
+        uploaded_by=user,
+        created_at=now,
+        updated_at=now,
+    )
+    path = partial_path(upload)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+    return upload
+
+
+def write_chunk(upload, stream, offset, length=None, sha256=None):
+    """
+    Append a chunk read from `stream` at `offset` (must equal received_bytes).
+
+    Returns the number of bytes written.
+    """
+    if upload.status != AssetUpload.STATUS_PENDING:
+        raise UploadError("Upload is not accepting chunks")
+    if offset != upload.received_bytes:
+        raise UploadOffsetMismatch(upload.received_bytes)
+
+    remaining = upload.total_size - offset
+    if length is not None and length > remaining:
+        raise UploadError("Chunk goes past the declared size")
+    limit = remaining if length is None else length
+
+    digest = hashlib.sha256()
+    written = 0
+    path = partial_path(upload)
+    with open(path, 'r+b') as handle:
+        handle.seek(offset)
+        handle.truncate()
+        while written < limit:
+            piece = stream.read(min(settings.ASSET_UPLOAD_READ_SIZE, limit - written))
+            if not piece:
+                break
+            handle.write(piece)
+            digest.update(piece)
+            written += len(piece)
+        if stream.read(1):
+            handle.truncate(offset)
+            raise UploadError("Chunk goes past the declared size")
+        if sha256 and digest.hexdigest() != sha256.lower():
+            handle.truncate(offset)
+            raise UploadError("Chunk checksum mismatch")
+
+    upload.received_bytes = offset + written
+    upload.updated_at = timezone.now()
+    AssetUpload.objects.filter(pk=upload.pk).update(
+        received_bytes=upload.received_bytes, updated_at=upload.updated_at
+    )
+    return written
+
+
+def complete_upload(upload):
+    """Verify the file, store it content-addressed and create (or reuse) the Asset."""
+    if upload.status == AssetUpload.STATUS_COMPLETE:
+        return upload.asset
+    if upload.status != AssetUpload.STATUS_PENDING:
+        # Fișierul parțial a fost deja șters (ex. checksum greșit): clientul reîncepe
+        raise UploadError("Upload failed; start a new upload")
+    if upload.received_bytes != upload.total_size:
+        raise UploadError(f"Received {upload.received_bytes} of {upload.total_size} bytes")
+
+    path = partial_path(upload)
+    content_hash = file_sha256(path)
+    if upload.expected_sha256 and content_hash != upload.expected_sha256:
+        path.unlink(missing_ok=True)
+        AssetUpload.objects.filter(pk=upload.pk).update(status=AssetUpload.STATUS_FAILED)
+        raise UploadError("File checksum mismatch")
+
+    with transaction.atomic():
+        asset = Asset.objects.filter(
+            content_hash=content_hash, uploaded_by=upload.uploaded_by, group=upload.group
+        ).first()
+        if asset is None:
+            blob = store_blob(path, content_hash, _extension(upload.name))
+            asset = Asset.objects.create(
+                name=upload.name,
+                asset_type=upload.asset_type,
+                file_url=blob_url(blob),
+                thumbnail_url='',  # completat de api/asset_derivatives.py
+                tags=upload.tags,
+                file_size=upload.total_size,
+                content_hash=content_hash,
+                blob=blob,
+                created_at=timezone.now(),
+                group=upload.group,
+                uploaded_by=upload.uploaded_by,
+            )
+        else:
+            path.unlink()
+        upload.asset = asset
+        upload.status = AssetUpload.STATUS_COMPLETE
+        upload.updated_at = timezone.now()
+        upload.save(update_fields=['asset', 'status', 'updated_at'])
+    return asset
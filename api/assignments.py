@@ -0,0 +1,145 @@
+"""
+Distribute a presentation to every student of a StudentGroup.
+
+Students are processed in batches (ASSIGNMENT_BATCH_SIZE). Each batch costs
+a fixed number of statements whatever its size: one clone_presentations()
+call in copy mode, or one lookup plus one bulk INSERT of access grants in
+access mode. Runs as a BackgroundJob with per-batch progress.
+"""
+
+from django.conf import settings
+from django.utils import timezone
+
+from .cloning import clone_presentations
+from .jobs import job_handler
+from .models import Presentation, PresentationAccess, Student, StudentGroup
+from .revisions import bump_revision
+from .thumbnail_service import schedule_thumbnails
+
+MODE_COPY = 'copy'
+MODE_ACCESS = 'access'
+ASSIGNMENT_MODES = (MODE_COPY, MODE_ACCESS)
+
+
+def _student_batches(group, batch_size):
+    """Students of the group that have an account, in id order, batch by batch."""
+    last_id = 0
+    while True:
+        batch = list(
+            Student.objects.filter(group=group, user__isnull=False, id__gt=last_id)
+            .select_related('user')
+            .order_by('id')[:batch_size]
+        )
+        if not batch:
+            return
+        yield batch
+        if len(batch) < batch_size:
+            return
+        last_id = batch[-1].id
+
+
+def _grant_access(presentation, students, permission, granted_by, now):
+    """Create the missing grants and change the permission of existing ones; returns (created, updated)."""
+    user_ids = [student.user_id for student in students]
+    existing = {
+        access.user_id: access
+        for access in PresentationAccess.objects.filter(presentation=presentation, user_id__in=user_ids)
+        .only('id', 'user_id', 'permission')
+    }
+    created = PresentationAccess.objects.bulk_create([
+        PresentationAccess(
+            presentation=presentation,
+            user_id=user_id,
+            permission=permission,
+            granted_by=granted_by,
+            granted_at=now,
+        )
+        for user_id in user_ids
+        if user_id not in existing
+    ])
+    changed = [access for access in existing.values() if access.permission != permission]
+    for access in changed:
+        access.permission = permission
+        access.granted_by = granted_by
+        access.granted_at = now
+    PresentationAccess.objects.bulk_update(changed, ['permission', 'granted_by', 'granted_at'])
+    if created or changed:
+        bump_revision([presentation.id])
+    return len(created), len(changed)
+
+
+def assign_presentation_to_group(presentation, group, assigned_by, mode=MODE_COPY,
+                                 permission='VIEWER', progress=None, batch_size=None):
+    """
+    Give every student of `group` their own copy of `presentation`
+    (mode='copy') or an access grant to it (mode='access').
+
+    Args:
+        progress: optional callback(percent, message)
+
+    Returns a summary dict; students without a linked account are skipped.
+    In access mode, existing grants are moved to `permission` ("updated").
+    """
+    if mode not in ASSIGNMENT_MODES:
+        raise ValueError(f"Unknown assignment mode: {mode}")
+    progress = progress or (lambda percent, message: None)
+    batch_size = batch_size or settings.ASSIGNMENT_BATCH_SIZE
+
+    students = Student.objects.filter(group=group)
+    with_account = students.filter(user__isnull=False).count()
+    skipped = students.count() - with_account
+
+    now = timezone.now()
+    processed = 0
+    created = 0
+    updated = 0
+    presentation_ids = []
+
+    for batch in _student_batches(group, batch_size):
+        if mode == MODE_COPY:
+            copies = clone_presentations(presentation, [
+                {
+                    'owner': student.user,
+                    'title': f"{presentation.title} - {student.first_name} {student.last_name}",
+                    # Copiile elevilor nu sunt vizibile pentru tot grupul original
+                    'group': None,
+                }
+                for student in batch
+            ])
+            presentation_ids.extend(copy.id for copy in copies)
+            for copy in copies:
+                schedule_thumbnails(copy.id)
+            created += len(copies)
+        else:
+            batch_created, batch_updated = _grant_access(presentation, batch, permission, assigned_by, now)
+            created += batch_created
+            updated += batch_updated
+
+        processed += len(batch)
+        progress(
+            100 * processed // max(with_account, 1),
+            f'Assigned {processed}/{with_account} students',
+        )
+
+    return {
+        'presentation_id': presentation.id,
+        'student_group': group.slug,
+        'mode': mode,
+        'students': processed,
+        'created': created,
+        'updated': updated,
+        'skipped_without_account': skipped,
+        'presentation_ids': presentation_ids,
+    }
+
+
+@job_handler('assign_presentation_to_group')
+def _assign_job(job):
+    return assign_presentation_to_group(
+        Presentation.objects.get(pk=job.payload['presentation_id']),
+        StudentGroup.objects.get(pk=job.payload['student_group_id']),
+        job.user,
+        mode=job.payload.get('mode', MODE_COPY),
+        permission=job.payload.get('permission', 'VIEWER'),
+        progress=job.report_progress,
+    )
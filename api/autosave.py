@@ -0,0 +1,101 @@
+"""
+Automatic presentation versions.
+
+autosave_presentations() snapshots every presentation whose content changed
+since its latest version, at most once per VERSION_AUTOSAVE_INTERVAL, and then
+thins its automatic versions:
+
+    younger than VERSION_RETAIN_ALL      every version
+    younger than VERSION_RETAIN_HOURLY   the newest version of each hour
+    older                                the newest version of each day
+
+Manual versions (create_version endpoint) and the latest version are never
+thinned. Run periodically with `python manage.py autosave_versions --loop`.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, OuterRef, Q, Subquery
+from django.utils import timezone
+
+from .models import Presentation, PresentationVersion
+from .versioning import create_version, delete_versions
+
+
+def dirty_presentations(now=None):
+    """
+    Presentations whose revision moved past the one recorded on their latest
+    version, once that version is older than the autosave interval.
+    Never-versioned presentations count as dirty when edited within
+    VERSION_AUTOSAVE_LOOKBACK (revisions are microsecond timestamps).
+    """
+    now = now or timezone.now()
+    latest_version = PresentationVersion.objects.filter(presentation=OuterRef('pk')).order_by('-version_number')
+    interval = timedelta(seconds=settings.VERSION_AUTOSAVE_INTERVAL)
+    lookback_revision = int((now - timedelta(seconds=settings.VERSION_AUTOSAVE_LOOKBACK)).timestamp() * 1_000_000)
+
+    return (
+        Presentation.objects
+        .annotate(
+            last_version_at=Subquery(latest_version.values('created_at')[:1]),
+            last_version_revision=Subquery(latest_version.values('revision')[:1]),
+        )
+        .filter(
+            Q(last_version_at__isnull=True, revision__gte=lookback_revision)
+            | Q(last_version_at__lte=now - interval, revision__gt=F('last_version_revision'))
+        )
+        .select_related('owner')
+        .order_by('id')
+    )
+
+
+def versions_to_thin(versions, now):
+    """
+    Ids of automatic versions dropped by the retention policy.
+
+    `versions` are (id, created_at, is_autosave) tuples, newest first.
+    """
+    retain_all = now - timedelta(seconds=settings.VERSION_RETAIN_ALL)
+    retain_hourly = now - timedelta(seconds=settings.VERSION_RETAIN_HOURLY)
+
+    seen_buckets = set()
+    dropped = []
+    for index, (version_id, created_at, is_autosave) in enumerate(versions):
+        if index == 0 or not is_autosave or created_at >= retain_all:
+            continue
+        if created_at >= retain_hourly:
+            bucket = ('hour', created_at.replace(minute=0, second=0, microsecond=0))
+        else:
+            bucket = ('day', created_at.date())
+        # Prima versiune întâlnită într-un bucket e cea mai nouă
+        if bucket in seen_buckets:
+            dropped.append(version_id)
+        else:
+            seen_buckets.add(bucket)
+    return dropped
+
+
+def thin_versions(presentation, now=None):
+    """Apply the retention policy to a presentation's versions."""
+    now = now or timezone.now()
+    versions = list(
+        presentation.versions.order_by('-created_at', '-version_number')
+        .values_list('id', 'created_at', 'is_autosave')
+    )
+    return delete_versions(presentation, versions_to_thin(versions, now))
+
+
+def autosave_presentations(now=None):
+    """Snapshot dirty presentations and thin their versions."""
+    now = now or timezone.now()
+    summary = {'checked': 0, 'created': 0, 'thinned': 0}
+    for presentation in dirty_presentations(now).iterator():
+        summary['checked'] += 1
+        version = create_version(
+            presentation, presentation.owner, notes='Autosave', autosave=True, skip_unchanged=True
+        )
+        if version is not None:
+            summary['created'] += 1
+            summary['thinned'] += thin_versions(presentation, now)
+    return summary
@@ -0,0 +1,224 @@
+"""
+Deep-copy engine for presentations and frames.
+
+A clone reads the source frames and connections once and inserts frames with
+one bulk INSERT for all copies. Elements, the bulk of the rows, are copied
+inside the database with a single INSERT ... SELECT for all copies (frame ids
+remapped with a CASE expression), so they never travel through Python.
+Connections and presentation_path are remapped to the new frame ids. Copies
+start without thumbnails: preview files are named after the frame that owns
+them, so callers schedule_thumbnails() for the new presentations.
+"""
+
+import json
+import secrets
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .materializers import BULK_BATCH_SIZE, bulk_create_returning
+from .models import Element, Frame, FrameConnection, Presentation
+from .revisions import bump_revision
+
+FRAME_FIELDS = (
+    'id', 'title', 'position', 'background_color', 'background_image',
+    'order', 'transition_settings',
+)
+ELEMENT_COPY_COLUMNS = (
+    'element_type', 'position', 'content', 'animation_settings', 'link_url',
+)
+
+
+def load_frames_source(frame_ids=None, presentation=None):
+    """Frames (in order) and the connections between them, as dicts."""
+    frames_qs = Frame.objects.all()
+    if presentation is not None:
+        frames_qs = frames_qs.filter(presentation=presentation)
+    if frame_ids is not None:
+        frames_qs = frames_qs.filter(id__in=frame_ids)
+    frames = list(frames_qs.order_by('order', 'id').values(*FRAME_FIELDS))
+    source_ids = [frame['id'] for frame in frames]
+
+    connections = list(
+        FrameConnection.objects.filter(from_frame_id__in=source_ids, to_frame_id__in=source_ids)
+        .values('from_frame_id', 'to_frame_id', 'label')
+    )
+    return frames, connections
+
+
+def copy_elements(frame_maps, now):
+    """
+    Copy the elements of the mapped source frames with one INSERT ... SELECT.
+
+    frame_maps holds one {source frame id: target frame id} map per copy. The
+    source rows are multiplied by a derived table of copy indexes and each row
+    gets its target frame from a CASE expression; ids are integers from the
+    database and are inlined.
+    """
+    frame_maps = [frame_map for frame_map in frame_maps if frame_map]
+    if not frame_maps:
+        return
+    qn = connection.ops.quote_name
+    table = qn(Element._meta.db_table)
+    frame_column = qn(Element._meta.get_field('frame').column)
+    copy_index = qn('copy_index')
+    columns = ', '.join(qn(column) for column in ELEMENT_COPY_COLUMNS)
+    source_columns = ', '.join(f'e.{qn(column)}' for column in ELEMENT_COPY_COLUMNS)
+
+    copies = ' UNION ALL '.join(
+        f'SELECT {index} AS {copy_index}' for index in range(len(frame_maps))
+    )
+    remap = ' '.join(
+        f'WHEN {index} THEN CASE e.{frame_column} ' + ' '.join(
+            f'WHEN {int(source_id)} THEN {int(target_id)}'
+            for source_id, target_id in frame_map.items()
+        ) + ' END'
+        for index, frame_map in enumerate(frame_maps)
+    )
+    source_ids = ', '.join(str(int(source_id)) for source_id in frame_maps[0])
+    timestamp = connection.ops.adapt_datetimefield_value(now)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({columns}, {qn('created_at')}, {qn('updated_at')}, {frame_column}) "
+            f"SELECT {source_columns}, %s, %s, CASE c.{copy_index} {remap} END "
+            f"FROM {table} e CROSS JOIN ({copies}) c "
+            f"WHERE e.{frame_column} IN ({source_ids}) "
+            f"ORDER BY c.{copy_index}, e.{qn('id')}",
+            [timestamp, timestamp],
+        )
+
+
+def _copy_frames(source, presentations, now, title_format='{}', order_offset=0):
+    """
+    Insert the source frames into every target presentation.
+
+    Returns one {source frame id: new frame id} map per presentation.
+    """
+    frames_source, connections_source = source
+
+    frames = [
+        Frame(
+            presentation_id=presentation.id,
+            title=title_format.format(frame['title'])[:255],
+            position=frame['position'],
+            background_color=frame['background_color'],
+            background_image=frame['background_image'],
+            order=frame['order'] + order_offset,
+            thumbnail_url='',
+            transition_settings=frame['transition_settings'],
+            created_at=now,
+            updated_at=now,
+        )
+        for presentation in presentations
+        for frame in frames_source
+    ]
+    bulk_create_returning(
+        Frame, frames, {'presentation_id__in': [presentation.id for presentation in presentations]}
+    )
+
+    frame_count = len(frames_source)
+    frame_maps = [
+        {
+            source_frame['id']: frames[target * frame_count + index].id
+            for index, source_frame in enumerate(frames_source)
+        }
+        for target in range(len(presentations))
+    ]
+
+    copy_elements(frame_maps, now)
+
+    FrameConnection.objects.bulk_create([
+        FrameConnection(
+            from_frame_id=frame_map[item['from_frame_id']],
+            to_frame_id=frame_map[item['to_frame_id']],
+            label=item['label'],
+        )
+        for frame_map in frame_maps
+        for item in connections_source
+    ], batch_size=BULK_BATCH_SIZE)
+
+    return frame_maps
+
+
+def _remap_path(raw_path, frame_map):
+    try:
+        path = json.loads(raw_path or '[]')
+    except ValueError:
+        return []
+    if not isinstance(path, list):
+        return []
+    return [frame_map[frame_id] for frame_id in path if frame_id in frame_map]
+
+
+def clone_presentations(original, targets, frame_ids=None):
+    """
+    Clone a presentation once per target, in one transaction.
+
+    Args:
+        targets: list of dicts with 'owner' and optional 'title' and 'group'
+        frame_ids: optional subset of the original's frames to copy
+
+    Returns the new presentations, in the order of targets.
+    """
+    if not targets:
+        return []
+
+    now = timezone.now()
+    source = load_frames_source(frame_ids=frame_ids, presentation=original)
+
+    with transaction.atomic():
+        presentations = [
+            Presentation(
+                title=(target.get('title') or f"{original.title} (Copy)")[:255],
+                description=original.description,
+                canvas_settings=original.canvas_settings,
+                presentation_path='[]',
+                thumbnail_url='',
+                share_token=secrets.token_urlsafe(32),
+                is_public=0,
+                created_at=now,
+                updated_at=now,
+                brand_kit_id=original.brand_kit_id,
+                group=target.get('group', original.group),
+                owner=target['owner'],
+                template_id=original.template_id,
+            )
+            for target in targets
+        ]
+        bulk_create_returning(
+            Presentation, presentations,
+            {'share_token__in': [presentation.share_token for presentation in presentations]},
+        )
+
+        frame_maps = _copy_frames(source, presentations, now)
+
+        for presentation, frame_map in zip(presentations, frame_maps):
+            presentation.presentation_path = json.dumps(
+                _remap_path(original.presentation_path, frame_map)
+            )
+        Presentation.objects.bulk_update(
+            presentations, ['presentation_path'], batch_size=BULK_BATCH_SIZE
+        )
+
+    return presentations
+
+
+def clone_presentation(original, owner, title=None, frame_ids=None):
+    """Clone a single presentation (see clone_presentations)."""
+    target = {'owner': owner}
+    if title:
+        target['title'] = title
+    return clone_presentations(original, [target], frame_ids=frame_ids)[0]
+
+
+def clone_frames(frames, presentation, title_format='{} (Copy)', order_offset=1):
+    """Copy frames (with elements and connections between them) into a presentation."""
+    source = load_frames_source(frame_ids=[frame.id for frame in frames])
+    with transaction.atomic():
+        frame_map, = _copy_frames(
+            source, [presentation], timezone.now(),
+            title_format=title_format, order_offset=order_offset,
+        )
+        bump_revision([presentation.id])
+    return list(Frame.objects.filter(id__in=frame_map.values()).order_by('order', 'id'))
@@ -5,10 +5,12 @@ import json
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.contrib.auth.models import User
-from .models import Presentation, PresentationAccess
+from .instrumentation import InstrumentedConsumerMixin
+from .jobs import job_group_name, serialize_job
+from .models import BackgroundJob, Presentation, PresentationAccess
 
 
-class PresentationConsumer(AsyncWebsocketConsumer):
+class PresentationConsumer(InstrumentedConsumerMixin, AsyncWebsocketConsumer):
     """
     Consumer pentru colaborare pe o prezentare.
 
@@ -181,3 +183,45 @@ class PresentationConsumer(AsyncWebsocketConsumer):
             return access is not None
         except Presentation.DoesNotExist:
             return False
+
+
+class JobConsumer(InstrumentedConsumerMixin, AsyncWebsocketConsumer):
+    """
+    Progress and result updates for a background job.
+
+    URL: ws://localhost:8000/ws/jobs/<job_id>/
+
+    Sends the current job state on connect, then a 'job_update' message for
+    every progress change until the job finishes.
+    """
+
+    async def connect(self):
+        self.job_id = self.scope['url_route']['kwargs']['job_id']
+        self.group_name = job_group_name(self.job_id)
+        self.user = self.scope['user']
+
+        job_state = await self.get_job_state()
+        if job_state is None:
+            await self.close()
+            return
+
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+        await self.send(text_data=json.dumps({'type': 'job_update', 'job': job_state}))
+
+    async def disconnect(self, close_code):
+        await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def job_update(self, event):
+        message = {'type': 'job_update', 'job': event['job']}
+        if event.get('event'):
+            message['event'] = event['event']
+        await self.send(text_data=json.dumps(message))
+
+    @database_sync_to_async
+    def get_job_state(self):
+        """Starea job-ului, doar pentru user-ul care l-a creat"""
+        if not self.user.is_authenticated:
+            return None
+        job = BackgroundJob.objects.filter(id=self.job_id, created_by=self.user).first()
+        return serialize_job(job) if job else None
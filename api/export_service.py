@@ -4,6 +4,11 @@ Export Service for converting presentations to PDF and PowerPoint formats.
 
 import json
 import io
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from pptx import Presentation as PPTXPresentation
 from pptx.util import Inches, Pt
 from pptx.enum.text import PP_ALIGN
@@ -12,7 +17,191 @@ from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 from reportlab.lib.units import inch
 from reportlab.lib import colors
+from pypdf import PdfReader, PdfWriter
+from django.conf import settings
 from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.text import slugify
+
+from .text_layout import get_text_layout_engine, resolve_font
+
+
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+
+def get_pdf_render_pool():
+    """
+    Return the process-wide pool used for parallel PDF rendering.
+
+    The pool is created lazily with PDF_EXPORT_WORKERS processes and reused
+    for the life of the process, so the cost of spawning interpreters is paid
+    once. It is never replaced: other requests may be submitting to it. A
+    caller asking for fewer workers limits how much it submits at a time.
+    """
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            # spawn: the server process is multi-threaded, forking it is unsafe
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=max(1, settings.PDF_EXPORT_WORKERS),
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _pdf_pool
+
+
+def frame_to_pdf_spec(frame):
+    """
+    Convert a Frame (with its elements) into a plain, picklable dict that the
+    PDF renderer can consume without touching the database.
+    """
+    elements = []
+    for element in frame.elements.all():
+        if element.element_type not in ('TEXT', 'SHAPE'):
+            continue
+        position = json.loads(element.position) if isinstance(element.position, str) else element.position
+        content = json.loads(element.content) if isinstance(element.content, str) else element.content
+        elements.append({
+            'type': element.element_type,
+            'position': position,
+            'content': content,
+        })
+    return {
+        'background_color': frame.background_color or '#FFFFFF',
+        'elements': elements,
+    }
+
+
+def render_pdf_pages(frame_specs):
+    """
+    Render a list of frame specs to a standalone PDF document (one page per frame).
+
+    Module-level so it can run inside a worker process.
+    """
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    width, height = letter
+
+    for spec in frame_specs:
+        PresentationExportService._draw_pdf_frame(c, spec, width, height)
+        c.showPage()
+
+    c.save()
+    return buffer.getvalue()
+
+
+def merge_pdf_parts(parts):
+    """Concatenate several PDF documents (bytes) into a single document."""
+    writer = PdfWriter()
+    for part in parts:
+        writer.append(PdfReader(io.BytesIO(part)))
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def render_pdf_parallel(frame_specs, workers=None, chunk_size=None):
+    """
+    Render frame specs in chunks on a process pool and merge the parts in order.
+    """
+    workers = workers or getattr(settings, 'PDF_EXPORT_WORKERS', None) or os.cpu_count() or 1
+    chunk_size = chunk_size or getattr(settings, 'PDF_EXPORT_CHUNK_SIZE', 25)
+
+    # Nu are sens să împărțim în mai multe bucăți decât workeri disponibili
+    chunk_size = max(chunk_size, -(-len(frame_specs) // workers))
+    chunks = [frame_specs[i:i + chunk_size] for i in range(0, len(frame_specs), chunk_size)]
+
+    if workers <= 1 or len(chunks) <= 1:
+        return render_pdf_pages(frame_specs)
+
+    pool = get_pdf_render_pool()
+    parts = list(pool.map(render_pdf_pages, chunks))
+    return merge_pdf_parts(parts)
+
+
+class _ZipStreamBuffer(io.RawIOBase):
+    """Write-only sink for ZipFile that hands out the bytes written so far."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_pdf_archive(items, workers=None):
+    """
+    Render several presentations to PDF and stream them as one ZIP archive.
+
+    At most `workers` presentations are rendered at the same time. Each PDF is
+    written to the archive as soon as it is ready, so bytes reach the client
+    while the remaining decks are still rendering. Failures are recorded in
+    manifest.json instead of aborting the archive.
+
+    Args:
+        items: iterable of dicts with 'id' and either 'presentation' or 'error'
+        workers: maximum number of presentations rendered in parallel
+
+    Yields:
+        chunks of the ZIP file
+    """
+    workers = workers or getattr(settings, 'PDF_EXPORT_WORKERS', None) or 1
+    buffer = _ZipStreamBuffer()
+    archive = zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED)
+    pool = get_pdf_render_pool()
+    pending = {}
+    manifest = []
+    remaining = iter(items)
+
+    def submit_next():
+        for item in remaining:
+            if item.get('error'):
+                manifest.append({'id': item['id'], 'status': 'error', 'error': item['error']})
+                continue
+            presentation = item['presentation']
+            try:
+                frame_specs = PresentationExportService(presentation).frame_specs()
+            except Exception as exc:
+                manifest.append({'id': item['id'], 'status': 'error', 'error': str(exc)})
+                continue
+            pending[pool.submit(render_pdf_pages, frame_specs)] = presentation
+            return
+
+    for _ in range(workers):
+        submit_next()
+
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            presentation = pending.pop(future)
+            filename = f"{presentation.id}-{slugify(presentation.title) or 'presentation'}.pdf"
+            try:
+                archive.writestr(filename, future.result())
+                manifest.append({'id': presentation.id, 'status': 'ok', 'file': filename})
+            except Exception as exc:
+                manifest.append({'id': presentation.id, 'status': 'error', 'error': str(exc)})
+            submit_next()
+
+        chunk = buffer.drain()
+        if chunk:
+            yield chunk
+
+    archive.writestr('manifest.json', json.dumps({
+        'exported_at': timezone.now().isoformat(),
+        'items': manifest,
+    }, indent=2))
+    archive.close()
+    yield buffer.drain()
 
 
 class PresentationExportService:
@@ -20,7 +209,9 @@ class PresentationExportService:
 
     def __init__(self, presentation):
         self.presentation = presentation
-        self.frames = list(presentation.frames.all().order_by('order'))
+        self.frames = list(
+            presentation.frames.all().order_by('order').prefetch_related('elements')
+        )
 
     def export_to_pptx(self):
         """
@@ -74,47 +265,58 @@ class PresentationExportService:
 
         return response
 
-    def export_to_pdf(self):
+    def export_to_pdf(self, parallel=None, workers=None):
         """
         Export presentation to PDF format.
 
+        Args:
+            parallel: Force the parallel (True) or sequential (False) path.
+                      When None, decks with at least PDF_EXPORT_PARALLEL_MIN_FRAMES
+                      frames are rendered in parallel.
+            workers: Number of worker processes for the parallel path.
+
         Returns:
             HttpResponse with PDF file
         """
-        buffer = io.BytesIO()
-        c = canvas.Canvas(buffer, pagesize=letter)
-        width, height = letter
-
-        for frame in self.frames:
-            # Parse JSON fields
-            elements = frame.elements.all()
-
-            # Set background color
-            bg_color = self._hex_to_rgb(frame.background_color or '#FFFFFF')
-            c.setFillColorRGB(bg_color[0]/255, bg_color[1]/255, bg_color[2]/255)
-            c.rect(0, 0, width, height, fill=1, stroke=0)
-
-            # Add elements
-            for element in elements:
-                element_pos = json.loads(element.position) if isinstance(element.position, str) else element.position
-                element_content = json.loads(element.content) if isinstance(element.content, str) else element.content
+        pdf_bytes = self.render_pdf(parallel=parallel, workers=workers)
 
-                if element.element_type == 'TEXT':
-                    self._add_text_to_pdf(c, element_content, element_pos, height)
-                elif element.element_type == 'SHAPE':
-                    self._add_shape_to_pdf(c, element_content, element_pos, height)
-
-            c.showPage()
-
-        c.save()
-        buffer.seek(0)
-
-        response = HttpResponse(buffer.read(), content_type='application/pdf')
+        response = HttpResponse(pdf_bytes, content_type='application/pdf')
         filename = f"{self.presentation.title.replace(' ', '_')}.pdf"
         response['Content-Disposition'] = f'attachment; filename="{filename}"'
 
         return response
 
+    def frame_specs(self):
+        """Plain (picklable) render specs for all frames, in presentation order."""
+        return [frame_to_pdf_spec(frame) for frame in self.frames]
+
+    def render_pdf(self, parallel=None, workers=None):
+        """Render the presentation to PDF bytes."""
+        frame_specs = self.frame_specs()
+
+        if parallel is None:
+            min_frames = getattr(settings, 'PDF_EXPORT_PARALLEL_MIN_FRAMES', 40)
+            parallel = len(frame_specs) >= min_frames
+
+        if parallel:
+            return render_pdf_parallel(frame_specs, workers=workers)
+        return render_pdf_pages(frame_specs)
+
+    @staticmethod
+    def _draw_pdf_frame(c, spec, width, height):
+        """Draw one frame spec on the current page of the canvas."""
+        # Set background color
+        bg_color = PresentationExportService._hex_to_rgb(spec['background_color'])
+        c.setFillColorRGB(bg_color[0]/255, bg_color[1]/255, bg_color[2]/255)
+        c.rect(0, 0, width, height, fill=1, stroke=0)
+
+        # Add elements
+        for element in spec['elements']:
+            if element['type'] == 'TEXT':
+                PresentationExportService._add_text_to_pdf(c, element['content'], element['position'], height)
+            elif element['type'] == 'SHAPE':
+                PresentationExportService._add_shape_to_pdf(c, element['content'], element['position'], height)
+
     def _add_text_to_pptx(self, slide, content, position):
         """Add text element to PowerPoint slide."""
         # Convert pixel positions to inches (1920x1080 -> 10x5.625 inches)
@@ -173,39 +375,21 @@ class PresentationExportService:
         shape.line.color.rgb = RGBColor(*stroke_color)
         shape.line.width = Pt(content.get('strokeWidth', 2))
 
-    def _add_text_to_pdf(self, c, content, position, page_height):
+    @staticmethod
+    def _add_text_to_pdf(c, content, position, page_height):
         """Add text element to PDF."""
         # Convert from top-left origin to bottom-left origin
         x = position['x'] * 0.5625  # Scale from 1920 to letter width (612)
         y = page_height - (position['y'] * 0.709)  # Scale and flip Y axis
 
         # Set font - map to ReportLab built-in fonts
-        font_family = content.get('fontFamily', 'Helvetica')
-        font_map = {
-            'Arial': 'Helvetica',
-            'Inter': 'Helvetica',
-            'Times New Roman': 'Times-Roman',
-            'Courier': 'Courier',
-            'Helvetica': 'Helvetica',
-        }
-
-        # Get mapped font or default to Helvetica
-        pdf_font = font_map.get(font_family, 'Helvetica')
-
-        # Apply bold if needed
-        if content.get('fontWeight') == 'bold':
-            if pdf_font == 'Helvetica':
-                pdf_font = 'Helvetica-Bold'
-            elif pdf_font == 'Times-Roman':
-                pdf_font = 'Times-Bold'
-            elif pdf_font == 'Courier':
-                pdf_font = 'Courier-Bold'
+        pdf_font = resolve_font(content.get('fontFamily', 'Helvetica'), content.get('fontWeight'))
 
         font_size = content.get('fontSize', 24) * 0.7  # Scale font size
         c.setFont(pdf_font, font_size)
 
         # Set color
-        text_color = self._hex_to_rgb(content.get('color', '#000000'))
+        text_color = PresentationExportService._hex_to_rgb(content.get('color', '#000000'))
         c.setFillColorRGB(text_color[0]/255, text_color[1]/255, text_color[2]/255)
 
         # Draw text
@@ -219,30 +403,14 @@ class PresentationExportService:
 
         # Split long text into lines
         max_width = position['width'] * 0.5625
-        words = text.split()
-        lines = []
-        current_line = []
-
-        for word in words:
-            current_line.append(word)
-            test_line = ' '.join(current_line)
-            if c.stringWidth(test_line, pdf_font, font_size) > max_width:
-                if len(current_line) > 1:
-                    current_line.pop()
-                    lines.append(' '.join(current_line))
-                    current_line = [word]
-                else:
-                    lines.append(word)
-                    current_line = []
-
-        if current_line:
-            lines.append(' '.join(current_line))
+        lines = get_text_layout_engine().wrap(text, pdf_font, font_size, max_width)
 
         # Draw each line
         for i, line in enumerate(lines):
             c.drawString(x, y - (i * font_size * 1.2), line)
 
-    def _add_shape_to_pdf(self, c, content, position, page_height):
+    @staticmethod
+    def _add_shape_to_pdf(c, content, position, page_height):
         """Add shape element to PDF."""
         x = position['x'] * 0.5625
         y = page_height - (position['y'] * 0.709) - (position['height'] * 0.709)
@@ -250,11 +418,11 @@ class PresentationExportService:
         height = position['height'] * 0.709
 
         # Set fill color
-        fill_color = self._hex_to_rgb(content.get('fill', '#818cf8'))
+        fill_color = PresentationExportService._hex_to_rgb(content.get('fill', '#818cf8'))
         c.setFillColorRGB(fill_color[0]/255, fill_color[1]/255, fill_color[2]/255)
 
         # Set stroke color
-        stroke_color = self._hex_to_rgb(content.get('stroke', '#6366f1'))
+        stroke_color = PresentationExportService._hex_to_rgb(content.get('stroke', '#6366f1'))
         c.setStrokeColorRGB(stroke_color[0]/255, stroke_color[1]/255, stroke_color[2]/255)
         c.setLineWidth(content.get('strokeWidth', 2))
 
@@ -264,7 +432,8 @@ class PresentationExportService:
         else:
             c.rect(x, y, width, height, fill=1, stroke=1)
 
-    def _hex_to_rgb(self, hex_color):
+    @staticmethod
+    def _hex_to_rgb(hex_color):
         """Convert hex color to RGB tuple."""
         hex_color = hex_color.lstrip('#')
         if len(hex_color) == 3:
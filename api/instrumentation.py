@@ -0,0 +1,330 @@
+"""
+Query-count and latency instrumentation.
+
+    MIDDLEWARE = ['api.instrumentation.InstrumentationMiddleware', ...]
+    class GameConsumer(InstrumentedConsumerMixin, AsyncJsonWebsocketConsumer): ...
+    GET /api/metrics/    (Prometheus text format, INSTRUMENTATION_METRICS_TOKEN or staff)
+
+Every HTTP request (labelled by method, URL name and status) and every
+message handled by an instrumented consumer (labelled by consumer class and
+message type) records its query count, DB time, serializer time and total
+latency. The active measurement lives in a ContextVar, so the queries that
+consumers run through database_sync_to_async are attributed to the message
+that triggered them.
+
+- Queries are timed by an execute wrapper installed on every database
+  connection when it is opened (_install_query_timer).
+- Serializer time is the time spent in Serializer.data / ListSerializer.data,
+  including the queries those trigger (nested prefetches, method fields).
+
+When INSTRUMENTATION_SLOW_LOG is on, requests or messages slower than
+INSTRUMENTATION_SLOW_MS, or running more than INSTRUMENTATION_SLOW_QUERIES
+queries, are logged to the "api.instrumentation.slow" logger with their
+first INSTRUMENTATION_SQL_LIMIT statements. Metrics are kept per process;
+each worker exposes its own.
+
+The metrics endpoint does not trust the client address (behind a reverse
+proxy every request comes from 127.0.0.1): scrapers send
+"Authorization: Bearer <INSTRUMENTATION_METRICS_TOKEN>", or a staff user
+reads it with their session.
+"""
+
+import bisect
+import contextvars
+import hmac
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db.backends.signals import connection_created
+from django.http import Http404, HttpResponse
+
+slow_logger = logging.getLogger(__name__ + '.slow')
+
+METRIC_PREFIX = 'smarthack'
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current = contextvars.ContextVar('instrumentation_measurement', default=None)
+
+
+class Measurement:
+    """Costs accumulated while one request or message is handled."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+        self.statements = []  # (secunde, SQL) pentru log-ul de request-uri lente
+
+    def add_query(self, sql, duration):
+        self.queries += 1
+        self.db_time += duration
+        if len(self.statements) < settings.INSTRUMENTATION_SQL_LIMIT:
+            self.statements.append((duration, sql))
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+def current_measurement():
+    """The measurement of the request/message being handled (None outside one)."""
+    return _current.get()
+
+
+# ----- Metrics registry -----
+
+class _Series:
+    __slots__ = ('count', 'queries', 'db_time', 'serializer_time', 'latency', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.latency = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+
+class MetricsRegistry:
+    """Thread-safe per-process counters, rendered in the Prometheus text format."""
+
+    # kind -> (nume metric, etichete)
+    KINDS = {
+        'http': ('http_request', ('method', 'view', 'status')),
+        'ws': ('ws_message', ('consumer', 'message')),
+    }
+
+    def __init__(self):
+        self._series = defaultdict(dict)  # kind -> {etichete: _Series}
+        self._lock = threading.Lock()
+
+    def observe(self, kind, labels, measurement, latency):
+        with self._lock:
+            series = self._series[kind].get(labels)
+            if series is None:
+                series = self._series[kind][labels] = _Series()
+            series.count += 1
+            series.queries += measurement.queries
+            series.db_time += measurement.db_time
+            series.serializer_time += measurement.serializer_time
+            series.latency += latency
+            index = bisect.bisect_left(LATENCY_BUCKETS, latency)
+            if index < len(LATENCY_BUCKETS):
+                series.buckets[index] += 1
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def snapshot(self, kind):
+        """{labels: (count, queries, db_time, serializer_time, latency)} for tests and debugging."""
+        with self._lock:
+            return {
+                labels: (s.count, s.queries, s.db_time, s.serializer_time, s.latency)
+                for labels, s in self._series[kind].items()
+            }
+
+    def render(self):
+        lines = []
+        with self._lock:
+            for kind, (name, label_names) in self.KINDS.items():
+                series = self._series.get(kind, {})
+                base = f'{METRIC_PREFIX}_{name}'
+                counters = (
+                    ('s_total', 'Handled', lambda s: s.count),
+                    ('_queries_total', 'Database queries run by', lambda s: s.queries),
+                    ('_db_seconds_total', 'Seconds spent in the database by', lambda s: s.db_time),
+                    ('_serializer_seconds_total', 'Seconds spent serializing in', lambda s: s.serializer_time),
+                )
+                for suffix, description, value in counters:
+                    lines.append(f'# HELP {base}{suffix} {description} {name.replace("_", " ")}s.')
+                    lines.append(f'# TYPE {base}{suffix} counter')
+                    for labels, s in series.items():
+                        lines.append(f'{base}{suffix}{{{_labels(label_names, labels)}}} {_number(value(s))}')
+
+                lines.append(f'# HELP {base}_duration_seconds Latency of {name.replace("_", " ")}s.')
+                lines.append(f'# TYPE {base}_duration_seconds histogram')
+                for labels, s in series.items():
+                    label_text = _labels(label_names, labels)
+                    cumulative = 0
+                    for bound, bucket in zip(LATENCY_BUCKETS, s.buckets):
+                        cumulative += bucket
+                        lines.append(f'{base}_duration_seconds_bucket{{{label_text},le="{bound}"}} {cumulative}')
+                    lines.append(f'{base}_duration_seconds_bucket{{{label_text},le="+Inf"}} {s.count}')
+                    lines.append(f'{base}_duration_seconds_sum{{{label_text}}} {_number(s.latency)}')
+                    lines.append(f'{base}_duration_seconds_count{{{label_text}}} {s.count}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values):
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+registry = MetricsRegistry()
+
+
+# ----- Colectare -----
+
+def _time_query(execute, sql, params, many, context):
+    measurement = _current.get()
+    if measurement is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        measurement.add_query(sql, time.perf_counter() - started)
+
+
+def _install_query_timer(sender, connection, **kwargs):
+    # connection_created vine la fiecare (re)conectare a aceluiași wrapper
+    if _time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_time_query)
+
+
+def _timed_data(prop):
+    def data(self):
+        measurement = _current.get()
+        if measurement is None or measurement.serializer_depth:
+            return prop.fget(self)
+        measurement.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return prop.fget(self)
+        finally:
+            measurement.serializer_depth -= 1
+            measurement.serializer_time += time.perf_counter() - started
+    return property(data)
+
+
+_installed = False
+
+
+def install():
+    """Hook the query timer and the serializer timer (called from ApiConfig.ready)."""
+    global _installed
+    if _installed or not settings.INSTRUMENTATION_ENABLED:
+        return
+    _installed = True
+
+    from django.db import connections
+    from rest_framework import serializers
+
+    connection_created.connect(_install_query_timer, dispatch_uid='api.instrumentation')
+    for connection in connections.all(initialized_only=True):
+        _install_query_timer(None, connection)
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        cls.data = _timed_data(cls.__dict__['data'])
+
+
+def _finish(kind, labels, measurement, description):
+    latency = measurement.elapsed()
+    registry.observe(kind, labels, measurement, latency)
+    if not settings.INSTRUMENTATION_SLOW_LOG:
+        return
+    if (latency * 1000 >= settings.INSTRUMENTATION_SLOW_MS
+            or measurement.queries > settings.INSTRUMENTATION_SLOW_QUERIES):
+        statements = '\n'.join(f'  {duration * 1000:7.1f} ms  {sql}' for duration, sql in measurement.statements)
+        slow_logger.warning(
+            'Slow %s: %.0f ms, %d queries, db %.0f ms, serializer %.0f ms\n%s',
+            description, latency * 1000, measurement.queries, measurement.db_time * 1000,
+            measurement.serializer_time * 1000, statements,
+        )
+
+
+# ----- HTTP -----
+
+class InstrumentationMiddleware:
+    """Records query count, DB/serializer time and latency for every request."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.INSTRUMENTATION_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        measurement = Measurement()
+        token = _current.set(measurement)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._record(request, response, measurement)
+        return response
+
+    async def __acall__(self, request):
+        measurement = Measurement()
+        token = _current.set(measurement)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._record(request, response, measurement)
+        return response
+
+    def _record(self, request, response, measurement):
+        # Numele view-ului (ex. "presentation-detail"), nu path-ul: etichete în număr fix
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unmatched'
+        _finish('http', (request.method, view, str(response.status_code)), measurement,
+                f'request {request.method} {request.path}')
+
+
+def _can_read_metrics(request):
+    token = settings.INSTRUMENTATION_METRICS_TOKEN
+    scheme, _, credentials = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+    if token and scheme.lower() == 'bearer' and hmac.compare_digest(credentials.encode(), token.encode()):
+        return True
+    user = getattr(request, 'user', None)
+    return bool(user and user.is_authenticated and user.is_staff)
+
+
+def metrics_view(request):
+    """Metrics in the Prometheus text format, for the scraper token or staff users."""
+    if not _can_read_metrics(request):
+        raise Http404
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+# ----- WebSocket -----
+
+class InstrumentedConsumerMixin:
+    """
+    Records every message a Channels consumer handles (connect, receive,
+    group events, disconnect), labelled by the message type.
+    """
+
+    async def dispatch(self, message):
+        if not settings.INSTRUMENTATION_ENABLED:
+            return await super().dispatch(message)
+        measurement = Measurement()
+        token = _current.set(measurement)
+        try:
+            return await super().dispatch(message)
+        finally:
+            _current.reset(token)
+            name = type(self).__name__
+            _finish('ws', (name, message.get('type', '')), measurement,
+                    f'message {name} {message.get("type", "")}')
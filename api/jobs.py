@@ -0,0 +1,246 @@
+"""
+In-process background job queue.
+
+Jobs are persisted as BackgroundJob rows and executed on a thread pool, so
+slow work (AI calls, bulk copies) does not hold a request worker. Progress
+and results can be polled at /api/jobs/<id>/ or followed live on the
+WebSocket channel ws/jobs/<id>/.
+
+Every process refreshes heartbeat_at on the jobs it holds (queued or
+running) every JOB_HEARTBEAT_INTERVAL seconds. A queued or running job whose
+heartbeat is older than JOB_STALE_AFTER belonged to a process that died;
+fail_interrupted_jobs() marks those as failed. It runs when a process starts
+its job pool and from `python manage.py fail_interrupted_jobs`.
+
+Handlers are registered per job kind:
+
+    @job_handler('ai_rewrite')
+    def run_rewrite(job):
+        job.report_progress(50, 'Calling AI')
+        return {'rewritten': '...'}
+"""
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+JOB_HANDLERS = {}
+
+_executor = None
+_executor_lock = threading.Lock()
+_held = set()  # job-urile (queued / running) din procesul curent
+
+
+def job_handler(kind):
+    """Register a function as the handler for a job kind."""
+    def decorator(func):
+        JOB_HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+def job_group_name(job_id):
+    return f'job_{job_id}'
+
+
+def serialize_job(job):
+    """Payload sent to clients (WebSocket and polling endpoint)."""
+    try:
+        result = json.loads(job.result) if job.result else None
+    except ValueError:
+        result = None
+    return {
+        'id': job.id,
+        'kind': job.kind,
+        'status': job.status,
+        'progress': job.progress,
+        'progress_message': job.progress_message,
+        'result': result,
+        'error': job.error or None,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+def notify_job(job, event=None):
+    """
+    Push the job state to WebSocket subscribers.
+
+    Args:
+        event: optional extra payload (e.g. a partial result) sent along.
+    """
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    message = {'type': 'job_update', 'job': serialize_job(job)}
+    if event:
+        message['event'] = event
+    try:
+        async_to_sync(channel_layer.group_send)(job_group_name(job.id), message)
+    except Exception:
+        logger.exception("Could not publish update for job %s", job.id)
+
+
+class JobContext:
+    """Handle passed to job handlers."""
+
+    def __init__(self, job):
+        self.job = job
+        self.payload = json.loads(job.payload or '{}')
+        self.user = job.created_by
+
+    def report_progress(self, progress, message='', event=None):
+        self.job.progress = max(0, min(int(progress), 100))
+        self.job.progress_message = message[:255]
+        BackgroundJob.objects.filter(pk=self.job.pk).update(
+            progress=self.job.progress,
+            progress_message=self.job.progress_message,
+            heartbeat_at=timezone.now(),
+        )
+        notify_job(self.job, event)
+
+
+def run_job(job_id):
+    """Execute a queued job in the current thread and store its outcome."""
+    job = BackgroundJob.objects.select_related('created_by').get(pk=job_id)
+    handler = JOB_HANDLERS.get(job.kind)
+
+    job.status = BackgroundJob.STATUS_RUNNING
+    job.started_at = job.heartbeat_at = timezone.now()
+    job.save(update_fields=['status', 'started_at', 'heartbeat_at'])
+    notify_job(job)
+
+    try:
+        if handler is None:
+            raise ValueError(f"Unknown job kind: {job.kind}")
+        result = handler(JobContext(job))
+    except Exception as exc:
+        logger.exception("Job %s (%s) failed", job.id, job.kind)
+        job.status = BackgroundJob.STATUS_FAILED
+        job.error = str(exc)
+    else:
+        job.status = BackgroundJob.STATUS_SUCCEEDED
+        job.result = json.dumps(result, default=str)
+        job.progress = 100
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'result', 'progress', 'finished_at'])
+    notify_job(job)
+    return job
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            return _executor
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.JOB_WORKERS,
+            thread_name_prefix='jobs',
+        )
+        threading.Thread(target=_heartbeat_loop, name='jobs-heartbeat', daemon=True).start()
+    # Primul job al procesului: job-urile proceselor moarte nu mai rulează niciodată
+    fail_interrupted_jobs()
+    return _executor
+
+
+def _heartbeat_loop():
+    while True:
+        time.sleep(settings.JOB_HEARTBEAT_INTERVAL)
+        with _executor_lock:
+            job_ids = list(_held)
+        if not job_ids:
+            continue
+        close_old_connections()
+        try:
+            BackgroundJob.objects.filter(pk__in=job_ids).update(heartbeat_at=timezone.now())
+        except DatabaseError:
+            logger.warning("Could not refresh job heartbeats", exc_info=True)
+        finally:
+            close_old_connections()
+
+
+def _run_in_background(job_id):
+    close_old_connections()
+    try:
+        run_job(job_id)
+    except Exception:
+        logger.exception("Job %s crashed", job_id)
+    finally:
+        with _executor_lock:
+            _held.discard(job_id)
+        close_old_connections()
+
+
+def _submit(job_id):
+    with _executor_lock:
+        _held.add(job_id)
+    _get_executor().submit(_run_in_background, job_id)
+
+
+def fail_interrupted_jobs(stale_after=None):
+    """
+    Mark queued or running jobs whose heartbeat is older than stale_after
+    seconds (default JOB_STALE_AFTER) as failed. The queue lives in the
+    process that accepted the job, so once that process is gone nothing
+    would pick them up again and clients polling them would wait forever.
+    Jobs held by live processes keep a fresh heartbeat and are left alone.
+    """
+    if stale_after is None:
+        stale_after = settings.JOB_STALE_AFTER
+    cutoff = timezone.now() - timedelta(seconds=stale_after)
+    try:
+        count = (
+            BackgroundJob.objects
+            .filter(status__in=[BackgroundJob.STATUS_QUEUED, BackgroundJob.STATUS_RUNNING])
+            .alias(last_seen=Coalesce('heartbeat_at', 'created_at'))
+            .filter(last_seen__lt=cutoff)
+            .update(
+                status=BackgroundJob.STATUS_FAILED,
+                error='Interrupted by a server restart',
+                finished_at=timezone.now(),
+            )
+        )
+    except DatabaseError:
+        logger.warning("Could not check for interrupted jobs", exc_info=True)
+        return 0
+    if count:
+        logger.warning("Marked %d interrupted job(s) as failed", count)
+    return count
+
+
+def enqueue_job(kind, payload, user):
+    """
+    Create a job and schedule it after the current transaction commits.
+
+    With JOBS_RUN_INLINE (tests, debugging) the job runs synchronously.
+    """
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+
+    job = BackgroundJob.objects.create(
+        kind=kind,
+        payload=json.dumps(payload),
+        created_by=user,
+        heartbeat_at=timezone.now(),
+    )
+
+    if settings.JOBS_RUN_INLINE:
+        return run_job(job.id)
+
+    transaction.on_commit(lambda: _submit(job.id))
+    return job
@@ -0,0 +1,125 @@
+"""
+Incremental parser for a JSON object that arrives in chunks (e.g. a streamed
+model response).
+
+Members of the root object are reported as soon as they are complete, and the
+items of top-level arrays are reported one by one, so a caller can act on
+`frames[0]` while `frames[1]` is still being generated:
+
+    parser = JSONObjectStream()
+    for chunk in chunks:
+        for key, index, value in parser.feed(chunk):
+            ...  # ('title', None, 'Deck'), ('frames', 0, {...}), ...
+    parser.close()
+
+Text before the root object (e.g. a markdown code fence) and after it is
+ignored.
+"""
+
+import json
+
+
+class JSONObjectStream:
+    """
+    Streaming scanner for a single JSON object.
+
+    feed() returns a list of (key, index, value) events:
+      - (key, None, value) when a non-array member of the root object is complete
+      - (key, index, value) for every item of a root member that is an array
+    """
+
+    def __init__(self):
+        self._buffer = ''
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._started = False
+        self.done = False
+
+        self._expect_key = False
+        self._key_start = None
+        self._key = None
+        self._value_start = None
+        self._value_is_array = False
+        self._item_start = None
+        self._item_index = 0
+
+    def feed(self, text):
+        self._buffer += text
+        events = []
+        buffer = self._buffer
+
+        for i in range(self._pos, len(buffer)):
+            if self.done:
+                break
+            char = buffer[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect_key:
+                        self._key = json.loads(buffer[self._key_start:i + 1])
+                continue
+
+            if not self._started:
+                if char == '{':
+                    self._started = True
+                    self._depth = 1
+                    self._expect_key = True
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect_key:
+                    self._key_start = i
+            elif char in '{[':
+                self._depth += 1
+                if self._depth == 2 and char == '[':
+                    self._value_is_array = True
+                    self._item_start = i + 1
+                    self._item_index = 0
+            elif char == ':' and self._depth == 1:
+                self._expect_key = False
+                self._value_start = i + 1
+                self._value_is_array = False
+            elif char == ',':
+                if self._depth == 1:
+                    self._emit_member(buffer, i, events)
+                    self._expect_key = True
+                elif self._depth == 2 and self._value_is_array:
+                    self._emit_item(buffer, i, events)
+            elif char in '}]':
+                if self._depth == 2 and self._value_is_array and char == ']':
+                    self._emit_item(buffer, i, events)
+                elif self._depth == 1:
+                    self._emit_member(buffer, i, events)
+                    self.done = True
+                self._depth -= 1
+
+        self._pos = len(buffer)
+        return events
+
+    def close(self):
+        """Raise ValueError if the root object never completed."""
+        if not self.done:
+            raise ValueError("Incomplete JSON object in stream")
+
+    def _emit_member(self, buffer, end, events):
+        if self._value_start is None:
+            return
+        raw = buffer[self._value_start:end].strip()
+        if raw and not self._value_is_array:
+            events.append((self._key, None, json.loads(raw)))
+        self._value_start = None
+
+    def _emit_item(self, buffer, end, events):
+        raw = buffer[self._item_start:end].strip()
+        if raw:
+            events.append((self._key, self._item_index, json.loads(raw)))
+            self._item_index += 1
+        self._item_start = end + 1
@@ -0,0 +1,33 @@
+"""
+Creează versiuni automate pentru prezentările modificate și aplică retenția.
+
+Usage:
+    python manage.py autosave_versions [--loop]
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api.autosave import autosave_presentations
+
+
+class Command(BaseCommand):
+    help = "Snapshot presentations edited since their last version and thin old automatic versions."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep running, once every VERSION_AUTOSAVE_INTERVAL seconds')
+
+    def handle(self, *args, **options):
+        while True:
+            summary = autosave_presentations()
+            self.stdout.write(self.style.SUCCESS(
+                f"Checked {summary['checked']} presentations, created {summary['created']} versions, "
+                f"thinned {summary['thinned']}"
+            ))
+            if not options['loop']:
+                return
+            close_old_connections()
+            time.sleep(settings.VERSION_AUTOSAVE_INTERVAL)
@@ -0,0 +1,109 @@
+"""
+Benchmark pentru căutarea de assets: index de tokens vs. icontains.
+
+Datele de test sunt create într-o tranzacție care este anulată la final.
+
+Usage:
+    python manage.py benchmark_asset_search --assets 1000000
+"""
+import json
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from api.asset_search import index_assets, search_assets
+from api.models import Asset
+
+WORDS = (
+    'cat', 'dog', 'school', 'education', 'logo', 'chart', 'map', 'science', 'history',
+    'math', 'biology', 'photo', 'icon', 'background', 'teacher', 'student', 'classroom',
+    'planet', 'atom', 'river', 'mountain', 'romania', 'europe', 'diagram', 'catalog',
+)
+SYLLABLES = ('ba', 'co', 'di', 'fe', 'ga', 'lo', 'mi', 'nu', 'pa', 'ro', 'si', 'ta', 'vu', 'ze')
+QUERIES = ('cat', 'school logo', 'educ', 'romania map', 'planet atom diagram')
+
+
+def build_vocabulary(rng, size):
+    """Common words plus pseudo-words, so that matches stay selective like in a real library."""
+    words = set(WORDS)
+    while len(words) < size:
+        words.add(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+class Command(BaseCommand):
+    help = "Time ranked index search against the legacy icontains search on synthetic assets."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--assets', type=int, default=1_000_000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--vocabulary', type=int, default=20000, help='Distinct words in names and tags')
+
+    def handle(self, *args, **options):
+        owner = User.objects.order_by('id').first()
+        if owner is None:
+            raise CommandError("At least one user is required")
+        rng = random.Random(42)
+        now = timezone.now()
+        vocabulary = build_vocabulary(rng, options['vocabulary'])
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            created = 0
+            while created < options['assets']:
+                size = min(options['batch_size'], options['assets'] - created)
+                batch = Asset.objects.bulk_create([
+                    Asset(
+                        name=' '.join(rng.sample(vocabulary, 3)).title(),
+                        asset_type=rng.choice(('image', 'icon', 'video')),
+                        file_url='', thumbnail_url='',
+                        tags=json.dumps(rng.sample(vocabulary, 2)),
+                        file_size=0, created_at=now, uploaded_by=owner,
+                    )
+                    for _ in range(size)
+                ])
+                if batch[0].pk is None:
+                    batch = list(Asset.objects.order_by('-id')[:size])
+                index_assets(batch)
+                created += size
+            self.stdout.write(f"Created and indexed {created} assets in {time.perf_counter() - started:.1f} s")
+            self._analyze()
+
+            scope = Asset.objects.filter(Q(uploaded_by=owner))
+            for query in QUERIES:
+                legacy_qs = scope.filter(Q(name__icontains=query) | Q(tags__icontains=query)).distinct()
+                # aceeași pagină ca endpoint-ul: total + primele 20
+                legacy = self._time(options['repeat'], lambda: (
+                    legacy_qs.count(), list(legacy_qs.order_by('-created_at', '-id')[:20])
+                ))
+                indexed = self._time(options['repeat'], lambda: search_assets(scope, query, limit=20))
+                total, _ = search_assets(scope, query, limit=20)
+                self.stdout.write(
+                    f"{query!r:24} icontains: {legacy:8.1f} ms   index: {indexed:8.1f} ms   ({total} matches)"
+                )
+
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def _analyze():
+        # Statistici proaspete, altfel planner-ul nu știe cât de selectiv e indexul de tokens
+        tables = ('api_asset', 'api_assetsearchtoken', 'api_assettag')
+        with connection.cursor() as cursor:
+            if connection.vendor == 'mysql':
+                cursor.execute(f"ANALYZE TABLE {', '.join(tables)}")
+                cursor.fetchall()
+            elif connection.vendor == 'sqlite':
+                cursor.execute('ANALYZE')
+
+    @staticmethod
+    def _time(repeat, func):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - started) * 1000 / repeat
@@ -0,0 +1,52 @@
+"""
+Benchmark pentru clonarea unei prezentări pentru mai mulți utilizatori.
+
+Datele de test sunt create într-o tranzacție care este anulată la final.
+
+Usage:
+    python manage.py benchmark_clone --frames 300 --copies 30
+"""
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from api.cloning import clone_presentations
+from api.materializers import materialize_presentation
+
+from .benchmark_pdf_export import build_synthetic_frames
+
+
+class Command(BaseCommand):
+    help = "Time cloning a synthetic deck once per target user."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--frames', type=int, default=300)
+        parser.add_argument('--elements', type=int, default=5, help='Elements per frame')
+        parser.add_argument('--copies', type=int, default=30)
+
+    def handle(self, *args, **options):
+        owner = User.objects.order_by('id').first()
+        if owner is None:
+            raise CommandError("At least one user is required")
+
+        with transaction.atomic():
+            frames = build_synthetic_frames(options['frames'], options['elements'])
+            original = materialize_presentation(owner, {'title': 'Benchmark', 'frames': frames})
+            targets = [{'owner': owner, 'title': f'Copy {i + 1}'} for i in range(options['copies'])]
+
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                clone_presentations(original, targets)
+                elapsed = time.perf_counter() - started
+
+            transaction.set_rollback(True)
+
+        rows = options['copies'] * options['frames'] * (options['elements'] + 1)
+        self.stdout.write(
+            f"Deck: {options['frames']} frames x {options['elements']} elements, "
+            f"{options['copies']} copies (~{rows} rows)"
+        )
+        self.stdout.write(f"Clone: {elapsed * 1000:.0f} ms, {len(queries)} queries")
@@ -0,0 +1,94 @@
+"""
+Benchmark pentru exportul PDF: randare secvențială vs. paralelă.
+
+Usage:
+    python manage.py benchmark_pdf_export --frames 200 --workers 4
+"""
+import random
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.export_service import (
+    get_pdf_render_pool,
+    render_pdf_pages,
+    render_pdf_parallel,
+)
+
+LOREM = (
+    "Lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua Ut enim ad minim veniam quis nostrud "
+    "exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat"
+).split()
+
+
+def build_synthetic_frames(num_frames, elements_per_frame, seed=42):
+    """Build lecture-like frame specs (titles, paragraphs, shapes) without a database."""
+    rng = random.Random(seed)
+    frames = []
+    for index in range(num_frames):
+        elements = [{
+            'type': 'TEXT',
+            'position': {'x': 100, 'y': 100, 'width': 1600, 'height': 120},
+            'content': {'text': f"Slide {index + 1}", 'fontSize': 48, 'fontWeight': 'bold'},
+        }]
+        for slot in range(elements_per_frame - 1):
+            if slot % 3 == 2:
+                elements.append({
+                    'type': 'SHAPE',
+                    'position': {'x': 1400, 'y': 300 + slot * 40, 'width': 300, 'height': 200},
+                    'content': {'shape': rng.choice(['circle', 'rectangle'])},
+                })
+                continue
+            words = rng.choices(LOREM, k=rng.randint(40, 120))
+            elements.append({
+                'type': 'TEXT',
+                'position': {'x': 100, 'y': 300 + slot * 120, 'width': 1200, 'height': 100},
+                'content': {'text': ' '.join(words), 'fontSize': 24},
+            })
+        frames.append({'background_color': '#ffffff', 'elements': elements})
+    return frames
+
+
+class Command(BaseCommand):
+    help = "Compare sequential and parallel PDF rendering on a synthetic deck."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--frames', type=int, default=200)
+        parser.add_argument('--elements', type=int, default=8, help='Elements per frame')
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Chunks rendered in parallel (at most PDF_EXPORT_WORKERS, the pool size)")
+        parser.add_argument('--chunk-size', type=int, default=None)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        frames = build_synthetic_frames(options['frames'], options['elements'])
+        workers = min(options['workers'] or settings.PDF_EXPORT_WORKERS, settings.PDF_EXPORT_WORKERS)
+        repeat = max(1, options['repeat'])
+
+        # Pool-ul este pornit înainte de măsurători (în producție e refolosit între request-uri)
+        warmup_started = time.perf_counter()
+        pool = get_pdf_render_pool()
+        list(pool.map(render_pdf_pages, [frames[:1]] * workers))
+        self.stdout.write(f"Pool warm-up ({workers} workers): {time.perf_counter() - warmup_started:.2f}s")
+
+        sequential = self._best_of(repeat, lambda: render_pdf_pages(frames))
+        parallel = self._best_of(
+            repeat,
+            lambda: render_pdf_parallel(frames, workers=workers, chunk_size=options['chunk_size']),
+        )
+
+        self.stdout.write(f"Frames: {len(frames)} x {options['elements']} elements")
+        self.stdout.write(f"Sequential: {sequential:.3f}s")
+        self.stdout.write(f"Parallel:   {parallel:.3f}s")
+        self.stdout.write(self.style.SUCCESS(f"Speedup:    {sequential / parallel:.2f}x"))
+
+    @staticmethod
+    def _best_of(repeat, fn):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
@@ -0,0 +1,75 @@
+"""
+Micro-benchmark pentru împărțirea textului pe linii (PDF / thumbnails).
+
+Usage:
+    python manage.py benchmark_text_layout --paragraphs 200 --words 400
+"""
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from api.text_layout import TextLayoutEngine
+
+from .benchmark_pdf_export import LOREM
+
+
+def naive_wrap(text, font, size, max_width):
+    """The previous algorithm: re-measure every growing prefix of the line."""
+    lines = []
+    current_line = []
+    for word in text.split():
+        current_line.append(word)
+        test_line = ' '.join(current_line)
+        if stringWidth(test_line, font, size) > max_width:
+            if len(current_line) > 1:
+                current_line.pop()
+                lines.append(' '.join(current_line))
+                current_line = [word]
+            else:
+                lines.append(word)
+                current_line = []
+    if current_line:
+        lines.append(' '.join(current_line))
+    return tuple(lines)
+
+
+class Command(BaseCommand):
+    help = "Compare naive prefix-measuring word wrap against the cached layout engine."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--paragraphs', type=int, default=200)
+        parser.add_argument('--words', type=int, default=400, help='Words per paragraph')
+        parser.add_argument('--width', type=float, default=675.0, help='Box width in points')
+        parser.add_argument('--font-size', type=float, default=16.8)
+
+    def handle(self, *args, **options):
+        rng = random.Random(7)
+        paragraphs = [
+            ' '.join(rng.choices(LOREM, k=options['words']))
+            for _ in range(options['paragraphs'])
+        ]
+        font, size, width = 'Helvetica', options['font_size'], options['width']
+
+        started = time.perf_counter()
+        expected = [naive_wrap(text, font, size, width) for text in paragraphs]
+        naive = time.perf_counter() - started
+
+        engine = TextLayoutEngine()
+        started = time.perf_counter()
+        cold_result = [engine.wrap(text, font, size, width) for text in paragraphs]
+        cold = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for text in paragraphs:
+            engine.wrap(text, font, size, width)
+        warm = time.perf_counter() - started
+
+        if cold_result != expected:
+            self.stderr.write(self.style.WARNING("Layout differs from the naive algorithm"))
+
+        self.stdout.write(f"Paragraphs: {len(paragraphs)} x {options['words']} words")
+        self.stdout.write(f"Naive:          {naive * 1000:.1f} ms")
+        self.stdout.write(f"Engine (cold):  {cold * 1000:.1f} ms ({naive / cold:.1f}x)")
+        self.stdout.write(f"Engine (warm):  {warm * 1000:.2f} ms ({naive / max(warm, 1e-9):.0f}x)")
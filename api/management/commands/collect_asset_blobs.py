@@ -0,0 +1,26 @@
+"""
+Șterge blob-urile fără referințe (după ASSET_BLOB_GC_GRACE), cu fișierele și derivatele lor.
+
+Usage:
+    python manage.py collect_asset_blobs [--grace SECUNDE] [--recount]
+"""
+from django.core.management.base import BaseCommand
+
+from api.asset_blobs import collect_garbage, recount_references
+
+
+class Command(BaseCommand):
+    help = "Garbage-collect unreferenced asset blobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace', type=int, default=None,
+                            help="Seconds a blob must stay unreferenced (default ASSET_BLOB_GC_GRACE)")
+        parser.add_argument('--recount', action='store_true',
+                            help="Recompute reference counts from assets and brand kits first")
+
+    def handle(self, *args, **options):
+        if options['recount']:
+            fixed = recount_references()
+            self.stdout.write(f"Fixed {fixed} reference counts")
+        removed = collect_garbage(grace=options['grace'])
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} unreferenced blobs"))
@@ -0,0 +1,34 @@
+"""
+Caută fișiere duplicate printre assets existente și le mută în blob store.
+
+Fiecare asset local fără blob este hash-uit; copiile unui conținut deja
+stocat sunt înlocuite cu fișierul stocat (link-urile din elemente, fundaluri
+și brand kits sunt rescrise), apoi assets cu același blob, uploader și grup
+sunt comasate.
+
+Usage:
+    python manage.py dedupe_assets [--dry-run] [--no-merge]
+"""
+from django.core.management.base import BaseCommand
+
+from api.asset_blobs import merge_duplicate_assets, scan_assets
+
+
+class Command(BaseCommand):
+    help = "Attach existing assets to content-addressed blobs and merge duplicates."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Only report what would change")
+        parser.add_argument('--no-merge', action='store_true', help="Keep duplicate Asset rows")
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        stats = scan_assets(dry_run=dry_run, batch_size=options['batch_size'])
+        merged = 0 if options['no_merge'] else merge_duplicate_assets(dry_run=dry_run)
+
+        prefix = "Would remove" if dry_run else "Removed"
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned {stats['scanned']} files. {prefix} {stats['duplicates']} duplicate files "
+            f"({stats['reclaimed_bytes']} bytes) and {merged} duplicate assets"
+        ))
@@ -0,0 +1,22 @@
+"""
+Marchează ca failed job-urile queued/running al căror proces a murit
+(fără heartbeat de JOB_STALE_AFTER secunde).
+
+Usage:
+    python manage.py fail_interrupted_jobs [--stale-after SECONDS]
+"""
+from django.core.management.base import BaseCommand
+
+from api.jobs import fail_interrupted_jobs
+
+
+class Command(BaseCommand):
+    help = "Fail background jobs left behind by a dead server process."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stale-after', type=int, default=None,
+                            help="Seconds without a heartbeat before a job counts as dead (default JOB_STALE_AFTER)")
+
+    def handle(self, *args, **options):
+        failed = fail_interrupted_jobs(options['stale_after'])
+        self.stdout.write(self.style.SUCCESS(f"Failed {failed} interrupted jobs"))
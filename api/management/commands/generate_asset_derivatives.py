@@ -0,0 +1,30 @@
+"""
+Generează derivatele (thumbnail, lățimi responsive, WebP) pentru imaginile existente.
+
+Usage:
+    python manage.py generate_asset_derivatives [--asset ID ...] [--force]
+"""
+from django.core.management.base import BaseCommand
+
+from api.asset_derivatives import generate_asset_derivatives
+from api.models import Asset
+
+
+class Command(BaseCommand):
+    help = "Generate thumbnails and responsive variants for image assets stored locally."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--asset', type=int, action='append', dest='asset_ids')
+        parser.add_argument('--force', action='store_true', help="Re-encode files that already exist")
+
+    def handle(self, *args, **options):
+        assets = Asset.objects.filter(asset_type='image').order_by('id')
+        if options['asset_ids']:
+            assets = assets.filter(id__in=options['asset_ids'])
+
+        processed = written = 0
+        for asset_id in assets.values_list('id', flat=True).iterator():
+            written += generate_asset_derivatives(asset_id, force=options['force'])
+            processed += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Checked {processed} images, wrote {written} files"))
@@ -0,0 +1,31 @@
+"""
+Regenerează thumbnail-urile pentru frame-urile modificate.
+
+Usage:
+    python manage.py generate_thumbnails [--presentation ID] [--force]
+"""
+from django.core.management.base import BaseCommand
+
+from api.models import Presentation
+from api.thumbnail_service import generate_presentation_thumbnails
+
+
+class Command(BaseCommand):
+    help = "Render frame thumbnails for presentations whose frames changed since the last run."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--presentation', type=int, action='append', dest='presentation_ids')
+        parser.add_argument('--force', action='store_true', help='Re-render even unchanged frames')
+
+    def handle(self, *args, **options):
+        presentation_ids = options['presentation_ids'] or list(
+            Presentation.objects.values_list('id', flat=True)
+        )
+
+        total = 0
+        for presentation_id in presentation_ids:
+            total += generate_presentation_thumbnails(presentation_id, force=options['force'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rendered {total} frame thumbnails across {len(presentation_ids)} presentations"
+        ))
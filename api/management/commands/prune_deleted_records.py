@@ -0,0 +1,27 @@
+"""
+Șterge tombstone-urile sync-ului incremental mai vechi de SYNC_TOMBSTONE_RETENTION.
+
+Usage:
+    python manage.py prune_deleted_records [--days N]
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.sync import prune_deleted_records
+
+
+class Command(BaseCommand):
+    help = "Prune old sync tombstones (DeletedRecord)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help="Keep tombstones from the last N days (default SYNC_TOMBSTONE_RETENTION)")
+
+    def handle(self, *args, **options):
+        older_than = None
+        if options['days'] is not None:
+            older_than = timezone.now() - timedelta(days=options['days'])
+        removed = prune_deleted_records(older_than)
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} tombstones"))
@@ -0,0 +1,33 @@
+"""
+Reconstruiește indexul de căutare pentru assets (tags + tokens).
+
+Usage:
+    python manage.py rebuild_asset_index [--batch-size 1000]
+"""
+from django.core.management.base import BaseCommand
+
+from api.asset_search import index_assets
+from api.models import Asset
+
+
+class Command(BaseCommand):
+    help = "Rebuild the asset search index (normalized tags and name/tag tokens)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_id = 0
+        total = 0
+        while True:
+            batch = list(
+                Asset.objects.filter(id__gt=last_id).order_by('id').only('id', 'name', 'tags')[:batch_size]
+            )
+            if not batch:
+                break
+            index_assets(batch)
+            total += len(batch)
+            last_id = batch[-1].id
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} assets"))
@@ -0,0 +1,308 @@
+"""
+Bulk materializers: turn a parsed presentation or quiz structure into rows.
+
+Every level (frames, elements, connections / questions, choices) is written
+with one bulk_create inside a single transaction, instead of one INSERT per
+row. Used by AI generation, template instantiation and JSON import.
+
+Presentation structure (AI output, template `structure`, or export_json):
+
+    {
+        "title": "...", "description": "...",
+        "canvas_settings": {...},            # optional
+        "presentation_path": [<frame id>],   # optional, ids from "frames"
+        "frames": [
+            {
+                "id": 12,                    # optional, source id for remapping
+                "title": "...", "order": 0, "background_color": "#fff",
+                "position": {...}, "transition_settings": {...},
+                "elements": [
+                    {"type": "TEXT", "position": {...}, "content": {...},
+                     "animation_settings": {...}, "link_url": ""}
+                ],
+                "connections_from": [...], "connections_to": [...]  # export_json
+            }
+        ],
+        "connections": [{"from_frame": 12, "to_frame": 13, "label": ""}]
+    }
+
+JSON fields may be given either as objects or as already-encoded strings.
+"""
+
+import json
+import secrets
+
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from game_module.models import Game, Question as GameQuestion, Choice as GameChoice
+
+from .models import Element, Frame, FrameConnection, Presentation
+from .revisions import next_revision
+
+BULK_BATCH_SIZE = 500
+
+DEFAULT_CANVAS_SETTINGS = {
+    'zoom': 1.0,
+    'viewport': {'x': 0, 'y': 0},
+    'background': '#ffffff'
+}
+DEFAULT_FRAME_POSITION = {'x': 0, 'y': 0, 'width': 1920, 'height': 1080, 'rotation': 0}
+DEFAULT_TRANSITION = {'type': 'fade', 'duration': 0.8, 'delay': 0, 'direction': 'none'}
+DEFAULT_ANIMATION = {'type': 'fade', 'duration': 0.8, 'delay': 0, 'easing': 'easeInOut', 'direction': 'up'}
+
+
+class MaterializationError(ValueError):
+    """The structure cannot be turned into rows."""
+
+
+def _json_text(value, default):
+    if value is None or value == '':
+        value = default
+    if isinstance(value, str):
+        return value
+    return json.dumps(value)
+
+
+def bulk_create_returning(model, objs, scope, batch_size=BULK_BATCH_SIZE):
+    """
+    bulk_create that always leaves primary keys set on objs.
+
+    Backends that cannot return rows from a bulk INSERT (MySQL) get their ids
+    back with one SELECT: rows of `scope` (a filter dict, e.g. the parent FK)
+    above the previous max id, in insertion order. Call inside a transaction.
+    """
+    if not objs:
+        return objs
+    if connection.features.can_return_rows_from_bulk_insert:
+        return model.objects.bulk_create(objs, batch_size=batch_size)
+
+    high_water = model.objects.filter(**scope).aggregate(max_id=Max('pk'))['max_id'] or 0
+    model.objects.bulk_create(objs, batch_size=batch_size)
+    pks = list(
+        model.objects.filter(pk__gt=high_water, **scope)
+        .order_by('pk')
+        .values_list('pk', flat=True)
+    )
+    if len(pks) != len(objs):
+        raise MaterializationError(
+            f"Could not resolve ids for {len(objs)} new {model.__name__} rows"
+        )
+    for obj, pk in zip(objs, pks):
+        obj.pk = pk
+        obj._state.adding = False
+        obj._state.db = connection.alias
+    return objs
+
+
+def build_frame(presentation, frame_data, order, now):
+    order = frame_data.get('order', order)
+    return Frame(
+        presentation=presentation,
+        title=(frame_data.get('title') or f"Slide {order + 1}")[:255],
+        order=order,
+        background_color=frame_data.get('background_color') or '#ffffff',
+        background_image=frame_data.get('background_image') or '',
+        position=_json_text(frame_data.get('position'), DEFAULT_FRAME_POSITION),
+        transition_settings=_json_text(frame_data.get('transition_settings'), DEFAULT_TRANSITION),
+        thumbnail_url='',
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def build_element(frame, element_data, now):
+    element_type = element_data.get('type') or element_data.get('element_type')
+    if not element_type:
+        raise MaterializationError("Element without type")
+    return Element(
+        frame=frame,
+        element_type=element_type,
+        position=_json_text(element_data.get('position'), {}),
+        content=_json_text(element_data.get('content'), {}),
+        animation_settings=_json_text(element_data.get('animation_settings'), DEFAULT_ANIMATION),
+        link_url=element_data.get('link_url') or '',
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def materialize_frames(presentation, frames_data, now=None, start_order=0):
+    """
+    Bulk-insert frames and their elements into an existing presentation.
+
+    Returns (frames, id_map) where id_map maps source frame ids (when the
+    structure carries them) to the new ids.
+    """
+    now = now or timezone.now()
+    frames = [
+        build_frame(presentation, frame_data, start_order + index, now)
+        for index, frame_data in enumerate(frames_data)
+    ]
+    bulk_create_returning(Frame, frames, {'presentation_id': presentation.id})
+
+    elements = [
+        build_element(frame, element_data, now)
+        for frame, frame_data in zip(frames, frames_data)
+        for element_data in frame_data.get('elements') or []
+    ]
+    Element.objects.bulk_create(elements, batch_size=BULK_BATCH_SIZE)
+
+    id_map = {
+        frame_data['id']: frame.id
+        for frame, frame_data in zip(frames, frames_data)
+        if frame_data.get('id') is not None
+    }
+    return frames, id_map
+
+
+def collect_connections(data):
+    """
+    Top-level "connections" plus the ones nested in frames by export_json
+    (connections_from / connections_to), each pair once.
+    """
+    items = list(data.get('connections') or [])
+    for frame_data in data.get('frames') or []:
+        for key in ('connections_from', 'connections_to'):
+            items.extend(item for item in frame_data.get(key) or [] if isinstance(item, dict))
+
+    unique = {}
+    for item in items:
+        unique.setdefault((item.get('from_frame'), item.get('to_frame')), item)
+    return list(unique.values())
+
+
+def materialize_connections(connections_data, id_map):
+    connections = [
+        FrameConnection(
+            from_frame_id=id_map[item['from_frame']],
+            to_frame_id=id_map[item['to_frame']],
+            label=(item.get('label') or '')[:100],
+        )
+        for item in connections_data or []
+        if item.get('from_frame') in id_map and item.get('to_frame') in id_map
+    ]
+    FrameConnection.objects.bulk_create(connections, batch_size=BULK_BATCH_SIZE, ignore_conflicts=True)
+    return connections
+
+
+def materialize_presentation(owner, data, template=None, title=None, now=None):
+    """
+    Create a presentation with its frames, elements and connections in one
+    transaction. presentation_path is the given path remapped to the new frame
+    ids, or all frames in order.
+    """
+    frames_data = data.get('frames') or []
+    if not isinstance(frames_data, list) or not all(isinstance(item, dict) for item in frames_data):
+        raise MaterializationError("'frames' must be a list of objects")
+    for frame_data in frames_data:
+        elements = frame_data.get('elements') or []
+        if not isinstance(elements, list) or not all(isinstance(item, dict) for item in elements):
+            raise MaterializationError("'elements' must be a list of objects")
+
+    now = now or timezone.now()
+    with transaction.atomic():
+        presentation = Presentation.objects.create(
+            owner=owner,
+            template=template,
+            title=(title or data.get('title') or 'Untitled')[:255],
+            description=data.get('description') or '',
+            canvas_settings=_json_text(data.get('canvas_settings'), DEFAULT_CANVAS_SETTINGS),
+            presentation_path='[]',
+            share_token=secrets.token_urlsafe(32),
+            is_public=0,
+            thumbnail_url='',
+            created_at=now,
+            updated_at=now
+        )
+
+        frames, id_map = materialize_frames(presentation, frames_data, now=now)
+        materialize_connections(collect_connections(data), id_map)
+
+        source_path = data.get('presentation_path')
+        if isinstance(source_path, str):
+            try:
+                source_path = json.loads(source_path)
+            except ValueError:
+                source_path = None
+        if source_path and id_map:
+            path = [id_map[frame_id] for frame_id in source_path if frame_id in id_map]
+        else:
+            path = [frame.id for frame in frames]
+
+        presentation.presentation_path = json.dumps(path)
+        Presentation.objects.filter(pk=presentation.pk).update(
+            presentation_path=presentation.presentation_path, revision=next_revision()
+        )
+
+    return presentation
+
+
+def normalize_quiz_questions(questions):
+    """Clean AI quiz output: skip empty questions, clamp time limits, ensure a correct choice."""
+    normalized = []
+    for question_payload in questions:
+        question_text = (question_payload.get('text') or '').strip()
+        if not question_text:
+            continue
+        time_limit = question_payload.get('time_limit') or 20
+        try:
+            time_limit = int(time_limit)
+        except (TypeError, ValueError):
+            time_limit = 20
+        time_limit = max(10, min(time_limit, 90))
+
+        choices_payload = question_payload.get('choices') or []
+        if not choices_payload:
+            # fallback: create generic true/false
+            choices_payload = [
+                {"text": "Adevărat", "is_correct": True},
+                {"text": "Fals", "is_correct": False},
+            ]
+
+        has_correct = any(bool(choice.get('is_correct')) for choice in choices_payload)
+        if not has_correct and choices_payload:
+            choices_payload[0]['is_correct'] = True
+
+        choices = []
+        for idx, choice_payload in enumerate(choices_payload[:4]):
+            choice_text = (choice_payload.get('text') or '').strip()
+            if choice_text:
+                choices.append({
+                    'text': choice_text[:400],
+                    'is_correct': bool(choice_payload.get('is_correct')),
+                    'order': idx,
+                })
+
+        normalized.append({'text': question_text, 'time_limit': time_limit, 'choices': choices})
+    return normalized
+
+
+def materialize_game(host, title, description, questions, base_points=1000):
+    """Create a game with its questions and choices in one transaction."""
+    questions = normalize_quiz_questions(questions)
+    with transaction.atomic():
+        game = Game.objects.create(
+            title=title[:255],
+            description=description,
+            host=host,
+            base_points=base_points
+        )
+        question_rows = [
+            GameQuestion(
+                game=game,
+                text=question['text'],
+                order=order,
+                time_limit=question['time_limit'],
+                type='choice'
+            )
+            for order, question in enumerate(questions)
+        ]
+        bulk_create_returning(GameQuestion, question_rows, {'game_id': game.id})
+        GameChoice.objects.bulk_create([
+            GameChoice(question=question_row, **choice)
+            for question_row, question in zip(question_rows, questions)
+            for choice in question['choices']
+        ], batch_size=BULK_BATCH_SIZE)
+    return game
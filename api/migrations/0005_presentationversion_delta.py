@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-19 17:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_backgroundjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='presentationversion',
+            name='encoding',
+            field=models.CharField(default='json', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='presentationversion',
+            name='is_keyframe',
+            field=models.BooleanField(default=True),
+        ),
+    ]
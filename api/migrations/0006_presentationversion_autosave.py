@@ -0,0 +1,45 @@
+# Generated by Django 5.2.8 on 2026-10-19 17:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def renumber_duplicate_versions(apps, schema_editor):
+    """Versions created concurrently may share a number; renumber them in order."""
+    PresentationVersion = apps.get_model('api', 'PresentationVersion')
+    duplicated = (
+        PresentationVersion.objects.values('presentation_id', 'version_number')
+        .annotate(count=models.Count('id'))
+        .filter(count__gt=1)
+        .values_list('presentation_id', flat=True)
+        .distinct()
+    )
+    for presentation_id in set(duplicated):
+        versions = list(
+            PresentationVersion.objects.filter(presentation_id=presentation_id)
+            .order_by('version_number', 'id')
+        )
+        for number, version in enumerate(versions, start=1):
+            version.version_number = number
+        PresentationVersion.objects.bulk_update(versions, ['version_number'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_presentationversion_delta'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='presentationversion',
+            name='is_autosave',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(renumber_duplicate_versions, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='presentationversion',
+            constraint=models.UniqueConstraint(fields=('presentation', 'version_number'), name='uniq_presentation_version_number'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.8 on 2026-10-19 17:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def index_existing_assets(apps, schema_editor):
+    from api.asset_search import index_entries
+
+    Asset = apps.get_model('api', 'Asset')
+    AssetTag = apps.get_model('api', 'AssetTag')
+    AssetSearchToken = apps.get_model('api', 'AssetSearchToken')
+
+    last_id = 0
+    while True:
+        batch = list(Asset.objects.filter(id__gt=last_id).order_by('id').values('id', 'name', 'tags')[:1000])
+        if not batch:
+            return
+        tag_rows, token_rows = [], []
+        for asset in batch:
+            tags, weights = index_entries(asset['name'], asset['tags'])
+            tag_rows.extend(AssetTag(asset_id=asset['id'], tag=tag) for tag in tags)
+            token_rows.extend(
+                AssetSearchToken(asset_id=asset['id'], token=token, weight=weight)
+                for token, weight in weights.items()
+            )
+        AssetTag.objects.bulk_create(tag_rows, batch_size=1000)
+        AssetSearchToken.objects.bulk_create(token_rows, batch_size=1000)
+        last_id = batch[-1]['id']
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_presentationversion_autosave'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssetSearchToken',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('token', models.CharField(max_length=64)),
+                ('weight', models.SmallIntegerField()),
+                ('asset', models.ForeignKey(db_column='asset_id', on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='api.asset')),
+            ],
+            options={
+                'db_table': 'api_assetsearchtoken',
+                'managed': True,
+                'indexes': [models.Index(fields=['token', 'asset'], name='assettoken_token_asset_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='AssetTag',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('tag', models.CharField(max_length=100)),
+                ('asset', models.ForeignKey(db_column='asset_id', on_delete=django.db.models.deletion.CASCADE, related_name='tag_rows', to='api.asset')),
+            ],
+            options={
+                'db_table': 'api_assettag',
+                'managed': True,
+                'indexes': [models.Index(fields=['tag', 'asset'], name='assettag_tag_asset_idx')],
+                'unique_together': {('asset', 'tag')},
+            },
+        ),
+        migrations.RunPython(index_existing_assets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-19 17:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_asset_upload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssetDerivative',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('thumbnail', 'Thumbnail'), ('responsive', 'Responsive')], max_length=20)),
+                ('format', models.CharField(max_length=10)),
+                ('width', models.IntegerField()),
+                ('height', models.IntegerField()),
+                ('file_url', models.CharField(max_length=500)),
+                ('file_size', models.BigIntegerField()),
+                ('created_at', models.DateTimeField()),
+                ('asset', models.ForeignKey(db_column='asset_id', on_delete=django.db.models.deletion.CASCADE, related_name='derivatives', to='api.asset')),
+            ],
+            options={
+                'db_table': 'api_assetderivative',
+                'managed': True,
+                'unique_together': {('asset', 'kind', 'format', 'width')},
+            },
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.8 on 2026-10-19 17:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.utils import timezone
+
+
+def link_uploaded_assets(apps, schema_editor):
+    """Blob-uri pentru assets încărcate deja pe bucăți (au content_hash); restul: dedupe_assets."""
+    Asset = apps.get_model('api', 'Asset')
+    AssetBlob = apps.get_model('api', 'AssetBlob')
+
+    prefix = settings.MEDIA_URL + settings.ASSET_STORAGE_DIR + '/'
+    rows = (
+        Asset.objects.filter(file_url__startswith=prefix).exclude(content_hash='')
+        .values('content_hash', 'file_url').annotate(refs=Count('id'))
+    )
+    for row in rows:
+        blob, created = AssetBlob.objects.get_or_create(
+            content_hash=row['content_hash'],
+            defaults={
+                'file_path': row['file_url'][len(settings.MEDIA_URL):],
+                'size': 0,
+                'ref_count': 0,
+                'created_at': timezone.now(),
+            },
+        )
+        assets = Asset.objects.filter(content_hash=row['content_hash'], file_url=row['file_url'])
+        if created:
+            blob.size = assets.values_list('file_size', flat=True).first() or 0
+        blob.ref_count += assets.update(blob=blob, file_url=settings.MEDIA_URL + blob.file_path)
+        blob.save(update_fields=['size', 'ref_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_asset_derivative'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssetBlob',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('content_hash', models.CharField(max_length=64, unique=True)),
+                ('file_path', models.CharField(db_index=True, max_length=500)),
+                ('size', models.BigIntegerField()),
+                ('ref_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField()),
+                ('unreferenced_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+            ],
+            options={
+                'db_table': 'api_assetblob',
+                'managed': True,
+            },
+        ),
+        migrations.AddField(
+            model_name='asset',
+            name='blob',
+            field=models.ForeignKey(blank=True, db_column='blob_id', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='assets', to='api.assetblob'),
+        ),
+        migrations.RunPython(link_uploaded_assets, migrations.RunPython.noop),
+    ]
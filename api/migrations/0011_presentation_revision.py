@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_asset_blob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='presentation',
+            name='revision',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
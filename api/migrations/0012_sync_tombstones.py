@@ -0,0 +1,59 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_presentation_revision'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletedRecord',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('frame', 'Frame'), ('element', 'Element'), ('connection', 'Connection'), ('comment', 'Comment')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'db_table': 'api_deletedrecord',
+                'managed': True,
+            },
+        ),
+        migrations.AddField(
+            model_name='frameconnection',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['presentation', 'updated_at'], name='comment_pres_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='element',
+            index=models.Index(fields=['frame', 'updated_at'], name='element_frame_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='frame',
+            index=models.Index(fields=['presentation', 'updated_at'], name='frame_pres_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='frameconnection',
+            index=models.Index(fields=['from_frame', 'updated_at'], name='connection_from_updated_idx'),
+        ),
+        migrations.AddField(
+            model_name='deletedrecord',
+            name='presentation',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deleted_records', to='api.presentation'),
+        ),
+        migrations.AddIndex(
+            model_name='deletedrecord',
+            index=models.Index(fields=['presentation', 'deleted_at'], name='deleted_pres_deleted_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_sync_tombstones'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['presentation', 'created_at'], name='comment_pres_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='frame',
+            index=models.Index(fields=['presentation', 'order'], name='frame_pres_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='presentationaccess',
+            index=models.Index(fields=['presentation', 'user', 'permission'], name='access_pres_user_perm_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='presentationversion',
+            name='revision',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
@@ -25,6 +25,24 @@ class BrandKit(models.Model):
 
 
 # ===== ASSET =====
+class AssetBlob(models.Model):
+    """Content-addressed file shared by assets and brand kit logos (see api/asset_blobs.py)"""
+    id = models.BigAutoField(primary_key=True)
+    content_hash = models.CharField(max_length=64, unique=True)  # sha256
+    file_path = models.CharField(max_length=500, db_index=True)  # relativ la MEDIA_ROOT
+    size = models.BigIntegerField()
+    ref_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField()
+    unreferenced_at = models.DateTimeField(blank=True, null=True, db_index=True)  # ref_count a ajuns la 0
+
+    class Meta:
+        managed = True
+        db_table = 'api_assetblob'
+
+    def __str__(self):
+        return f"{self.content_hash[:12]} ({self.ref_count} refs)"
+
+
 class Asset(models.Model):
     """Uploaded media assets (images, videos, icons)"""
     id = models.BigAutoField(primary_key=True)
@@ -33,7 +51,10 @@ class Asset(models.Model):
     file_url = models.CharField(max_length=500)
     thumbnail_url = models.CharField(max_length=500)
     tags = models.TextField()  # JSON stored as text
-    file_size = models.IntegerField()
+    file_size = models.BigIntegerField()
+    content_hash = models.CharField(max_length=64, blank=True, default='', db_index=True)  # sha256
+    blob = models.ForeignKey(AssetBlob, models.PROTECT, blank=True, null=True, db_column='blob_id',
+                             related_name='assets')
     created_at = models.DateTimeField()
     group = models.ForeignKey(Group, models.DO_NOTHING, blank=True, null=True, db_column='group_id')
     uploaded_by = models.ForeignKey(User, models.DO_NOTHING, db_column='uploaded_by_id')
@@ -46,6 +67,100 @@ class Asset(models.Model):
         return self.name
 
 
+class AssetUpload(models.Model):
+    """Chunked upload in progress (see api/asset_uploads.py)"""
+    STATUS_PENDING = 'pending'
+    STATUS_COMPLETE = 'complete'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_COMPLETE, 'Complete'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    name = models.CharField(max_length=255)
+    asset_type = models.CharField(max_length=20)
+    tags = models.TextField(default='[]')  # JSON stored as text
+    total_size = models.BigIntegerField()
+    received_bytes = models.BigIntegerField(default=0)
+    expected_sha256 = models.CharField(max_length=64, blank=True, default='')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    group = models.ForeignKey(Group, models.DO_NOTHING, blank=True, null=True, db_column='group_id')
+    uploaded_by = models.ForeignKey(User, models.CASCADE, db_column='uploaded_by_id',
+                                    related_name='asset_uploads')
+    asset = models.ForeignKey(Asset, models.SET_NULL, blank=True, null=True, db_column='asset_id')
+
+    class Meta:
+        managed = True
+        db_table = 'api_assetupload'
+
+    def __str__(self):
+        return f"{self.name} ({self.received_bytes}/{self.total_size})"
+
+
+class AssetDerivative(models.Model):
+    """Resized/re-encoded copy of an image asset (see api/asset_derivatives.py)"""
+    KIND_THUMBNAIL = 'thumbnail'
+    KIND_RESPONSIVE = 'responsive'
+    KIND_CHOICES = [
+        (KIND_THUMBNAIL, 'Thumbnail'),
+        (KIND_RESPONSIVE, 'Responsive'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    asset = models.ForeignKey(Asset, models.CASCADE, db_column='asset_id', related_name='derivatives')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    format = models.CharField(max_length=10)  # jpeg, png, webp
+    width = models.IntegerField()
+    height = models.IntegerField()
+    file_url = models.CharField(max_length=500)
+    file_size = models.BigIntegerField()
+    created_at = models.DateTimeField()
+
+    class Meta:
+        managed = True
+        db_table = 'api_assetderivative'
+        unique_together = (('asset', 'kind', 'format', 'width'),)
+
+    def __str__(self):
+        return f"{self.asset_id} {self.kind} {self.width}w {self.format}"
+
+
+class AssetTag(models.Model):
+    """Normalized asset tags (lowercase, without diacritics), one row per tag"""
+    id = models.BigAutoField(primary_key=True)
+    tag = models.CharField(max_length=100)
+    asset = models.ForeignKey(Asset, models.CASCADE, db_column='asset_id', related_name='tag_rows')
+
+    class Meta:
+        managed = True
+        db_table = 'api_assettag'
+        unique_together = (('asset', 'tag'),)
+        indexes = [models.Index(fields=['tag', 'asset'], name='assettag_tag_asset_idx')]
+
+    def __str__(self):
+        return self.tag
+
+
+class AssetSearchToken(models.Model):
+    """Search index over asset names and tags (see api/asset_search.py)"""
+    id = models.BigAutoField(primary_key=True)
+    token = models.CharField(max_length=64)
+    weight = models.SmallIntegerField()
+    asset = models.ForeignKey(Asset, models.CASCADE, db_column='asset_id', related_name='search_tokens')
+
+    class Meta:
+        managed = True
+        db_table = 'api_assetsearchtoken'
+        indexes = [models.Index(fields=['token', 'asset'], name='assettoken_token_asset_idx')]
+
+    def __str__(self):
+        return self.token
+
+
 # ===== PRESENTATION TEMPLATE =====
 class PresentationTemplate(models.Model):
     """Reusable presentation templates"""
@@ -80,6 +195,7 @@ class Presentation(models.Model):
     is_public = models.IntegerField()
     created_at = models.DateTimeField()
     updated_at = models.DateTimeField()
+    revision = models.BigIntegerField(default=0)  # vezi api/revisions.py
     brand_kit = models.ForeignKey(BrandKit, models.DO_NOTHING, blank=True, null=True, db_column='brand_kit_id')
     group = models.ForeignKey(Group, models.DO_NOTHING, blank=True, null=True, db_column='group_id')
     owner = models.ForeignKey(User, models.DO_NOTHING, db_column='owner_id', related_name='owned_presentations')
@@ -109,6 +225,9 @@ class PresentationAccess(models.Model):
     class Meta:
         managed = True
         db_table = 'api_presentationaccess'
+        indexes = [
+            models.Index(fields=['presentation', 'user', 'permission'], name='access_pres_user_perm_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.permission}"
@@ -134,6 +253,10 @@ class Frame(models.Model):
         managed = True
         db_table = 'api_frame'
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['presentation', 'order'], name='frame_pres_order_idx'),
+            models.Index(fields=['presentation', 'updated_at'], name='frame_pres_updated_idx'),
+        ]
 
     def __str__(self):
         return self.title or 'Untitled'
@@ -148,11 +271,13 @@ class FrameConnection(models.Model):
                                   related_name='outgoing_connections')
     to_frame = models.ForeignKey(Frame, models.DO_NOTHING, db_column='to_frame_id',
                                 related_name='incoming_connections')
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         managed = True
         db_table = 'api_frameconnection'
         unique_together = (('from_frame', 'to_frame'),)
+        indexes = [models.Index(fields=['from_frame', 'updated_at'], name='connection_from_updated_idx')]
 
     def __str__(self):
         return self.label or f"Connection {self.id}"
@@ -174,6 +299,7 @@ class Element(models.Model):
     class Meta:
         managed = True
         db_table = 'api_element'
+        indexes = [models.Index(fields=['frame', 'updated_at'], name='element_frame_updated_idx')]
 
     def __str__(self):
         return f"{self.element_type} - {self.id}"
@@ -200,17 +326,52 @@ class Comment(models.Model):
         managed = True
         db_table = 'api_comment'
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['presentation', 'created_at'], name='comment_pres_created_idx'),
+            models.Index(fields=['presentation', 'updated_at'], name='comment_pres_updated_idx'),
+        ]
 
     def __str__(self):
         return f"Comment by {self.author.username}"
 
 
+# ===== DELETED RECORD =====
+class DeletedRecord(models.Model):
+    """Tombstone for a deleted frame, element, connection or comment (see api/sync.py)"""
+    KIND_CHOICES = [
+        ('frame', 'Frame'),
+        ('element', 'Element'),
+        ('connection', 'Connection'),
+        ('comment', 'Comment'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    presentation = models.ForeignKey(Presentation, models.CASCADE, related_name='deleted_records')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        managed = True
+        db_table = 'api_deletedrecord'
+        indexes = [models.Index(fields=['presentation', 'deleted_at'], name='deleted_pres_deleted_idx')]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} deleted"
+
+
 # ===== PRESENTATION VERSION =====
 class PresentationVersion(models.Model):
     """Version snapshots of presentations"""
     id = models.BigAutoField(primary_key=True)
     version_number = models.IntegerField()
+    # Keyframe = snapshot complet; altfel diff față de versiunea anterioară (vezi api/versioning.py)
     snapshot = models.TextField()  # JSON stored as text
+    is_keyframe = models.BooleanField(default=True)
+    encoding = models.CharField(max_length=10, default='json')  # json | zlib
+    is_autosave = models.BooleanField(default=False)
+    # Presentation.revision pe care îl reflectă snapshot-ul (vezi api/autosave.py)
+    revision = models.BigIntegerField(default=0)
     notes = models.TextField()
     created_at = models.DateTimeField()
     created_by = models.ForeignKey(User, models.DO_NOTHING, db_column='created_by_id')
@@ -221,6 +382,11 @@ class PresentationVersion(models.Model):
         managed = True
         db_table = 'api_presentationversion'
         ordering = ['-version_number']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['presentation', 'version_number'], name='uniq_presentation_version_number'
+            ),
+        ]
 
     def __str__(self):
         return f"v{self.version_number}"
@@ -360,3 +526,46 @@ class Student(models.Model):
     @property
     def full_name(self):
         return f"{self.first_name} {self.last_name}".strip()
+
+
+# ===== BACKGROUND JOBS =====
+class BackgroundJob(models.Model):
+    """Long-running work (AI generation, bulk operations) executed off the request cycle."""
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    kind = models.CharField(max_length=50)
+    status = models.CharField(max_length=15, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    payload = models.TextField(default='{}')  # JSON stored as text
+    result = models.TextField(blank=True, default='')  # JSON stored as text
+    error = models.TextField(blank=True, default='')
+    progress = models.IntegerField(default=0)  # 0-100
+    progress_message = models.CharField(max_length=255, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    # Atins periodic de procesul care ține job-ul (vezi api/jobs.py); vechi = procesul a murit
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+    created_by = models.ForeignKey(User, models.CASCADE, db_column='created_by_id',
+                                   related_name='background_jobs')
+
+    class Meta:
+        managed = True
+        db_table = 'api_backgroundjob'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.kind} #{self.id} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_SUCCEEDED, self.STATUS_FAILED)
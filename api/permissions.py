@@ -16,3 +16,20 @@ class IsAdminManager(BasePermission):
         if user.is_superuser or user.is_staff:
             return True
         return user.groups.filter(name='ADMIN').exists()
+
+
+class IsTeacherOrAdmin(BasePermission):
+    """
+    Allows access only to staff / superusers / members of the ADMIN or
+    PROFESOR groups. Used for actions that act on a whole class of students.
+    """
+
+    message = 'Only teachers and administrators can perform this action.'
+
+    def has_permission(self, request, view):
+        user = request.user
+        if not user or not user.is_authenticated:
+            return False
+        if user.is_superuser or user.is_staff:
+            return True
+        return user.groups.filter(name__in=['ADMIN', 'PROFESOR']).exists()
@@ -0,0 +1,106 @@
+"""
+HTTP caching for presentation reads.
+
+Presentation.revision changes whenever the presentation or any of its
+frames, elements, connections, comments or access grants change (see
+api/revisions.py). It is close to a microsecond timestamp, which gives
+Last-Modified for free.
+
+Reads answer with an ETag built from (presentation, revision, permission
+level) and a Last-Modified derived from the revision; a matching
+If-None-Match gets 304 Not Modified without running the serializer.
+If-Modified-Since alone is not honoured: HTTP dates have one-second
+resolution, so an edit in the same second as the client's copy would be
+answered with a wrong 304. Serialized payloads are kept in an in-process LRU keyed the same
+way, so concurrent readers of an unchanged deck share one serialization.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from .models import PresentationAccess
+
+
+def presentation_permission(presentation, user):
+    """OWNER, the access grant permission (VIEWER / EDITOR) or None."""
+    if not user or not user.is_authenticated:
+        return None
+    if presentation.owner_id == user.id:
+        return 'OWNER'
+    return (
+        PresentationAccess.objects.filter(presentation=presentation, user=user)
+        .values_list('permission', flat=True).first()
+    )
+
+
+def revision_last_modified(presentation):
+    if presentation.revision > 0:
+        return datetime.fromtimestamp(presentation.revision / 1_000_000, tz=dt_timezone.utc)
+    return presentation.updated_at
+
+
+class _PayloadCache:
+    """LRU of serialized presentations, keyed by (id, revision, permission)."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+            return payload
+
+    def set(self, key, payload):
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+payload_cache = _PayloadCache(settings.PRESENTATION_CACHE_MAX_ENTRIES)
+
+
+def cached_presentation_response(request, presentation, serialize):
+    """
+    Response for a presentation read, honouring conditional headers.
+
+    `serialize()` is only called when neither the client nor the payload
+    cache has the current revision.
+    """
+    permission = presentation_permission(presentation, request.user)
+    key = (presentation.id, presentation.revision, permission)
+    etag = f'W/"{presentation.id}-{presentation.revision}-{(permission or "none").lower()}"'
+    last_modified = revision_last_modified(presentation)
+    last_modified_ts = int(last_modified.timestamp()) if last_modified else None
+
+    # Doar ETag-ul validează (vezi docstring-ul modulului); Last-Modified e informativ
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        payload = payload_cache.get(key)
+        if payload is None:
+            payload = dict(serialize())  # fără referința ReturnDict -> serializer
+            payload_cache.set(key, payload)
+        response = Response(payload)
+
+    response['ETag'] = etag
+    if last_modified_ts is not None:
+        response['Last-Modified'] = http_date(last_modified_ts)
+    # Clientul revalidează mereu; răspunsul depinde de user
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ('Authorization', 'Cookie'))
+    return response
@@ -2,12 +2,16 @@
 Serializers pentru modulul de prezentări
 """
 from rest_framework import serializers
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.db.models import Max
 from .models import (
-    BrandKit, Asset, PresentationTemplate, Presentation, PresentationAccess,
+    BrandKit, Asset, AssetUpload, PresentationTemplate, Presentation, PresentationAccess,
     Frame, FrameConnection, Element, Comment, PresentationVersion, Recording
 )
+from .versioning import reconstruct
+from .asset_blobs import link_asset_blob, sync_brand_kit_logos
+from .asset_derivatives import srcset
 import json
 import secrets
 
@@ -83,23 +87,33 @@ class BrandKitSerializer(serializers.ModelSerializer):
         validated_data['created_by'] = self.context['request'].user
         validated_data['created_at'] = timezone.now()
         validated_data['updated_at'] = timezone.now()
-        return super().create(validated_data)
+        brand_kit = super().create(validated_data)
+        sync_brand_kit_logos(brand_kit)
+        return brand_kit
 
     def update(self, instance, validated_data):
         from django.utils import timezone
+        previous_logos = instance.logos
         validated_data['updated_at'] = timezone.now()
-        return super().update(instance, validated_data)
+        brand_kit = super().update(instance, validated_data)
+        sync_brand_kit_logos(brand_kit, previous_logos)
+        return brand_kit
 
 
 # ===== ASSET =====
 class AssetSerializer(serializers.ModelSerializer):
     uploaded_by = UserMinimalSerializer(read_only=True)
     tags_parsed = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
+    srcset_webp = serializers.SerializerMethodField()
 
     class Meta:
         model = Asset
         fields = '__all__'
-        read_only_fields = ('created_at', 'uploaded_by')
+        read_only_fields = ('created_at', 'uploaded_by', 'content_hash', 'blob')
+        extra_kwargs = {
+            'thumbnail_url': {'required': False, 'allow_blank': True},
+        }
 
     def get_tags_parsed(self, obj):
         try:
@@ -107,11 +121,39 @@ class AssetSerializer(serializers.ModelSerializer):
         except:
             return []
 
+    def get_srcset(self, obj):
+        derivatives = obj.derivatives.all()
+        return srcset(derivatives, 'png') or srcset(derivatives, 'jpeg')
+
+    def get_srcset_webp(self, obj):
+        return srcset(obj.derivatives.all(), 'webp')
+
     def create(self, validated_data):
         from django.utils import timezone
         validated_data['uploaded_by'] = self.context['request'].user
         validated_data['created_at'] = timezone.now()
-        return super().create(validated_data)
+        validated_data.setdefault('thumbnail_url', '')
+        asset = super().create(validated_data)
+        link_asset_blob(asset)
+        return asset
+
+    def update(self, instance, validated_data):
+        asset = super().update(instance, validated_data)
+        link_asset_blob(asset)
+        return asset
+
+
+class AssetUploadSerializer(serializers.ModelSerializer):
+    chunk_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = AssetUpload
+        fields = ('id', 'name', 'asset_type', 'total_size', 'received_bytes', 'status',
+                  'chunk_size', 'asset', 'created_at', 'updated_at')
+        read_only_fields = fields
+
+    def get_chunk_size(self, obj):
+        return settings.ASSET_UPLOAD_CHUNK_SIZE
 
 
 # ===== PRESENTATION TEMPLATE =====
@@ -198,8 +240,8 @@ class FrameConnectionSerializer(serializers.ModelSerializer):
 # ===== FRAME =====
 class FrameSerializer(serializers.ModelSerializer):
     elements = ElementSerializer(many=True, read_only=True)
-    connections_from = FrameConnectionSerializer(many=True, read_only=True)
-    connections_to = FrameConnectionSerializer(many=True, read_only=True)
+    connections_from = FrameConnectionSerializer(source='outgoing_connections', many=True, read_only=True)
+    connections_to = FrameConnectionSerializer(source='incoming_connections', many=True, read_only=True)
     position_parsed = serializers.SerializerMethodField()
     transition_settings_parsed = serializers.SerializerMethodField()
 
@@ -281,6 +323,13 @@ class FrameSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
+class FrameSyncSerializer(FrameSerializer):
+    """Fără elements/conexiuni imbricate - în sync incremental vin separat (vezi api/sync.py)"""
+    elements = None
+    connections_from = None
+    connections_to = None
+
+
 class FrameMinimalSerializer(serializers.ModelSerializer):
     """Fără elements - pentru listări rapide"""
     position_parsed = serializers.SerializerMethodField()
@@ -366,7 +415,7 @@ class PresentationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Presentation
         fields = '__all__'
-        read_only_fields = ('created_at', 'updated_at', 'owner', 'share_token')
+        read_only_fields = ('created_at', 'updated_at', 'owner', 'share_token', 'revision')
         extra_kwargs = {
             'description': {'required': False, 'allow_blank': True},
             'canvas_settings': {'required': False},
@@ -447,8 +496,8 @@ class PresentationMinimalSerializer(serializers.ModelSerializer):
     class Meta:
         model = Presentation
         fields = ('id', 'title', 'description', 'owner', 'group', 'thumbnail_url',
-                  'is_public', 'created_at', 'updated_at', 'current_user_permission')
-        read_only_fields = ('created_at', 'updated_at', 'owner')
+                  'is_public', 'created_at', 'updated_at', 'revision', 'current_user_permission')
+        read_only_fields = ('created_at', 'updated_at', 'owner', 'revision')
 
     def get_current_user_permission(self, obj):
         request = self.context.get('request')
@@ -466,6 +515,12 @@ class PresentationMinimalSerializer(serializers.ModelSerializer):
         return access.permission if access else None
 
 
+class PresentationDuplicateSerializer(serializers.Serializer):
+    """Input pentru duplicate: titlu opțional și un subset opțional de frames"""
+    title = serializers.CharField(required=False, allow_blank=True, allow_null=True, max_length=255)
+    frame_ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_null=True)
+
+
 # ===== PRESENTATION VERSION =====
 class PresentationVersionSerializer(serializers.ModelSerializer):
     created_by = UserMinimalSerializer(read_only=True)
@@ -473,13 +528,14 @@ class PresentationVersionSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = PresentationVersion
-        fields = '__all__'
-        read_only_fields = ('created_at', 'created_by')
+        # snapshot poate fi un diff comprimat; conținutul complet e în snapshot_parsed
+        exclude = ('snapshot',)
+        read_only_fields = ('created_at', 'created_by', 'is_keyframe', 'encoding', 'is_autosave')
 
     def get_snapshot_parsed(self, obj):
         try:
-            return json.loads(obj.snapshot)
-        except:
+            return reconstruct(obj)
+        except Exception:
             return {}
 
     def create(self, validated_data):
@@ -489,6 +545,17 @@ class PresentationVersionSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class PresentationVersionMinimalSerializer(serializers.ModelSerializer):
+    """Fără snapshot - pentru listări"""
+    created_by = UserMinimalSerializer(read_only=True)
+
+    class Meta:
+        model = PresentationVersion
+        fields = ('id', 'version_number', 'notes', 'is_autosave', 'is_keyframe',
+                  'created_by', 'created_at')
+        read_only_fields = fields
+
+
 # ===== RECORDING =====
 class RecordingSerializer(serializers.ModelSerializer):
     created_by = UserMinimalSerializer(read_only=True)
@@ -7,10 +7,10 @@ from .presentation_views import (
     BrandKitViewSet, AssetViewSet, PresentationTemplateViewSet,
     PresentationViewSet, PresentationAccessViewSet,
     FrameViewSet, FrameConnectionViewSet, ElementViewSet,
-    CommentViewSet, RecordingViewSet,
+    CommentViewSet, RecordingViewSet, BackgroundJobViewSet,
     ai_generate_presentation, ai_rewrite_text, ai_suggest_visuals,
-    ai_get_slide_advice, ai_generate_full_presentation,
-    export_presentation_pdf, export_presentation_pptx
+    ai_get_slide_advice, ai_generate_full_presentation, ai_metrics,
+    export_presentation_pdf, export_presentation_pptx, export_presentations_bulk, public_viewer
 )
 
 router = DefaultRouter()
@@ -24,6 +24,7 @@ router.register(r'frame-connections', FrameConnectionViewSet, basename='framecon
 router.register(r'elements', ElementViewSet, basename='element')
 router.register(r'comments', CommentViewSet, basename='comment')
 router.register(r'recordings', RecordingViewSet, basename='recording')
+router.register(r'jobs', BackgroundJobViewSet, basename='job')
 
 urlpatterns = [
     # Router URLs
@@ -35,8 +36,13 @@ urlpatterns = [
     path('ai/rewrite/', ai_rewrite_text, name='ai-rewrite'),
     path('ai/suggest-visuals/', ai_suggest_visuals, name='ai-suggest-visuals'),
     path('ai/slide-advice/', ai_get_slide_advice, name='ai-slide-advice'),
+    path('ai/metrics/', ai_metrics, name='ai-metrics'),
+
+    # Viewer public (share link)
+    path('viewer/<str:token>/', public_viewer, name='public-viewer'),
 
     # Export endpoints
     path('presentations/<int:presentation_id>/export/pdf/', export_presentation_pdf, name='export-pdf'),
     path('presentations/<int:presentation_id>/export/pptx/', export_presentation_pptx, name='export-pptx'),
+    path('presentations/export/bulk/', export_presentations_bulk, name='export-bulk'),
 ]
@@ -2,32 +2,59 @@
 Views și ViewSets pentru modulul de prezentări
 """
 from rest_framework import viewsets, status, permissions
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import action, api_view, authentication_classes, permission_classes
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
+from rest_framework.exceptions import ValidationError
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Q, prefetch_related_objects
 from django.contrib.auth.models import User
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 import json
 import secrets
 
 from .models import (
-    BrandKit, Asset, PresentationTemplate, Presentation, PresentationAccess,
-    Frame, FrameConnection, Element, Comment, PresentationVersion, Recording
+    BrandKit, Asset, AssetUpload, PresentationTemplate, Presentation, PresentationAccess,
+    Frame, FrameConnection, Element, Comment, PresentationVersion, Recording,
+    BackgroundJob, StudentGroup
 )
 from .presentation_serializers import (
-    BrandKitSerializer, AssetSerializer, PresentationTemplateSerializer,
+    BrandKitSerializer, AssetSerializer, AssetUploadSerializer, PresentationTemplateSerializer,
     PresentationSerializer, PresentationMinimalSerializer, PresentationAccessSerializer,
-    FrameSerializer, FrameMinimalSerializer, FrameConnectionSerializer,
-    ElementSerializer, CommentSerializer, PresentationVersionSerializer,
+    PresentationDuplicateSerializer, FrameSerializer, FrameMinimalSerializer, FrameConnectionSerializer,
+    ElementSerializer, CommentSerializer, PresentationVersionSerializer, PresentationVersionMinimalSerializer,
     RecordingSerializer, UserMinimalSerializer
 )
-from .ai_service import PresentationAIService
-from .export_service import PresentationExportService
-from game_module.models import Game, Question as GameQuestion, Choice as GameChoice
-from game_module.serializers import GameSerializer
+from . import ai_tasks
+from .ai_cache import get_ai_response_cache
+from .ai_client import AIRateLimitError, get_ai_client_manager
+from .ai_tasks import collect_slide_texts
+from .jobs import enqueue_job, serialize_job
+from .permissions import IsTeacherOrAdmin
+from .asset_search import search_assets, suggest as suggest_asset_terms
+from .asset_uploads import (
+    UploadError, UploadOffsetMismatch, complete_upload as complete_asset_upload,
+    start_upload as start_asset_upload, write_chunk as write_asset_chunk,
+)
+from .assignments import ASSIGNMENT_MODES, MODE_COPY
+from .cloning import clone_frames, clone_presentation
+from .materializers import MaterializationError, materialize_presentation
+from .export_service import PresentationExportService, iter_pdf_archive
+from .presentation_cache import cached_presentation_response
+from .sync import changes_since as sync_changes_since, empty_changes as empty_sync_changes, revision_time
+from .viewer import viewer_response
+from .thumbnail_service import schedule_thumbnails
+from .versioning import (
+    VersionFormatError, create_version as create_presentation_version, load_snapshot,
+    reconstruct as reconstruct_version, restore_version as restore_presentation_version,
+    structural_diff, summarize_diff,
+)
 
 
 # ===== PERMISIUNI CUSTOM =====
@@ -111,26 +138,123 @@ class AssetViewSet(viewsets.ModelViewSet):
         user = self.request.user
         return Asset.objects.filter(
             Q(group__in=user.groups.all()) | Q(uploaded_by=user)
-        ).distinct()
+        ).distinct().prefetch_related('derivatives')
 
     @action(detail=False, methods=['get'])
     def search(self, request):
-        """Căutare assets după tags sau nume"""
-        query = request.query_params.get('q', '')
-        asset_type = request.query_params.get('type', None)
+        """
+        Căutare assets după nume și tags, cu ranking și paginare.
 
-        qs = self.get_queryset()
-
-        if query:
-            qs = qs.filter(
-                Q(name__icontains=query) | Q(tags__icontains=query)
+        Query: q (ultimul termen e și prefix), type, tag (repetabil), page, page_size.
+        """
+        try:
+            page = max(1, int(request.query_params.get('page', 1)))
+            page_size = min(100, max(1, int(request.query_params.get('page_size', 20))))
+        except ValueError:
+            return Response({'error': 'page and page_size must be integers'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        total, assets = search_assets(
+            self.get_queryset(),
+            query=request.query_params.get('q', ''),
+            tags=request.query_params.getlist('tag'),
+            asset_type=request.query_params.get('type'),
+            limit=page_size,
+            offset=(page - 1) * page_size,
+        )
+        prefetch_related_objects(assets, 'derivatives')
+
+        results = self.get_serializer(assets, many=True).data
+        for item, asset in zip(results, assets):
+            item['score'] = asset.search_score
+        return Response({'count': total, 'page': page, 'page_size': page_size, 'results': results})
+
+    # ----- upload pe bucăți (vezi api/asset_uploads.py) -----
+    def _get_upload(self, request, upload_id, lock=False):
+        uploads = AssetUpload.objects.filter(uploaded_by=request.user)
+        if lock:
+            uploads = uploads.select_for_update()
+        return get_object_or_404(uploads, pk=upload_id)
+
+    @action(detail=False, methods=['post'], url_path='uploads')
+    def start_upload(self, request):
+        """Începe un upload: {name, size, sha256?, asset_type?, tags?, group?}"""
+        name = (request.data.get('name') or '').strip()
+        try:
+            size = int(request.data.get('size'))
+        except (TypeError, ValueError):
+            return Response({'error': 'size is required'}, status=status.HTTP_400_BAD_REQUEST)
+        if not name:
+            return Response({'error': 'name is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        group = None
+        group_id = request.data.get('group')
+        if group_id:
+            group = request.user.groups.filter(pk=group_id).first()
+            if group is None:
+                return Response({'error': 'You are not a member of this group'},
+                                status=status.HTTP_403_FORBIDDEN)
+
+        tags = request.data.get('tags', [])
+        try:
+            upload = start_asset_upload(
+                request.user, name, size,
+                sha256=request.data.get('sha256', ''),
+                asset_type=request.data.get('asset_type', ''),
+                tags=tags if isinstance(tags, str) else json.dumps(tags),
+                group=group,
             )
+        except UploadError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(AssetUploadSerializer(upload).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'], url_path=r'uploads/(?P<upload_id>\d+)')
+    def upload_status(self, request, upload_id=None):
+        """Starea unui upload; received_bytes = offset-ul de la care se reia"""
+        return Response(AssetUploadSerializer(self._get_upload(request, upload_id)).data)
+
+    @action(detail=False, methods=['put'], url_path=r'uploads/(?P<upload_id>\d+)/chunk')
+    def upload_chunk(self, request, upload_id=None):
+        """
+        Trimite o bucată: corpul request-ului (binar), ?offset=<received_bytes>,
+        header opțional X-Chunk-SHA256. Corpul e citit în streaming, nu parsat.
+        """
+        try:
+            offset = int(request.query_params.get('offset', 0))
+            length = int(request.META['CONTENT_LENGTH']) if request.META.get('CONTENT_LENGTH') else None
+        except ValueError:
+            return Response({'error': 'offset must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
 
-        if asset_type:
-            qs = qs.filter(asset_type=asset_type)
+        with transaction.atomic():
+            upload = self._get_upload(request, upload_id, lock=True)
+            try:
+                write_asset_chunk(
+                    upload, request.stream, offset, length=length,
+                    sha256=request.META.get('HTTP_X_CHUNK_SHA256'),
+                )
+            except UploadOffsetMismatch as e:
+                return Response({'error': str(e), 'received_bytes': e.expected},
+                                status=status.HTTP_409_CONFLICT)
+            except UploadError as e:
+                return Response({'error': str(e), 'received_bytes': upload.received_bytes},
+                                status=status.HTTP_400_BAD_REQUEST)
+        return Response(AssetUploadSerializer(upload).data)
+
+    @action(detail=False, methods=['post'], url_path=r'uploads/(?P<upload_id>\d+)/complete')
+    def complete_upload(self, request, upload_id=None):
+        """Verifică fișierul și creează asset-ul (sau îl refolosește pe cel identic)"""
+        with transaction.atomic():
+            upload = self._get_upload(request, upload_id, lock=True)
+            try:
+                asset = complete_asset_upload(upload)
+            except UploadError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self.get_serializer(asset).data, status=status.HTTP_201_CREATED)
 
-        serializer = self.get_serializer(qs, many=True)
-        return Response(serializer.data)
+    @action(detail=False, methods=['get'])
+    def suggest(self, request):
+        """Autocomplete pentru căutare: ?q=prefix"""
+        return Response(suggest_asset_terms(self.get_queryset(), request.query_params.get('q', '')))
 
 
 # ===== PRESENTATION TEMPLATE =====
@@ -155,6 +279,31 @@ class PresentationTemplateViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(qs, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['post'])
+    def instantiate(self, request, pk=None):
+        """Creează o prezentare nouă din structura template-ului"""
+        template = self.get_object()
+        try:
+            structure = json.loads(template.structure or '{}')
+        except ValueError:
+            return Response({'error': 'Template structure is not valid JSON'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if isinstance(structure, list):
+            structure = {'frames': structure}
+
+        title = request.data.get('title') or structure.get('title') or template.name
+        try:
+            presentation = materialize_presentation(
+                request.user, structure, template=template, title=title
+            )
+        except MaterializationError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        schedule_thumbnails(presentation.id)
+
+        serializer = PresentationSerializer(presentation, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
 
 # ===== PRESENTATION =====
 class PresentationViewSet(viewsets.ModelViewSet):
@@ -174,57 +323,122 @@ class PresentationViewSet(viewsets.ModelViewSet):
             Q(group__in=user.groups.all())
         ).distinct()
 
+    def retrieve(self, request, *args, **kwargs):
+        """Prezentarea completă, cu ETag / Last-Modified (304 dacă nu s-a schimbat)"""
+        presentation = self.get_object()
+        return cached_presentation_response(
+            request, presentation,
+            lambda: PresentationSerializer(presentation, context={'request': request}).data,
+        )
+
+    @action(detail=True, methods=['get'])
+    def revision(self, request, pk=None):
+        """Revision-ul curent: clientul verifică ieftin dacă prezentarea s-a schimbat"""
+        presentation = self.get_object()
+        return Response({'id': presentation.id, 'revision': presentation.revision})
+
+    @action(detail=True, methods=['get'])
+    def sync(self, request, pk=None):
+        """
+        Schimbările de la un revision/moment încoace (vezi api/sync.py).
+
+        Query: ?since_revision=N sau ?since=<ISO 8601>.
+        """
+        presentation = self.get_object()
+        since_revision = request.query_params.get('since_revision')
+        since_raw = request.query_params.get('since')
+        if since_revision is not None:
+            try:
+                since_revision = int(since_revision)
+            except ValueError:
+                return Response({'error': 'since_revision must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+            if since_revision >= presentation.revision:
+                return Response(empty_sync_changes(presentation))
+            since = revision_time(since_revision)
+        elif since_raw:
+            since = parse_datetime(since_raw)
+            if since is None:
+                return Response({'error': 'since must be an ISO 8601 timestamp'}, status=status.HTTP_400_BAD_REQUEST)
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+        else:
+            return Response({'error': 'since_revision or since is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(sync_changes_since(presentation, since, context={'request': request}))
+
     @action(detail=True, methods=['post'])
     def duplicate(self, request, pk=None):
-        """Duplică o prezentare"""
+        """
+        Duplică o prezentare (frames, elements, conexiuni, traseu).
+
+        Input opțional: {"title": "...", "frame_ids": [1, 2]} pentru un subset de frames.
+        """
         original = self.get_object()
         self.check_object_permissions(request, original)
 
-        # Creează copie
-        new_presentation = Presentation.objects.create(
-            title=f"{original.title} (Copy)",
-            description=original.description,
-            owner=request.user,
-            group=original.group,
-            brand_kit=original.brand_kit,
-            canvas_settings=original.canvas_settings,
-        )
+        params = PresentationDuplicateSerializer(data=request.data)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        # Copiază frames
-        frame_map = {}  # original_id -> new_frame
-        for frame in original.frames.all():
-            new_frame = Frame.objects.create(
-                presentation=new_presentation,
-                title=frame.title,
-                position=frame.position,
-                background_color=frame.background_color,
-                background_image=frame.background_image,
-                order=frame.order,
-            )
-            frame_map[frame.id] = new_frame
-
-            # Copiază elements
-            for element in frame.elements.all():
-                Element.objects.create(
-                    frame=new_frame,
-                    element_type=element.element_type,
-                    position=element.position,
-                    content=element.content,
-                    link_url=element.link_url,
-                )
+        new_presentation = clone_presentation(
+            original,
+            request.user,
+            title=params.validated_data.get('title') or f"{original.title} (Copy)",
+            frame_ids=params.validated_data.get('frame_ids'),
+        )
 
-        # Actualizează presentation_path
-        try:
-            old_path = json.loads(original.presentation_path)
-            new_path = [frame_map[fid].id for fid in old_path if fid in frame_map]
-            new_presentation.presentation_path = json.dumps(new_path)
-            new_presentation.save()
-        except:
-            pass
+        schedule_thumbnails(new_presentation.id)
 
         serializer = PresentationSerializer(new_presentation, context={'request': request})
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated, IsTeacherOrAdmin], url_path='assign')
+    def assign_to_group(self, request, pk=None):
+        """
+        Distribuie prezentarea tuturor elevilor dintr-un StudentGroup (job în background).
+        Doar profesorii și administratorii, pentru prezentările proprii.
+
+        Input:
+        {
+            "student_group": "clasa-a-9a",  // slug (sau "student_group_id")
+            "mode": "copy" | "access",      // copie proprie / acces la original
+            "permission": "VIEWER" | "EDITOR"  // doar pentru mode=access
+        }
+        """
+        presentation = self.get_object()
+        if presentation.owner != request.user:
+            return Response({'error': 'Only owner can assign a presentation'},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        group_slug = request.data.get('student_group')
+        group_id = request.data.get('student_group_id')
+        if group_slug:
+            group = StudentGroup.objects.filter(slug=group_slug).first()
+        elif group_id:
+            group = StudentGroup.objects.filter(id=group_id).first()
+        else:
+            return Response({'error': 'student_group is required'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if group is None:
+            return Response({'error': 'Student group not found'},
+                            status=status.HTTP_404_NOT_FOUND)
+
+        mode = request.data.get('mode', MODE_COPY)
+        if mode not in ASSIGNMENT_MODES:
+            return Response({'error': f"mode must be one of {', '.join(ASSIGNMENT_MODES)}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        permission = (request.data.get('permission') or 'VIEWER').upper()
+        if permission not in ['VIEWER', 'EDITOR']:
+            permission = 'VIEWER'
+
+        job = enqueue_job('assign_presentation_to_group', {
+            'presentation_id': presentation.id,
+            'student_group_id': group.id,
+            'mode': mode,
+            'permission': permission,
+        }, request.user)
+        return _job_accepted(job)
+
     @action(detail=True, methods=['post'])
     def set_path(self, request, pk=None):
         """Setează traseul de prezentare"""
@@ -235,6 +449,8 @@ class PresentationViewSet(viewsets.ModelViewSet):
         presentation.presentation_path = json.dumps(frame_ids)
         presentation.save()
 
+        schedule_thumbnails(presentation.id)
+
         return Response({'presentation_path': frame_ids})
 
     @action(detail=True, methods=['post'])
@@ -256,9 +472,11 @@ class PresentationViewSet(viewsets.ModelViewSet):
         token = request.query_params.get('token', '')
         presentation = get_object_or_404(Presentation, share_token=token)
 
-        # Read-only prin token
-        serializer = PresentationSerializer(presentation, context={'request': request})
-        return Response(serializer.data)
+        # Read-only prin token; link-urile publice sunt cerute des, deci cu cache
+        return cached_presentation_response(
+            request, presentation,
+            lambda: PresentationSerializer(presentation, context={'request': request}).data,
+        )
 
     @action(detail=True, methods=['get'])
     def export_json(self, request, pk=None):
@@ -275,31 +493,31 @@ class PresentationViewSet(viewsets.ModelViewSet):
             'exported_at': timezone.now().isoformat()
         })
 
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_json(self, request):
+        """Importă o prezentare exportată cu export_json (sau o structură de frames)"""
+        data = request.data.get('presentation', request.data)
+        if not isinstance(data, dict):
+            return Response({'error': 'Expected a presentation object'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            presentation = materialize_presentation(request.user, data)
+        except MaterializationError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        schedule_thumbnails(presentation.id)
+
+        serializer = PresentationSerializer(presentation, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated], url_path='generate-game')
     def generate_game(self, request, pk=None):
         """Generate a Kahoot-style game from the current presentation using AI."""
         presentation = self.get_object()
         self.check_object_permissions(request, presentation)
 
-        # Gather slide text content
-        slide_texts = []
-        for frame in presentation.frames.all():
-            snippets = []
-            for element in frame.elements.all():
-                if element.element_type != 'TEXT':
-                    continue
-                raw_content = element.content or ''
-                text_content = ''
-                try:
-                    parsed = json.loads(raw_content)
-                    text_content = parsed.get('text', '')
-                except (ValueError, TypeError):
-                    text_content = raw_content
-                text_content = (text_content or '').strip()
-                if text_content:
-                    snippets.append(text_content)
-            if snippets:
-                slide_texts.append(" ".join(snippets))
+        slide_texts = collect_slide_texts(presentation)
 
         if not slide_texts:
             return Response(
@@ -313,83 +531,37 @@ class PresentationViewSet(viewsets.ModelViewSet):
         except (TypeError, ValueError):
             num_questions = 6
 
-        ai_service = PresentationAIService()
-        try:
-            quiz_payload = ai_service.generate_quiz_from_slides(slide_texts, num_questions=num_questions)
-        except Exception as exc:
-            return Response(
-                {"error": str(exc)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-
-        title = quiz_payload.get('title') or f"{presentation.title} Quiz"
-        description = quiz_payload.get('description') or presentation.description or ''
-        questions = quiz_payload.get('questions', [])
-
-        if not questions:
-            return Response(
-                {"error": "AI nu a generat nicio întrebare. Încearcă din nou."},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-
         base_points = request.data.get('base_points', 1000)
         try:
             base_points = int(base_points)
         except (TypeError, ValueError):
             base_points = 1000
 
-        with transaction.atomic():
-            game = Game.objects.create(
-                title=title[:255],
-                description=description,
-                host=request.user,
-                base_points=base_points
-            )
+        rate_limited = _ai_rate_limit_response(request)
+        if rate_limited:
+            return rate_limited
 
-            for order, question_payload in enumerate(questions):
-                question_text = (question_payload.get('text') or '').strip()
-                if not question_text:
-                    continue
-                time_limit = question_payload.get('time_limit') or 20
-                try:
-                    time_limit = int(time_limit)
-                except (TypeError, ValueError):
-                    time_limit = 20
-                time_limit = max(10, min(time_limit, 90))
-
-                question = GameQuestion.objects.create(
-                    game=game,
-                    text=question_text,
-                    order=order,
-                    time_limit=time_limit,
-                    type='choice'
-                )
+        if _wants_background_job(request):
+            job = enqueue_job('ai_generate_game', {
+                'presentation_id': presentation.id,
+                'slide_texts': slide_texts,
+                'num_questions': num_questions,
+                'base_points': base_points,
+            }, request.user)
+            return _job_accepted(job)
 
-                choices_payload = question_payload.get('choices') or []
-                if not choices_payload:
-                    # fallback: create generic true/false
-                    choices_payload = [
-                        {"text": "Adevărat", "is_correct": True},
-                        {"text": "Fals", "is_correct": False},
-                    ]
-
-                has_correct = any(bool(choice.get('is_correct')) for choice in choices_payload)
-                if not has_correct and choices_payload:
-                    choices_payload[0]['is_correct'] = True
-
-                for idx, choice_payload in enumerate(choices_payload[:4]):
-                    choice_text = (choice_payload.get('text') or '').strip()
-                    if not choice_text:
-                        continue
-                    GameChoice.objects.create(
-                        question=question,
-                        text=choice_text[:400],
-                        is_correct=bool(choice_payload.get('is_correct')),
-                        order=idx
-                    )
-
-        serializer = GameSerializer(game, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        try:
+            game_data = ai_tasks.generate_game(
+                presentation, request.user, slide_texts,
+                num_questions=num_questions, base_points=base_points,
+            )
+        except Exception as exc:
+            return Response(
+                {"error": str(exc)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        return Response(game_data, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=['post'])
     def create_version(self, request, pk=None):
@@ -399,25 +571,71 @@ class PresentationViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Only owner can create versions'},
                             status=status.HTTP_403_FORBIDDEN)
 
-        # Găsește următorul număr de versiune
-        last_version = presentation.versions.first()
-        next_version = (last_version.version_number + 1) if last_version else 1
-
-        # Creează snapshot
-        serializer = PresentationSerializer(presentation, context={'request': request})
-        snapshot_data = json.dumps(serializer.data)
-
-        version = PresentationVersion.objects.create(
-            presentation=presentation,
-            version_number=next_version,
-            snapshot=snapshot_data,
-            created_by=request.user,
-            notes=request.data.get('notes', '')
+        # Snapshot din loader-ul dedicat, stocat ca keyframe sau diff
+        version = create_presentation_version(
+            presentation, request.user, notes=request.data.get('notes', '')
         )
 
         version_serializer = PresentationVersionSerializer(version)
         return Response(version_serializer.data, status=status.HTTP_201_CREATED)
 
+    @action(detail=True, methods=['get'])
+    def versions(self, request, pk=None):
+        """Lista versiunilor (fără snapshot-uri)"""
+        presentation = self.get_object()
+        versions = presentation.versions.select_related('created_by').order_by('-version_number')
+        return Response(PresentationVersionMinimalSerializer(versions, many=True).data)
+
+    def _version_snapshot(self, presentation, number):
+        """Snapshot-ul unei versiuni sau, pentru 'current'/lipsă, conținutul actual"""
+        if number in (None, '', 'current'):
+            return load_snapshot(presentation)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise ValidationError({'error': f'Invalid version: {number}'})
+        version = get_object_or_404(PresentationVersion, presentation=presentation, version_number=number)
+        return reconstruct_version(version)
+
+    @action(detail=True, methods=['get'], url_path='versions/diff')
+    def version_diff(self, request, pk=None):
+        """
+        Diff structural între două versiuni: ?from=3&to=5 (to lipsă = starea curentă).
+
+        Frames, elements și conexiuni adăugate / șterse / modificate, după id.
+        """
+        presentation = self.get_object()
+        if not request.query_params.get('from'):
+            return Response({'error': 'from is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        old = self._version_snapshot(presentation, request.query_params.get('from'))
+        new = self._version_snapshot(presentation, request.query_params.get('to'))
+        try:
+            diff = structural_diff(old, new)
+        except VersionFormatError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({'summary': summarize_diff(diff), **diff})
+
+    @action(detail=True, methods=['post'], url_path=r'versions/(?P<version_number>\d+)/restore')
+    def restore_version(self, request, pk=None, version_number=None):
+        """Restaurează o versiune (starea curentă e salvată întâi ca versiune nouă)"""
+        presentation = self.get_object()
+        if presentation.owner != request.user:
+            return Response({'error': 'Only owner can restore versions'},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        version = get_object_or_404(
+            PresentationVersion, presentation=presentation, version_number=int(version_number)
+        )
+        try:
+            result = restore_presentation_version(presentation, version, request.user)
+        except VersionFormatError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        schedule_thumbnails(presentation.id)
+        return Response(result)
+
     @action(detail=True, methods=['get', 'post', 'delete'], permission_classes=[IsAuthenticated], url_path='collaborators')
     def collaborators(self, request, pk=None):
         """List/modify collaborators for a presentation"""
@@ -529,30 +747,28 @@ class FrameViewSet(viewsets.ModelViewSet):
             return Frame.objects.filter(presentation_id=presentation_id)
         return Frame.objects.none()
 
+    def perform_create(self, serializer):
+        frame = serializer.save()
+        schedule_thumbnails(frame.presentation_id)
+
+    def perform_update(self, serializer):
+        frame = serializer.save()
+        schedule_thumbnails(frame.presentation_id)
+
+    def perform_destroy(self, instance):
+        presentation_id = instance.presentation_id
+        instance.delete()
+        schedule_thumbnails(presentation_id)
+
     @action(detail=True, methods=['post'])
     def duplicate(self, request, pk=None):
         """Duplică un frame"""
         original = self.get_object()
         self.check_object_permissions(request, original)
 
-        new_frame = Frame.objects.create(
-            presentation=original.presentation,
-            title=f"{original.title} (Copy)",
-            position=original.position,
-            background_color=original.background_color,
-            background_image=original.background_image,
-            order=original.order + 1,
-        )
+        new_frame, = clone_frames([original], original.presentation)
 
-        # Copiază elements
-        for element in original.elements.all():
-            Element.objects.create(
-                frame=new_frame,
-                element_type=element.element_type,
-                position=element.position,
-                content=element.content,
-                link_url=element.link_url,
-            )
+        schedule_thumbnails(new_frame.presentation_id)
 
         serializer = FrameSerializer(new_frame)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -578,6 +794,19 @@ class ElementViewSet(viewsets.ModelViewSet):
 
         return base_qs
 
+    def perform_create(self, serializer):
+        element = serializer.save()
+        schedule_thumbnails(element.frame.presentation_id)
+
+    def perform_update(self, serializer):
+        element = serializer.save()
+        schedule_thumbnails(element.frame.presentation_id)
+
+    def perform_destroy(self, instance):
+        presentation_id = instance.frame.presentation_id
+        instance.delete()
+        schedule_thumbnails(presentation_id)
+
 
 # ===== FRAME CONNECTION =====
 class FrameConnectionViewSet(viewsets.ModelViewSet):
@@ -609,6 +838,8 @@ class CommentViewSet(viewsets.ModelViewSet):
         """Marchează comentariu ca rezolvat"""
         comment = self.get_object()
         comment.is_resolved = True
+        # updated_at nu e auto_now; sync-ul incremental filtrează după el
+        comment.updated_at = timezone.now()
         comment.save()
         serializer = self.get_serializer(comment)
         return Response(serializer.data)
@@ -632,7 +863,56 @@ class RecordingViewSet(viewsets.ModelViewSet):
         return Response({'share_token': recording.share_token})
 
 
+# ===== BACKGROUND JOBS =====
+class BackgroundJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """Polling endpoint for the user's background jobs (AI generation, bulk work)."""
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return BackgroundJob.objects.filter(created_by=self.request.user)
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset())
+        return self.get_paginated_response([serialize_job(job) for job in page])
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response(serialize_job(self.get_object()))
+
+
 # ===== AI ENDPOINTS =====
+def _wants_background_job(request):
+    """
+    AI endpoints run as background jobs (202 + job_id) unless the client
+    sends "async": false (or ?async=0); AI_JOBS_DEFAULT_ASYNC sets the default.
+    """
+    flag = request.data.get('async', request.query_params.get('async'))
+    if flag is None:
+        return settings.AI_JOBS_DEFAULT_ASYNC
+    return str(flag).lower() in ('1', 'true', 'yes')
+
+
+def _ai_rate_limit_response(request):
+    """429 response when the user exceeded the per-user AI rate limit, else None."""
+    try:
+        get_ai_client_manager().check_rate_limit(request.user.id)
+    except AIRateLimitError as exc:
+        return Response(
+            {'error': str(exc)},
+            status=status.HTTP_429_TOO_MANY_REQUESTS,
+            headers={'Retry-After': str(exc.retry_after)}
+        )
+    return None
+
+
+def _job_accepted(job):
+    return Response({
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': f'/api/jobs/{job.id}/',
+        'websocket_url': f'/ws/jobs/{job.id}/',
+    }, status=status.HTTP_202_ACCEPTED)
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def ai_generate_presentation(request):
@@ -722,15 +1002,16 @@ def ai_rewrite_text(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    try:
-        ai_service = PresentationAIService()
-        rewritten = ai_service.enhance_slide_content(text, style=mode)
+    rate_limited = _ai_rate_limit_response(request)
+    if rate_limited:
+        return rate_limited
 
-        return Response({
-            'original': text,
-            'rewritten': rewritten,
-            'mode': mode
-        })
+    if _wants_background_job(request):
+        job = enqueue_job('ai_rewrite', {'text': text, 'mode': mode}, request.user)
+        return _job_accepted(job)
+
+    try:
+        return Response(ai_tasks.rewrite_text(text, mode))
 
     except ValueError as e:
         return Response(
@@ -771,11 +1052,16 @@ def ai_suggest_visuals(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    try:
-        ai_service = PresentationAIService()
-        suggestions = ai_service.suggest_visuals(text)
+    rate_limited = _ai_rate_limit_response(request)
+    if rate_limited:
+        return rate_limited
 
-        return Response({'suggestions': suggestions})
+    if _wants_background_job(request):
+        job = enqueue_job('ai_suggest_visuals', {'text': text}, request.user)
+        return _job_accepted(job)
+
+    try:
+        return Response(ai_tasks.suggest_visuals(text))
 
     except ValueError as e:
         return Response(
@@ -820,11 +1106,19 @@ def ai_get_slide_advice(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    try:
-        ai_service = PresentationAIService()
-        advice = ai_service.give_slide_advice(slide_content, context)
+    rate_limited = _ai_rate_limit_response(request)
+    if rate_limited:
+        return rate_limited
 
-        return Response(advice)
+    if _wants_background_job(request):
+        job = enqueue_job('ai_slide_advice', {
+            'slide_content': slide_content,
+            'context': context,
+        }, request.user)
+        return _job_accepted(job)
+
+    try:
+        return Response(ai_tasks.get_slide_advice(slide_content, context))
 
     except ValueError as e:
         return Response(
@@ -847,7 +1141,10 @@ def ai_generate_full_presentation(request):
     Input:
     {
         "prompt": "Create a presentation about climate change solutions",
-        "num_slides": 7  // optional
+        "num_slides": 7,  // optional
+        "stream": true  // optional: slide-urile sunt create și trimise pe
+                        // ws/presentations/<id>/ pe măsură ce sunt generate;
+                        // rulează mereu ca job, primul eveniment are presentation_id
     }
 
     Output:
@@ -860,6 +1157,7 @@ def ai_generate_full_presentation(request):
     """
     prompt = request.data.get('prompt', '').strip()
     num_slides = request.data.get('num_slides', None)
+    stream = str(request.data.get('stream', '')).lower() in ('1', 'true', 'yes')
 
     if not prompt:
         return Response(
@@ -867,94 +1165,34 @@ def ai_generate_full_presentation(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    try:
-        # Initialize AI service
-        ai_service = PresentationAIService()
-
-        # Generate presentation structure
-        presentation_data = ai_service.generate_presentation_structure(
-            prompt=prompt,
-            num_slides=num_slides
-        )
-
-        # Create presentation in database
-        now = timezone.now()
-        presentation = Presentation.objects.create(
-            owner=request.user,
-            title=presentation_data['title'],
-            description=presentation_data.get('description', ''),
-            canvas_settings=json.dumps({
-                'zoom': 1.0,
-                'viewport': {'x': 0, 'y': 0},
-                'background': '#ffffff'
-            }),
-            presentation_path=json.dumps([]),
-            share_token=secrets.token_urlsafe(32),
-            is_public=0,
-            thumbnail_url='',
-            created_at=now,
-            updated_at=now
-        )
-
-        # Create frames and elements
-        frame_ids = []
-        for frame_data in presentation_data['frames']:
-            # Create frame
-            frame = Frame.objects.create(
-                presentation=presentation,
-                title=frame_data.get('title', f"Slide {frame_data['order'] + 1}"),
-                order=frame_data['order'],
-                background_color=frame_data.get('background_color', '#ffffff'),
-                background_image='',
-                position=json.dumps({
-                    'x': 0,
-                    'y': 0,
-                    'width': 1920,
-                    'height': 1080,
-                    'rotation': 0
-                }),
-                transition_settings=json.dumps({
-                    'type': 'fade',
-                    'duration': 0.8,
-                    'delay': 0,
-                    'direction': 'none'
-                }),
-                thumbnail_url='',
-                created_at=now,
-                updated_at=now
-            )
-
-            frame_ids.append(frame.id)
-
-            # Create elements for this frame
-            for element_data in frame_data.get('elements', []):
-                Element.objects.create(
-                    frame=frame,
-                    element_type=element_data['type'],
-                    position=json.dumps(element_data['position']),
-                    content=json.dumps(element_data['content']),
-                    animation_settings=json.dumps({
-                        'type': 'fade',
-                        'duration': 0.8,
-                        'delay': 0,
-                        'easing': 'easeInOut',
-                        'direction': 'up'
-                    }),
-                    link_url='',
-                    created_at=now,
-                    updated_at=now
-                )
-
-        # Update presentation path with frame IDs
-        presentation.presentation_path = json.dumps(frame_ids)
-        presentation.save()
+    if num_slides in (None, ''):
+        num_slides = None
+    else:
+        try:
+            num_slides = int(num_slides)
+        except (TypeError, ValueError):
+            num_slides = 0
+        if num_slides < 1:
+            return Response({'error': 'num_slides must be a positive integer'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+    rate_limited = _ai_rate_limit_response(request)
+    if rate_limited:
+        return rate_limited
+
+    # Streaming-ul are sens doar ca job: clientul află presentation_id din primul
+    # eveniment de progres și intră în grupul prezentării înainte de slide-uri
+    if stream or _wants_background_job(request):
+        job = enqueue_job('ai_generate_full_presentation', {
+            'prompt': prompt,
+            'num_slides': num_slides,
+            'stream': stream,
+        }, request.user)
+        return _job_accepted(job)
 
-        return Response({
-            'presentation_id': presentation.id,
-            'title': presentation.title,
-            'num_frames': len(frame_ids),
-            'message': 'Presentation generated successfully'
-        }, status=status.HTTP_201_CREATED)
+    try:
+        result = ai_tasks.generate_full_presentation(request.user, prompt, num_slides)
+        return Response(result, status=status.HTTP_201_CREATED)
 
     except ValueError as e:
         return Response(
@@ -968,27 +1206,65 @@ def ai_generate_full_presentation(request):
         )
 
 
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def ai_metrics(request):
+    """Metrici pentru clientul AI comun (în curs, în așteptare, latență) și cache."""
+    return Response({
+        'client': get_ai_client_manager().metrics(),
+        'cache': get_ai_response_cache().stats(),
+    })
+
+
+# ===== PUBLIC VIEWER =====
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def public_viewer(request, token):
+    """Document read-only pentru link-uri de share (fără login, cu ETag), vezi api/viewer.py"""
+    return viewer_response(request, token)
+
+
 # ===== EXPORT PDF/IMAGES =====
+def _user_can_export(presentation, user):
+    """Owner or explicit access grant; used by the single and the bulk PDF export."""
+    if presentation.owner_id == user.id:
+        return True
+    return PresentationAccess.objects.filter(presentation=presentation, user=user).exists()
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def export_presentation_pdf(request, presentation_id):
     """
     Export presentation as PDF.
+
+    Query params:
+        parallel: "1" / "0" to force the parallel or sequential renderer
+                  (default: automatic, based on the number of frames)
+        workers: number of worker processes for the parallel renderer
     """
     presentation = get_object_or_404(Presentation, id=presentation_id)
 
     # Check permissions
-    if presentation.owner != request.user:
-        access = PresentationAccess.objects.filter(
-            presentation=presentation,
-            user=request.user
-        ).first()
-        if not access:
-            return Response({'error': 'No access'}, status=status.HTTP_403_FORBIDDEN)
+    if not _user_can_export(presentation, request.user):
+        return Response({'error': 'No access'}, status=status.HTTP_403_FORBIDDEN)
+
+    parallel = request.query_params.get('parallel')
+    if parallel is not None:
+        parallel = parallel.lower() in ('1', 'true', 'yes')
+
+    workers = request.query_params.get('workers')
+    try:
+        workers = int(workers) if workers else None
+    except (TypeError, ValueError):
+        workers = None
+    if workers is not None:
+        workers = max(1, min(workers, settings.PDF_EXPORT_WORKERS))
 
     try:
         export_service = PresentationExportService(presentation)
-        return export_service.export_to_pdf()
+        return export_service.export_to_pdf(parallel=parallel, workers=workers)
     except Exception as e:
         return Response(
             {'error': f'Failed to export PDF: {str(e)}'},
@@ -1005,13 +1281,8 @@ def export_presentation_pptx(request, presentation_id):
     presentation = get_object_or_404(Presentation, id=presentation_id)
 
     # Check permissions
-    if presentation.owner != request.user:
-        access = PresentationAccess.objects.filter(
-            presentation=presentation,
-            user=request.user
-        ).first()
-        if not access:
-            return Response({'error': 'No access'}, status=status.HTTP_403_FORBIDDEN)
+    if not _user_can_export(presentation, request.user):
+        return Response({'error': 'No access'}, status=status.HTTP_403_FORBIDDEN)
 
     try:
         export_service = PresentationExportService(presentation)
@@ -1021,3 +1292,91 @@ def export_presentation_pptx(request, presentation_id):
             {'error': f'Failed to export PowerPoint: {str(e)}'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+
+
+async def _iterate_in_thread(iterator):
+    """
+    Consume a blocking iterator from async code, one chunk at a time.
+
+    Under ASGI Django buffers synchronous streaming iterators completely before
+    sending them; wrapping keeps the archive streaming while rendering proceeds.
+    """
+    sentinel = object()
+    while True:
+        chunk = await sync_to_async(next, thread_sensitive=True)(iterator, sentinel)
+        if chunk is sentinel:
+            break
+        yield chunk
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def export_presentations_bulk(request):
+    """
+    Export several presentations as PDFs in a single ZIP archive.
+
+    Input:
+    {
+        "presentation_ids": [1, 2, 3],   // or
+        "group_id": 5                    // all presentations of a group
+        "workers": 4                     // optional
+    }
+
+    The archive is streamed while the decks are rendered. manifest.json
+    inside the archive lists the status of every requested presentation.
+    """
+    presentation_ids = request.data.get('presentation_ids') or []
+    group_id = request.data.get('group_id')
+
+    if not isinstance(presentation_ids, list):
+        return Response({'error': 'presentation_ids must be a list'}, status=status.HTTP_400_BAD_REQUEST)
+
+    if group_id:
+        if not request.user.groups.filter(id=group_id).exists():
+            return Response({'error': 'No access to this group'}, status=status.HTTP_403_FORBIDDEN)
+        presentation_ids = list(presentation_ids) + list(
+            Presentation.objects.filter(group_id=group_id).values_list('id', flat=True)
+        )
+
+    try:
+        presentation_ids = list(dict.fromkeys(int(pid) for pid in presentation_ids))
+    except (TypeError, ValueError):
+        return Response({'error': 'Invalid presentation id'}, status=status.HTTP_400_BAD_REQUEST)
+
+    if not presentation_ids:
+        return Response({'error': 'presentation_ids or group_id is required'},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    max_items = settings.BULK_EXPORT_MAX_PRESENTATIONS
+    if len(presentation_ids) > max_items:
+        return Response({'error': f'At most {max_items} presentations per export'},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    workers = request.data.get('workers')
+    try:
+        workers = int(workers) if workers else settings.PDF_EXPORT_WORKERS
+    except (TypeError, ValueError):
+        workers = settings.PDF_EXPORT_WORKERS
+    workers = max(1, min(workers, settings.PDF_EXPORT_WORKERS))
+
+    presentations = Presentation.objects.in_bulk(presentation_ids)
+    user = request.user
+
+    def items():
+        for presentation_id in presentation_ids:
+            presentation = presentations.get(presentation_id)
+            if presentation is None:
+                yield {'id': presentation_id, 'error': 'Not found'}
+            elif not _user_can_export(presentation, user):
+                yield {'id': presentation_id, 'error': 'No access'}
+            else:
+                yield {'id': presentation_id, 'presentation': presentation}
+
+    stream = iter_pdf_archive(items(), workers=workers)
+    if isinstance(request._request, ASGIRequest):
+        stream = _iterate_in_thread(stream)
+
+    filename = f"presentations-{timezone.now():%Y%m%d-%H%M%S}.zip"
+    response = StreamingHttpResponse(stream, content_type='application/zip')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
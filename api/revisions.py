@@ -0,0 +1,82 @@
+"""
+Per-presentation revision number.
+
+Presentation.revision moves forward on every write to the presentation or
+its frames, elements, connections, comments and access grants, so "has this
+deck changed" is a single primary-key read (get_revision). Single-row
+writes are covered by the signal handlers in api/signals.py; bulk paths
+(bulk_create, bulk_update, QuerySet.update) call bump_revision() once, or
+add `revision=next_revision()` to an UPDATE they already issue.
+
+The value is max(revision + 1, now in microseconds): it is computed by the
+database in one atomic UPDATE, never goes backwards across processes, and a
+stale Presentation.save() that writes an older value back is corrected by
+the bump that follows it.
+
+Inside coalesce_revision_bumps() the bumps are collected and issued as one
+UPDATE when the block exits, so deleting N rows costs one write, not N.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+from django.db.models import F, Q, Value
+from django.db.models.functions import Greatest
+
+from .models import Frame, Presentation
+
+_state = threading.local()
+
+
+def next_revision():
+    """Expression for the next revision, for use in Presentation.objects.update()."""
+    return Greatest(F('revision') + 1, Value(time.time_ns() // 1000))
+
+
+def _pending():
+    return getattr(_state, 'pending', None)
+
+
+def bump_revision(presentation_ids):
+    """Move the revision of the given presentations (ids or a values() queryset) forward."""
+    pending = _pending()
+    if pending is not None and not hasattr(presentation_ids, 'query'):
+        pending[0].update(presentation_ids)
+        return 0
+    return Presentation.objects.filter(pk__in=presentation_ids).update(revision=next_revision())
+
+
+def bump_revision_for_frames(frame_ids):
+    """Bump the presentations owning the given frames."""
+    pending = _pending()
+    if pending is not None:
+        pending[1].update(frame_ids)
+        return 0
+    return bump_revision(Frame.objects.filter(pk__in=frame_ids).values('presentation_id'))
+
+
+@contextmanager
+def coalesce_revision_bumps():
+    """Collect the bumps made inside the block and issue them as one UPDATE."""
+    if _pending() is not None:
+        # Imbricat: blocul exterior face bump-ul
+        yield
+        return
+    _state.pending = (set(), set())
+    try:
+        yield
+        presentation_ids, frame_ids = _state.pending
+    finally:
+        _state.pending = None
+
+    condition = Q(pk__in=presentation_ids) if presentation_ids else Q()
+    if frame_ids:
+        condition |= Q(pk__in=Frame.objects.filter(pk__in=frame_ids).values('presentation_id'))
+    if condition:
+        Presentation.objects.filter(condition).update(revision=next_revision())
+
+
+def get_revision(presentation_id):
+    """Current revision of a presentation (None if it does not exist)."""
+    return Presentation.objects.filter(pk=presentation_id).values_list('revision', flat=True).first()
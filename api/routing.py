@@ -6,4 +6,5 @@ from . import consumers
 
 websocket_urlpatterns = [
     re_path(r'ws/presentations/(?P<presentation_id>\w+)/$', consumers.PresentationConsumer.as_asgi()),
+    re_path(r'ws/jobs/(?P<job_id>\d+)/$', consumers.JobConsumer.as_asgi()),
 ]
@@ -0,0 +1,102 @@
+"""
+Model signal handlers, connected in ApiConfig.ready().
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .asset_blobs import logo_blob_ids, release
+from .asset_derivatives import schedule_asset_derivatives
+from .asset_search import index_assets
+from .models import (
+    Asset, BrandKit, Comment, Element, Frame, FrameConnection, Presentation, PresentationAccess,
+)
+from .revisions import bump_revision, bump_revision_for_frames
+from .tombstones import frame_presentation_id, record_deletion
+
+
+@receiver(post_save, sender=Asset)
+def reindex_asset(sender, instance, raw=False, **kwargs):
+    # Fixtures (raw) se indexează cu rebuild_asset_index
+    if not raw:
+        index_assets([instance])
+
+
+@receiver(post_save, sender=Asset)
+def generate_asset_derivatives(sender, instance, raw=False, **kwargs):
+    # Derivatele existente sunt refolosite dacă fișierul nu s-a schimbat
+    if not raw and instance.asset_type == 'image':
+        schedule_asset_derivatives(instance.id)
+
+
+@receiver(post_delete, sender=Asset)
+def release_asset_blob(sender, instance, **kwargs):
+    release([instance.blob_id])
+
+
+@receiver(post_delete, sender=BrandKit)
+def release_logo_blobs(sender, instance, **kwargs):
+    release(logo_blob_ids(instance.logos))
+
+
+# ----- Presentation.revision (vezi api/revisions.py) -----
+
+@receiver(post_save, sender=Presentation)
+def bump_presentation_revision(sender, instance, created=False, raw=False, **kwargs):
+    # O prezentare nouă pornește de la revision 0 (Last-Modified = updated_at)
+    if not raw and not created:
+        bump_revision([instance.id])
+
+
+@receiver(post_save, sender=BrandKit)
+def bump_revision_of_brand_kit_users(sender, instance, created=False, raw=False, **kwargs):
+    # brand_kit_data face parte din payload-ul prezentărilor care folosesc kit-ul
+    if not raw and not created:
+        bump_revision(Presentation.objects.filter(brand_kit=instance).values('id'))
+
+
+@receiver(post_save, sender=Frame)
+@receiver(post_delete, sender=Frame)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=PresentationAccess)
+@receiver(post_delete, sender=PresentationAccess)
+def bump_revision_of_parent(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_revision([instance.presentation_id])
+
+
+@receiver(post_save, sender=Element)
+@receiver(post_delete, sender=Element)
+def bump_revision_of_element(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_revision_for_frames([instance.frame_id])
+
+
+@receiver(post_save, sender=FrameConnection)
+@receiver(post_delete, sender=FrameConnection)
+def bump_revision_of_connection(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_revision_for_frames([instance.from_frame_id])
+
+
+# ----- Tombstones pentru sync incremental (vezi api/sync.py) -----
+
+@receiver(post_delete, sender=Frame)
+def record_frame_deletion(sender, instance, **kwargs):
+    record_deletion(instance.presentation_id, 'frame', instance.id)
+
+
+@receiver(post_delete, sender=Comment)
+def record_comment_deletion(sender, instance, **kwargs):
+    record_deletion(instance.presentation_id, 'comment', instance.id)
+
+
+@receiver(post_delete, sender=Element)
+def record_element_deletion(sender, instance, **kwargs):
+    record_deletion(frame_presentation_id(instance, 'frame'), 'element', instance.id)
+
+
+@receiver(post_delete, sender=FrameConnection)
+def record_connection_deletion(sender, instance, **kwargs):
+    record_deletion(frame_presentation_id(instance, 'from_frame'), 'connection', instance.id)
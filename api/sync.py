@@ -0,0 +1,122 @@
+"""
+Incremental sync for the editor: "what changed since revision N".
+
+    GET /api/presentations/<id>/sync/?since_revision=<N>
+    GET /api/presentations/<id>/sync/?since=<ISO 8601 timestamp>
+
+Instead of refetching the whole presentation after a reconnect, the client
+sends the revision it last saw and receives only the frames, elements,
+connections and comments whose updated_at is later, plus the ids deleted
+since then (DeletedRecord tombstones, written by the post_delete handlers in
+api/signals.py through api/tombstones.py). Every section is one indexed range query on
+(parent, updated_at).
+
+A revision is a timestamp in microseconds (api/revisions.py), so it maps
+directly to a cut-off. SYNC_OVERLAP seconds are subtracted from it to cover
+rows whose updated_at was taken just before a slower transaction committed;
+a row can therefore be sent twice, and the client applies the delta as
+upserts. When the cut-off is older than SYNC_TOMBSTONE_RETENTION (tombstones
+may have been pruned) or the client has no revision yet, the response says
+`"full": true` and the client loads the presentation normally.
+
+Derived fields that are written without touching updated_at (frame
+thumbnails) are not part of the delta.
+"""
+
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Comment, DeletedRecord, Element, Frame, FrameConnection
+from .presentation_serializers import (
+    CommentSerializer, ElementSerializer, FrameConnectionSerializer, FrameSyncSerializer,
+)
+
+SECTIONS = ('frames', 'elements', 'connections', 'comments')
+# DeletedRecord.kind -> secțiunea din răspuns
+KIND_SECTIONS = {'frame': 'frames', 'element': 'elements', 'connection': 'connections', 'comment': 'comments'}
+
+
+def revision_time(revision):
+    """The moment a revision was issued (None for revision 0: nothing seen yet)."""
+    if revision <= 0:
+        return None
+    return datetime.fromtimestamp(revision / 1_000_000, tz=dt_timezone.utc)
+
+
+def _parse(raw, default):
+    try:
+        return json.loads(raw) if raw else default
+    except (TypeError, ValueError):
+        return default
+
+
+def _presentation_fields(presentation):
+    # Câmpuri mici: se trimit mereu (traseul e scris și prin update(), fără updated_at)
+    return {
+        'id': presentation.id,
+        'title': presentation.title,
+        'description': presentation.description,
+        'is_public': presentation.is_public,
+        'canvas_settings': _parse(presentation.canvas_settings, {}),
+        'presentation_path': _parse(presentation.presentation_path, []),
+        'updated_at': presentation.updated_at,
+    }
+
+
+def changes_since(presentation, since, context=None):
+    """
+    Delta of a presentation since a moment (an aware datetime, or None).
+
+    Returns {'revision', 'full', ...}; with full=False the delta sections
+    are included, with full=True the client must reload the presentation.
+    """
+    now = timezone.now()
+    result = {'revision': presentation.revision, 'full': False}
+    if since is None or since < now - timedelta(seconds=settings.SYNC_TOMBSTONE_RETENTION):
+        result['full'] = True
+        return result
+
+    result['presentation'] = _presentation_fields(presentation)
+    cutoff = since - timedelta(seconds=settings.SYNC_OVERLAP)
+    frames = Frame.objects.filter(presentation=presentation, updated_at__gt=cutoff).order_by('order', 'id')
+    elements = Element.objects.filter(frame__presentation=presentation, updated_at__gt=cutoff).order_by('id')
+    connections = FrameConnection.objects.filter(
+        from_frame__presentation=presentation, updated_at__gt=cutoff
+    ).order_by('id')
+    comments = Comment.objects.filter(
+        presentation=presentation, updated_at__gt=cutoff
+    ).select_related('author').order_by('id')
+
+    result['frames'] = FrameSyncSerializer(frames, many=True, context=context).data
+    result['elements'] = ElementSerializer(elements, many=True, context=context).data
+    result['connections'] = FrameConnectionSerializer(connections, many=True, context=context).data
+    result['comments'] = CommentSerializer(comments, many=True, context=context).data
+
+    deleted = {section: [] for section in SECTIONS}
+    for kind, object_id in (
+        DeletedRecord.objects.filter(presentation=presentation, deleted_at__gt=cutoff)
+        .order_by('id').values_list('kind', 'object_id')
+    ):
+        deleted[KIND_SECTIONS[kind]].append(object_id)
+    result['deleted'] = deleted
+    return result
+
+
+def empty_changes(presentation):
+    """Delta for a client that is already at the current revision (no queries)."""
+    result = {'revision': presentation.revision, 'full': False,
+              'presentation': _presentation_fields(presentation)}
+    result.update({section: [] for section in SECTIONS})
+    result['deleted'] = {section: [] for section in SECTIONS}
+    return result
+
+
+def prune_deleted_records(older_than=None):
+    """Delete tombstones past SYNC_TOMBSTONE_RETENTION; returns how many were removed."""
+    if older_than is None:
+        older_than = timezone.now() - timedelta(seconds=settings.SYNC_TOMBSTONE_RETENTION)
+    deleted, _ = DeletedRecord.objects.filter(deleted_at__lt=older_than).delete()
+    return deleted
@@ -0,0 +1,111 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+
+from api.ai_cache import AIResponseCache, make_cache_key
+from api.ai_service import PresentationAIService
+
+
+class StubMessages:
+    """Local stand-in for client.messages that counts upstream calls."""
+
+    def __init__(self, text='Rewritten text', gate=None):
+        self.text = text
+        self.gate = gate
+        self.calls = []
+
+    def create(self, **params):
+        self.calls.append(params)
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        return SimpleNamespace(content=[SimpleNamespace(text=self.text)])
+
+
+class StubClient:
+    def __init__(self, **kwargs):
+        self.messages = StubMessages(**kwargs)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class AIResponseCacheTests(SimpleTestCase):
+    def test_identical_requests_hit_the_cache(self):
+        client = StubClient()
+        service = PresentationAIService(client=client, cache=AIResponseCache())
+
+        first = service.enhance_slide_content('Plantele   fac fotosinteză', style='casual')
+        second = service.enhance_slide_content('Plantele fac fotosinteză ', style='casual')
+        service.enhance_slide_content('Plantele fac fotosinteză', style='professional')
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(client.messages.calls), 2)
+
+    def test_entries_expire_after_ttl(self):
+        clock = FakeClock()
+        client = StubClient(text='[{"type": "icon", "keyword": "leaf"}]')
+        service = PresentationAIService(client=client, cache=AIResponseCache(ttl=60, clock=clock))
+
+        service.suggest_visuals('Frunze')
+        clock.now = 59
+        service.suggest_visuals('Frunze')
+        clock.now = 61
+        suggestions = service.suggest_visuals('Frunze')
+
+        self.assertEqual(suggestions, [{'type': 'icon', 'keyword': 'leaf'}])
+        self.assertEqual(len(client.messages.calls), 2)
+
+    def test_size_cap_evicts_least_recently_used(self):
+        cache = AIResponseCache(max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_concurrent_identical_requests_share_one_upstream_call(self):
+        gate = threading.Event()
+        client = StubClient(text='{"overall_score": 8}', gate=gate)
+        cache = AIResponseCache()
+        service = PresentationAIService(client=client, cache=cache)
+        results = []
+
+        threads = [
+            threading.Thread(target=lambda: results.append(service.give_slide_advice('Slide 1')))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while cache.stats()['coalesced'] < 4 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        gate.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(client.messages.calls), 1)
+        self.assertEqual(results, [{'overall_score': 8}] * 5)
+
+    def test_failures_are_not_cached(self):
+        cache = AIResponseCache()
+        key = make_cache_key('method', 'input', 'model')
+        calls = []
+
+        def failing():
+            calls.append(1)
+            raise RuntimeError('upstream down')
+
+        with self.assertRaises(RuntimeError):
+            cache.get_or_call(key, failing)
+        self.assertEqual(cache.get_or_call(key, lambda: 'ok'), 'ok')
+        self.assertEqual(len(calls), 1)
@@ -0,0 +1,133 @@
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from api.ai_client import AIClientManager, AIRateLimitError
+from api.ai_service import PresentationAIService
+from api.tests.test_ai_cache import FakeClock
+
+
+class FlakyMessages:
+    """Fails the first `failures` calls with a transient error."""
+
+    def __init__(self, failures=0, gate=None):
+        self.failures = failures
+        self.gate = gate
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def create(self, **params):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            failing = self.calls <= self.failures
+        try:
+            if self.gate is not None:
+                self.gate.wait(timeout=5)
+            if failing:
+                raise ConnectionError('connection reset')
+            return SimpleNamespace(content=[SimpleNamespace(text='ok')])
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def make_manager(messages, **kwargs):
+    kwargs.setdefault('retry_on', (ConnectionError,))
+    kwargs.setdefault('sleep', lambda seconds: None)
+    return AIClientManager(client_factory=lambda: SimpleNamespace(messages=messages), **kwargs)
+
+
+class AIClientManagerTests(SimpleTestCase):
+    def test_client_is_created_once(self):
+        created = []
+        manager = AIClientManager(client_factory=lambda: created.append(1) or SimpleNamespace())
+
+        manager.client
+        manager.client
+
+        self.assertEqual(len(created), 1)
+
+    def test_transient_errors_are_retried_with_backoff(self):
+        delays = []
+        messages = FlakyMessages(failures=2)
+        manager = make_manager(messages, max_retries=3, backoff_base=1, sleep=delays.append)
+        service = PresentationAIService(client=manager.managed_client(), cache=None)
+
+        self.assertEqual(service.enhance_slide_content('Text'), 'ok')
+        self.assertEqual(messages.calls, 3)
+        self.assertEqual(len(delays), 2)
+        self.assertTrue(0 <= delays[0] <= 1 and 0 <= delays[1] <= 2)
+        self.assertEqual(manager.metrics()['retries'], 2)
+
+    def test_gives_up_after_max_retries(self):
+        messages = FlakyMessages(failures=10)
+        manager = make_manager(messages, max_retries=2)
+
+        with self.assertRaises(ConnectionError):
+            manager.managed_client().messages.create(model='m')
+
+        self.assertEqual(messages.calls, 3)
+        self.assertEqual(manager.metrics()['failures'], 1)
+
+    def test_concurrency_is_bounded(self):
+        gate = threading.Event()
+        messages = FlakyMessages(gate=gate)
+        manager = make_manager(messages, max_concurrency=2)
+        client = manager.managed_client()
+
+        threads = [
+            threading.Thread(target=client.messages.create, kwargs={'model': 'm'})
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        while manager.metrics()['queued'] < 3:
+            threading.Event().wait(0.01)
+        self.assertEqual(manager.metrics()['in_flight'], 2)
+        gate.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        self.assertEqual(messages.max_active, 2)
+        metrics = manager.metrics()
+        self.assertEqual(metrics['requests'], 5)
+        self.assertEqual(metrics['latency_seconds']['samples'], 5)
+
+    def test_rate_limit_per_user(self):
+        clock = FakeClock()
+        manager = make_manager(FlakyMessages(), rate_limit=2, rate_window=60, clock=clock)
+
+        manager.check_rate_limit(1)
+        manager.check_rate_limit(1)
+        manager.check_rate_limit(2)
+        with self.assertRaises(AIRateLimitError) as ctx:
+            manager.check_rate_limit(1)
+        self.assertEqual(ctx.exception.retry_after, 60)
+
+        clock.now = 61
+        manager.check_rate_limit(1)
+
+
+class AIRateLimitEndpointTests(TestCase):
+    def test_endpoint_returns_429_over_the_limit(self):
+        user = User.objects.create_user(username='teacher', password='pass')
+        client = APIClient()
+        client.force_authenticate(user)
+        manager = make_manager(FlakyMessages(), rate_limit=1)
+
+        patch = mock.patch('api.presentation_views.get_ai_client_manager', return_value=manager)
+        with patch, self.settings(JOBS_RUN_INLINE=True, ANTHROPIC_API_KEY=''):
+            first = client.post('/api/ai/rewrite/', {'text': 'A', 'async': True}, format='json')
+            second = client.post('/api/ai/rewrite/', {'text': 'A', 'async': True}, format='json')
+
+        self.assertEqual(first.status_code, 202)
+        self.assertEqual(second.status_code, 429)
+        self.assertEqual(second['Retry-After'], '60')
@@ -0,0 +1,213 @@
+import json
+from contextlib import contextmanager
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.ai_service import PresentationAIService
+from api.jobs import fail_interrupted_jobs
+from api.models import BackgroundJob, Frame, Presentation
+from api.routing import websocket_urlpatterns
+from api.tests.test_ai_cache import StubClient
+
+DECK = {
+    'title': 'Fotosinteza',
+    'description': 'Cum produc plantele energie',
+    'frames': [
+        {
+            'title': f'Slide {order + 1}',
+            'order': order,
+            'background_color': '#ffffff',
+            'elements': [{
+                'type': 'TEXT',
+                'content': {'text': f'Idea {order + 1}', 'fontSize': 32},
+                'position': {'x': 100, 'y': 100, 'width': 800, 'height': 100},
+            }],
+        }
+        for order in range(3)
+    ],
+}
+
+
+class StreamingStubMessages:
+    """Streams a canned response in small chunks, recording the frames stored so far."""
+
+    def __init__(self, text, chunk_size=40):
+        self.text = text
+        self.chunk_size = chunk_size
+        self.frames_seen = []
+
+    @contextmanager
+    def stream(self, **params):
+        def text_stream():
+            for start in range(0, len(self.text), self.chunk_size):
+                self.frames_seen.append(Frame.objects.count())
+                yield self.text[start:start + self.chunk_size]
+
+        yield SimpleNamespace(text_stream=text_stream())
+
+
+class AIJobTests(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='teacher', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_full_generation_runs_as_job(self):
+        ai_client = StubClient(text=json.dumps(DECK))
+        service = mock.patch(
+            'api.ai_tasks.PresentationAIService',
+            lambda: PresentationAIService(client=ai_client, cache=None),
+        )
+        with service, self.settings(JOBS_RUN_INLINE=True, THUMBNAILS_ENABLED=False):
+            response = self.client.post('/api/ai/generate-full/', {
+                'prompt': 'Fotosinteza pentru clasa a 6-a',
+                'num_slides': 3,
+                'async': True,
+            }, format='json')
+
+            self.assertEqual(response.status_code, 202)
+            job_id = response.data['job_id']
+
+            status_response = self.client.get(f'/api/jobs/{job_id}/')
+
+        self.assertEqual(status_response.status_code, 200)
+        self.assertEqual(status_response.data['status'], BackgroundJob.STATUS_SUCCEEDED)
+        self.assertEqual(status_response.data['progress'], 100)
+        presentation_id = status_response.data['result']['presentation_id']
+        self.assertEqual(Presentation.objects.get(pk=presentation_id).title, 'Fotosinteza')
+        self.assertEqual(Frame.objects.filter(presentation_id=presentation_id).count(), 3)
+        self.assertEqual(len(ai_client.messages.calls), 1)
+
+    def test_streaming_generation_creates_frames_incrementally(self):
+        messages = StreamingStubMessages('```json\n' + json.dumps(DECK) + '\n```')
+        service = mock.patch(
+            'api.ai_tasks.PresentationAIService',
+            lambda: PresentationAIService(client=SimpleNamespace(messages=messages), cache=None),
+        )
+        events = []
+        notify = mock.patch('api.jobs.notify_job', lambda job, event=None: events.append(event))
+        with service, notify, self.settings(JOBS_RUN_INLINE=True, THUMBNAILS_ENABLED=False):
+            # "stream" cere mereu calea de job, chiar și cu "async": false
+            response = self.client.post('/api/ai/generate-full/', {
+                'prompt': 'Fotosinteza',
+                'async': False,
+                'stream': True,
+            }, format='json')
+            self.assertEqual(response.status_code, 202)
+            job = BackgroundJob.objects.get(pk=response.data['job_id'])
+
+        self.assertEqual(job.status, BackgroundJob.STATUS_SUCCEEDED)
+        presentation = Presentation.objects.get(pk=json.loads(job.result)['presentation_id'])
+        frame_ids = list(presentation.frames.order_by('order').values_list('id', flat=True))
+        self.assertEqual(json.loads(presentation.presentation_path), frame_ids)
+        self.assertEqual(presentation.title, 'Fotosinteza')
+        self.assertEqual(presentation.description, DECK['description'])
+        # Primele slide-uri există înainte ca răspunsul să se termine
+        self.assertEqual(messages.frames_seen[-1], 2)
+        # Clientul află prezentarea din primul eveniment, înainte de primul slide
+        first_event = next(event for event in events if event)
+        self.assertEqual(first_event, {'presentation_id': presentation.id})
+
+    def test_streaming_generation_skips_malformed_frames(self):
+        deck = dict(DECK, frames=[DECK['frames'][0], dict(DECK['frames'][1], elements='oops'), DECK['frames'][2]])
+        messages = StreamingStubMessages(json.dumps(deck))
+        service = mock.patch(
+            'api.ai_tasks.PresentationAIService',
+            lambda: PresentationAIService(client=SimpleNamespace(messages=messages), cache=None),
+        )
+        with service, self.settings(JOBS_RUN_INLINE=True, THUMBNAILS_ENABLED=False):
+            with self.assertLogs('api.ai_tasks', 'WARNING'):
+                response = self.client.post('/api/ai/generate-full/', {
+                    'prompt': 'Fotosinteza',
+                    'stream': True,
+                }, format='json')
+            job = BackgroundJob.objects.get(pk=response.data['job_id'])
+
+        self.assertEqual(job.status, BackgroundJob.STATUS_SUCCEEDED)
+        presentation = Presentation.objects.get(pk=json.loads(job.result)['presentation_id'])
+        titles = list(presentation.frames.order_by('order').values_list('title', flat=True))
+        self.assertEqual(titles, ['Slide 1', 'Slide 3'])
+
+    def test_invalid_num_slides_is_rejected(self):
+        response = self.client.post('/api/ai/generate-full/', {
+            'prompt': 'Fotosinteza',
+            'num_slides': 'many',
+            'stream': True,
+        }, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(BackgroundJob.objects.exists())
+        self.assertFalse(Presentation.objects.exists())
+
+    def test_failed_job_reports_error(self):
+        # Fără "async": endpoint-urile AI rulează implicit ca job
+        with self.settings(JOBS_RUN_INLINE=True, ANTHROPIC_API_KEY=''):
+            response = self.client.post('/api/ai/rewrite/', {
+                'text': 'Plantele fac fotosinteza',
+            }, format='json')
+            self.assertEqual(response.status_code, 202)
+            job = BackgroundJob.objects.get(pk=response.data['job_id'])
+
+        self.assertEqual(job.status, BackgroundJob.STATUS_FAILED)
+        self.assertIn('ANTHROPIC_API_KEY', job.error)
+
+    def test_interrupted_jobs_fail_on_startup(self):
+        stale = timezone.now() - timedelta(seconds=settings.JOB_STALE_AFTER + 60)
+        queued = BackgroundJob.objects.create(kind='ai_rewrite', payload='{}', created_by=self.user,
+                                              heartbeat_at=stale)
+        running = BackgroundJob.objects.create(kind='ai_rewrite', payload='{}', created_by=self.user,
+                                               status=BackgroundJob.STATUS_RUNNING, heartbeat_at=stale)
+        # Job ținut de alt worker încă în viață
+        live = BackgroundJob.objects.create(kind='ai_rewrite', payload='{}', created_by=self.user,
+                                            status=BackgroundJob.STATUS_RUNNING, heartbeat_at=timezone.now())
+        done = BackgroundJob.objects.create(kind='ai_rewrite', payload='{}', created_by=self.user,
+                                            status=BackgroundJob.STATUS_SUCCEEDED, heartbeat_at=stale)
+
+        with self.assertLogs('api.jobs', 'WARNING'):
+            self.assertEqual(fail_interrupted_jobs(), 2)
+
+        for job in (queued, running):
+            job.refresh_from_db()
+            self.assertEqual(job.status, BackgroundJob.STATUS_FAILED)
+            self.assertEqual(job.error, 'Interrupted by a server restart')
+            self.assertIsNotNone(job.finished_at)
+        live.refresh_from_db()
+        self.assertEqual(live.status, BackgroundJob.STATUS_RUNNING)
+        done.refresh_from_db()
+        self.assertEqual(done.status, BackgroundJob.STATUS_SUCCEEDED)
+
+    def test_jobs_are_private(self):
+        other = User.objects.create_user(username='other', password='pass')
+        job = BackgroundJob.objects.create(kind='ai_rewrite', payload='{}', created_by=other)
+
+        response = self.client.get(f'/api/jobs/{job.id}/')
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_websocket_sends_job_state(self):
+        job = BackgroundJob.objects.create(kind='ai_rewrite', payload='{}', created_by=self.user)
+        application = URLRouter(websocket_urlpatterns)
+
+        async def receive_state():
+            communicator = WebsocketCommunicator(application, f'/ws/jobs/{job.id}/')
+            communicator.scope['user'] = self.user
+            connected, _ = await communicator.connect()
+            message = await communicator.receive_json_from() if connected else None
+            await communicator.disconnect()
+            return connected, message
+
+        connected, message = async_to_sync(receive_state)()
+
+        self.assertTrue(connected)
+        self.assertEqual(message['job']['id'], job.id)
+        self.assertEqual(message['job']['status'], BackgroundJob.STATUS_QUEUED)
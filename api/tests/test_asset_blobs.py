@@ -0,0 +1,126 @@
+import hashlib
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth.models import Group, User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.asset_blobs import collect_garbage, merge_duplicate_assets, recount_references, scan_assets
+from api.models import Asset, AssetBlob, BrandKit, Element, Frame
+from api.revisions import get_revision
+
+from .utils import create_presentation
+
+
+class AssetBlobTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.user = User.objects.create_user(username='teacher', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def upload(self, data, client=None, **extra):
+        client = client or self.client
+        upload_id = client.post('/api/assets/uploads/', {
+            'name': 'logo.txt', 'size': len(data), 'sha256': hashlib.sha256(data).hexdigest(), **extra,
+        }, format='json').data['id']
+        client.put(f'/api/assets/uploads/{upload_id}/chunk/?offset=0', data,
+                   content_type='application/octet-stream')
+        return Asset.objects.get(pk=client.post(f'/api/assets/uploads/{upload_id}/complete/').data['id'])
+
+    def legacy_asset(self, name, data, tags=()):
+        path = Path(self.media_root, 'legacy', name)
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(data)
+        return Asset.objects.create(
+            name=name, asset_type='file', file_url=f'/media/legacy/{name}', thumbnail_url='',
+            tags=json.dumps(list(tags)), file_size=len(data), created_at=timezone.now(), uploaded_by=self.user,
+        )
+
+    def test_references_and_garbage_collection(self):
+        group = Group.objects.create(name='school')
+        self.user.groups.add(group)
+        first = self.upload(b'logo bytes')
+        second = self.upload(b'logo bytes', group=group.id)
+
+        blob = AssetBlob.objects.get()
+        self.assertEqual((blob.ref_count, first.blob_id, second.blob_id), (2, blob.id, blob.id))
+
+        first.delete()
+        self.assertEqual(collect_garbage(grace=0), 0)
+        second.delete()
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 0)
+        self.assertIsNotNone(blob.unreferenced_at)
+        self.assertEqual(collect_garbage(), 0)  # încă în perioada de grație
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(collect_garbage(grace=0), 1)
+        self.assertFalse(AssetBlob.objects.exists())
+        self.assertFalse(Path(self.media_root, blob.file_path).exists())
+
+    def test_scan_merges_duplicate_files(self):
+        original = self.legacy_asset('a.png', b'same', tags=['logo'])
+        copy = self.legacy_asset('b.png', b'same', tags=['school'])
+        self.legacy_asset('c.png', b'other')
+        presentation = create_presentation(self.user)
+        element = Element.objects.get(frame__presentation=presentation)
+        Element.objects.filter(pk=element.pk).update(content=json.dumps({'url': '/media/legacy/b.png'}))
+        frame = element.frame
+        Frame.objects.filter(pk=frame.pk).update(background_image='/media/legacy/b.png')
+        revision = get_revision(presentation.id)
+
+        self.assertEqual(scan_assets(dry_run=True), {'scanned': 3, 'duplicates': 1, 'reclaimed_bytes': 4})
+        self.assertFalse(AssetBlob.objects.exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            scan_assets()
+
+        copy.refresh_from_db()
+        self.assertEqual(copy.file_url, '/media/legacy/a.png')
+        self.assertEqual(AssetBlob.objects.get(pk=copy.blob_id).ref_count, 2)
+        self.assertEqual(json.loads(Element.objects.get(pk=element.pk).content)['url'], '/media/legacy/a.png')
+        # Cache-urile și sync-ul văd link-urile rescrise
+        frame.refresh_from_db()
+        self.assertEqual(frame.background_image, '/media/legacy/a.png')
+        self.assertGreater(frame.updated_at, element.updated_at)
+        self.assertGreater(Element.objects.get(pk=element.pk).updated_at, element.updated_at)
+        self.assertGreater(get_revision(presentation.id), revision)
+        self.assertFalse(Path(self.media_root, 'legacy', 'b.png').exists())
+
+        self.assertEqual(merge_duplicate_assets(), 1)
+        self.assertFalse(Asset.objects.filter(pk=copy.pk).exists())
+        original.refresh_from_db()
+        self.assertEqual(json.loads(original.tags), ['logo', 'school'])
+        self.assertEqual(AssetBlob.objects.get(pk=original.blob_id).ref_count, 1)
+
+    def test_brand_kit_logos_are_deduplicated_and_counted(self):
+        asset = self.upload(b'school logo')
+        response = self.client.post('/api/brand-kits/', {
+            'name': 'School', 'colors': '[]', 'fonts': '[]', 'is_default': 0,
+            'logos': json.dumps([asset.file_url, {'url': asset.file_url}, 'https://cdn.example.com/x.png']),
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        blob = AssetBlob.objects.get()
+        self.assertEqual(response.data['logos_parsed'], [asset.file_url, 'https://cdn.example.com/x.png'])
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 2)
+
+        self.client.patch(f"/api/brand-kits/{response.data['id']}/", {'logos': '[]'}, format='json')
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 1)
+
+        BrandKit.objects.filter(pk=response.data['id']).update(logos=json.dumps([asset.file_url]))
+        AssetBlob.objects.update(ref_count=7)
+        self.assertEqual(recount_references(), 1)
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 2)
@@ -0,0 +1,93 @@
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient
+
+from api.asset_derivatives import generate_asset_derivatives
+from api.models import Asset, AssetDerivative
+
+
+class AssetDerivativeTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root, ASSET_DERIVATIVE_WIDTHS=(480, 960, 1920))
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.user = User.objects.create_user(username='teacher', password='pass')
+
+    def create_image_asset(self, name, size=(1200, 800), mode='RGB', thumbnail_url=''):
+        Path(self.media_root, 'assets').mkdir(exist_ok=True)
+        Image.new(mode, size, 'red').save(Path(self.media_root, 'assets', name))
+        return Asset.objects.create(
+            name=name, asset_type='image', file_url=f'/media/assets/{name}', thumbnail_url=thumbnail_url,
+            tags='[]', file_size=1, created_at=timezone.now(), uploaded_by=self.user,
+        )
+
+    def test_widths_formats_and_thumbnail(self):
+        asset = self.create_image_asset('photo.jpg')
+
+        self.assertEqual(generate_asset_derivatives(asset.id), 7)
+
+        rows = set(AssetDerivative.objects.filter(asset=asset).values_list('kind', 'format', 'width', 'height'))
+        self.assertEqual(rows, {
+            ('thumbnail', 'jpeg', 320, 213),
+            ('responsive', 'jpeg', 480, 320), ('responsive', 'webp', 480, 320),
+            ('responsive', 'jpeg', 960, 640), ('responsive', 'webp', 960, 640),
+            ('responsive', 'jpeg', 1200, 800), ('responsive', 'webp', 1200, 800),
+        })
+        asset.refresh_from_db()
+        self.assertTrue(asset.content_hash)
+        webp = AssetDerivative.objects.get(asset=asset, format='webp', width=960)
+        with Image.open(Path(self.media_root, webp.file_url.removeprefix('/media/'))) as image:
+            self.assertEqual((image.format, image.size), ('WEBP', (960, 640)))
+        with Image.open(Path(self.media_root, asset.thumbnail_url.removeprefix('/media/'))) as image:
+            self.assertEqual(image.width, 320)
+
+    def test_small_transparent_image_is_not_upscaled(self):
+        asset = self.create_image_asset('icon.png', size=(200, 100), mode='RGBA', thumbnail_url='/custom.png')
+
+        generate_asset_derivatives(asset.id)
+
+        rows = set(AssetDerivative.objects.filter(asset=asset).values_list('kind', 'format', 'width'))
+        self.assertEqual(rows, {('thumbnail', 'png', 200), ('responsive', 'png', 200), ('responsive', 'webp', 200)})
+        asset.refresh_from_db()
+        self.assertEqual(asset.thumbnail_url, '/custom.png')
+
+    def test_up_to_date_assets_are_skipped_and_identical_files_shared(self):
+        asset = self.create_image_asset('a.jpg')
+        generate_asset_derivatives(asset.id)
+        self.assertEqual(generate_asset_derivatives(asset.id), 0)
+
+        copy = self.create_image_asset('b.jpg')
+        self.assertEqual(generate_asset_derivatives(copy.id), 0)
+        self.assertEqual(AssetDerivative.objects.filter(asset=copy).count(), 7)
+        self.assertEqual(len(list(Path(self.media_root, 'asset_derivatives').rglob('*.*'))), 7)
+
+    def test_serializer_returns_srcset(self):
+        asset = self.create_image_asset('photo.jpg')
+        generate_asset_derivatives(asset.id)
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        data = client.get(f'/api/assets/{asset.id}/').data
+
+        asset.refresh_from_db()
+        prefix = f'/media/asset_derivatives/{asset.content_hash[:2]}/{asset.content_hash}'
+        self.assertEqual(data['srcset'], f'{prefix}/responsive-480.jpg 480w, '
+                                         f'{prefix}/responsive-960.jpg 960w, '
+                                         f'{prefix}/responsive-1200.jpg 1200w')
+        self.assertTrue(data['srcset_webp'].startswith(f'{prefix}/responsive-480.webp 480w'))
+
+    def test_non_local_files_are_ignored(self):
+        asset = Asset.objects.create(
+            name='remote', asset_type='image', file_url='https://cdn.example.com/a.png', thumbnail_url='',
+            tags='[]', file_size=1, created_at=timezone.now(), uploaded_by=self.user,
+        )
+        self.assertEqual(generate_asset_derivatives(asset.id), 0)
@@ -0,0 +1,89 @@
+import json
+
+from django.contrib.auth.models import Group, User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.asset_search import index_entries, search_assets, suggest, tokenize
+from api.models import Asset, AssetSearchToken, AssetTag
+
+
+def create_asset(user, name, tags=(), asset_type='image', group=None):
+    return Asset.objects.create(
+        name=name, asset_type=asset_type, file_url=f'/media/{name}.png', thumbnail_url='',
+        tags=json.dumps(list(tags)), file_size=100, created_at=timezone.now(),
+        uploaded_by=user, group=group,
+    )
+
+
+class AssetIndexTests(TestCase):
+    def test_tokens_are_normalized(self):
+        self.assertEqual(tokenize('Școală_Gimnazială nr.5'), ['scoala', 'gimnaziala', 'nr', '5'])
+        tags, weights = index_entries('Logo școală', '["School Logo", "logo"]')
+        self.assertEqual(tags, ['school logo', 'logo'])
+        self.assertEqual(weights, {'school': 2, 'logo': 3, 'scoala': 3})
+
+    def test_save_reindexes(self):
+        user = User.objects.create_user(username='u')
+        asset = create_asset(user, 'Cat photo', tags=['animals'])
+        asset.name = 'Dog photo'
+        asset.save()
+
+        self.assertEqual(
+            set(AssetSearchToken.objects.filter(asset=asset).values_list('token', flat=True)),
+            {'dog', 'photo', 'animals'},
+        )
+        self.assertEqual(list(AssetTag.objects.filter(asset=asset).values_list('tag', flat=True)), ['animals'])
+
+
+class AssetSearchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='teacher', password='pass')
+        self.other = User.objects.create_user(username='other')
+        self.group = Group.objects.create(name='school')
+        self.user.groups.add(self.group)
+
+        self.cat = create_asset(self.user, 'Cat', tags=['animals'])
+        self.education = create_asset(self.user, 'Education chart', tags=['school'])
+        self.cat_tag = create_asset(self.user, 'Pet photo', tags=['cat'], asset_type='icon')
+        self.catalog = create_asset(self.other, 'Catalog', group=self.group)
+        self.hidden = create_asset(self.other, 'Cat private')
+        self.visible = Asset.objects.filter(id__in=[self.cat.id, self.education.id, self.cat_tag.id, self.catalog.id])
+
+    def test_whole_tokens_ranked_by_field(self):
+        total, page = search_assets(self.visible, 'cat', prefix=False)
+
+        self.assertEqual(total, 2)
+        self.assertEqual([asset.id for asset in page], [self.cat.id, self.cat_tag.id])
+        self.assertEqual([asset.search_score for asset in page], [6, 4])
+
+    def test_prefix_and_filters(self):
+        total, page = search_assets(self.visible, 'cat')
+        self.assertEqual([asset.id for asset in page], [self.cat.id, self.cat_tag.id, self.catalog.id])
+
+        _, page = search_assets(self.visible, 'cat', asset_type='icon')
+        self.assertEqual([asset.id for asset in page], [self.cat_tag.id])
+        _, page = search_assets(self.visible, '', tags=['school'])
+        self.assertEqual([asset.id for asset in page], [self.education.id])
+
+    def test_all_terms_must_match(self):
+        total, page = search_assets(self.visible, 'education cha')
+        self.assertEqual((total, [asset.id for asset in page]), (1, [self.education.id]))
+
+    def test_suggest(self):
+        self.assertEqual(
+            suggest(self.visible, 'ca'),
+            [{'token': 'cat', 'count': 2}, {'token': 'catalog', 'count': 1}],
+        )
+
+    def test_search_endpoint_paginates_visible_assets(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get('/api/assets/search/', {'q': 'cat', 'page': 2, 'page_size': 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual([item['id'] for item in response.data['results']], [self.catalog.id])
+        self.assertEqual(response.data['results'][0]['score'], 3)
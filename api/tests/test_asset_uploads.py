@@ -0,0 +1,131 @@
+import hashlib
+import io
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth.models import Group, User
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIClient
+
+from api.models import Asset, AssetUpload
+
+
+def png_bytes(color='red'):
+    buffer = io.BytesIO()
+    Image.new('RGB', (800, 600), color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class AssetUploadTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+        self.group = Group.objects.create(name='school')
+        self.user = User.objects.create_user(username='teacher', password='pass')
+        self.user.groups.add(self.group)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def start(self, data, name='logo.png', client=None, **extra):
+        response = (client or self.client).post('/api/assets/uploads/', {
+            'name': name, 'size': len(data), 'sha256': hashlib.sha256(data).hexdigest(),
+            'tags': ['logo'], **extra,
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data['id']
+
+    def send(self, upload_id, chunk, offset, client=None, **headers):
+        return (client or self.client).put(
+            f'/api/assets/uploads/{upload_id}/chunk/?offset={offset}', chunk,
+            content_type='application/octet-stream', **headers,
+        )
+
+    def upload(self, data, client=None, **extra):
+        upload_id = self.start(data, client=client, **extra)
+        half = len(data) // 2
+        self.assertEqual(self.send(upload_id, data[:half], 0, client=client).status_code, 200)
+        self.assertEqual(self.send(upload_id, data[half:], half, client=client).status_code, 200)
+        return (client or self.client).post(f'/api/assets/uploads/{upload_id}/complete/')
+
+    def test_chunked_upload_creates_asset(self):
+        data = png_bytes()
+
+        response = self.upload(data, group=self.group.id)
+
+        self.assertEqual(response.status_code, 201, response.data)
+        asset = Asset.objects.get(pk=response.data['id'])
+        self.assertEqual(asset.file_size, len(data))
+        self.assertEqual(asset.content_hash, hashlib.sha256(data).hexdigest())
+        self.assertEqual(asset.asset_type, 'image')
+        self.assertEqual(asset.group, self.group)
+        stored = Path(self.media_root, asset.file_url.removeprefix('/media/'))
+        self.assertEqual(stored.read_bytes(), data)
+        # thumbnail-ul e generat în background, după commit
+        self.assertEqual(asset.thumbnail_url, '')
+
+    def test_resume_and_chunk_checksum(self):
+        data = b'x' * 1000
+        upload_id = self.start(data, name='notes.txt')
+        self.send(upload_id, data[:400], 0)
+
+        # offset greșit: clientul află de unde să reia
+        response = self.send(upload_id, data[600:], 600)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['received_bytes'], 400)
+
+        response = self.send(upload_id, data[400:800], 400, HTTP_X_CHUNK_SHA256='0' * 64)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get(f'/api/assets/uploads/{upload_id}/').data['received_bytes'], 400)
+
+        response = self.send(upload_id, data[400:], 400,
+                             HTTP_X_CHUNK_SHA256=hashlib.sha256(data[400:]).hexdigest())
+        self.assertEqual(response.data['received_bytes'], 1000)
+        self.assertEqual(self.client.post(f'/api/assets/uploads/{upload_id}/complete/').status_code, 201)
+
+    def test_incomplete_or_corrupt_upload_is_rejected(self):
+        data = b'y' * 100
+        upload_id = self.start(data, name='a.bin')
+        self.send(upload_id, data[:50], 0)
+        self.assertEqual(self.client.post(f'/api/assets/uploads/{upload_id}/complete/').status_code, 400)
+
+        self.send(upload_id, b'z' * 50, 50)
+        response = self.client.post(f'/api/assets/uploads/{upload_id}/complete/')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(AssetUpload.objects.get(pk=upload_id).status, AssetUpload.STATUS_FAILED)
+
+        # Reîncercările după eșec primesc 400, nu o eroare de fișier lipsă
+        self.assertEqual(self.client.post(f'/api/assets/uploads/{upload_id}/complete/').status_code, 400)
+        self.assertEqual(self.send(upload_id, data[:50], 0).status_code, 400)
+
+    def test_identical_files_are_stored_once(self):
+        data = png_bytes('blue')
+        other = User.objects.create_user(username='other')
+        other.groups.add(Group.objects.create(name='other school'))
+        other_client = APIClient()
+        other_client.force_authenticate(other)
+
+        first = self.upload(data).data
+        again = self.upload(data).data
+        foreign = self.upload(data, client=other_client).data
+
+        self.assertEqual(again['id'], first['id'])
+        self.assertNotEqual(foreign['id'], first['id'])
+        self.assertEqual(foreign['file_url'], first['file_url'])
+        self.assertEqual(len(list(Path(self.media_root, 'assets').rglob('*.png'))), 1)
+        self.assertFalse(list(Path(self.media_root, 'uploads').iterdir()))
+
+    def test_uploads_are_private(self):
+        upload_id = self.start(b'abc', name='a.txt')
+        stranger = APIClient()
+        stranger.force_authenticate(User.objects.create_user(username='stranger'))
+
+        self.assertEqual(stranger.get(f'/api/assets/uploads/{upload_id}/').status_code, 404)
+        self.assertEqual(self.send(upload_id, b'abc', 0, client=stranger).status_code, 404)
@@ -0,0 +1,115 @@
+from django.contrib.auth.models import Group, User
+from django.test import TestCase, TransactionTestCase
+from rest_framework.test import APIClient
+
+from api.assignments import assign_presentation_to_group
+from api.models import BackgroundJob, Frame, Presentation, PresentationAccess, Student, StudentGroup
+from api.tests.utils import create_presentation
+
+
+def create_class(size, slug='clasa-9a', without_account=0):
+    group = StudentGroup.objects.create(slug=slug, name=slug)
+    for index in range(size):
+        user = User.objects.create_user(username=f'{slug}-{index}')
+        Student.objects.create(first_name='Elev', last_name=str(index), group=group, user=user)
+    for index in range(without_account):
+        Student.objects.create(first_name='Fara', last_name=f'cont {index}', group=group)
+    return group
+
+
+class AssignPresentationTests(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create_user(username='teacher', password='pass')
+        self.presentation = create_presentation(self.teacher, title='Lecția 1', num_frames=3)
+
+    def test_copies_run_in_constant_statements_per_batch(self):
+        small = create_class(2, slug='mica')
+        large = create_class(6, slug='mare')
+
+        # 2 COUNT + elevii + clonarea unui batch (8, fără conexiuni)
+        with self.assertNumQueries(11):
+            assign_presentation_to_group(self.presentation, small, self.teacher, batch_size=10)
+        # același număr de statements pentru un batch de 6 ca pentru unul de 2
+        with self.assertNumQueries(11):
+            result = assign_presentation_to_group(self.presentation, large, self.teacher, batch_size=10)
+
+        self.assertEqual(result['created'], 6)
+        copies = Presentation.objects.filter(id__in=result['presentation_ids'])
+        self.assertEqual(
+            sorted(copies.values_list('owner__username', flat=True)),
+            [f'mare-{i}' for i in range(6)],
+        )
+        self.assertEqual(Frame.objects.filter(presentation__in=copies).count(), 18)
+
+    def test_access_mode_skips_students_without_account_and_existing_grants(self):
+        group = create_class(5, without_account=2)
+        student_user = User.objects.get(username='clasa-9a-0')
+        assign_presentation_to_group(
+            self.presentation, group, self.teacher, mode='access', batch_size=2
+        )
+
+        result = assign_presentation_to_group(
+            self.presentation, group, self.teacher, mode='access', batch_size=2
+        )
+
+        self.assertEqual(result['created'], 0)
+        self.assertEqual(result['skipped_without_account'], 2)
+        self.assertEqual(PresentationAccess.objects.filter(presentation=self.presentation).count(), 5)
+        self.assertTrue(
+            PresentationAccess.objects.filter(user=student_user, permission='VIEWER').exists()
+        )
+
+    def test_access_mode_upgrades_existing_grants(self):
+        group = create_class(3)
+        assign_presentation_to_group(self.presentation, group, self.teacher, mode='access')
+
+        result = assign_presentation_to_group(
+            self.presentation, group, self.teacher, mode='access', permission='EDITOR'
+        )
+
+        self.assertEqual((result['created'], result['updated']), (0, 3))
+        self.assertEqual(
+            set(PresentationAccess.objects.filter(presentation=self.presentation).values_list('permission', flat=True)),
+            {'EDITOR'},
+        )
+
+
+class AssignEndpointTests(TransactionTestCase):
+    def test_assignment_runs_as_job(self):
+        teacher = User.objects.create_user(username='teacher', password='pass')
+        teacher.groups.add(Group.objects.get_or_create(name='PROFESOR')[0])
+        presentation = create_presentation(teacher, title='Lecția 1', num_frames=2)
+        create_class(3)
+        client = APIClient()
+        client.force_authenticate(teacher)
+
+        with self.settings(JOBS_RUN_INLINE=True, ASSIGNMENT_BATCH_SIZE=2):
+            response = client.post(
+                f'/api/presentations/{presentation.id}/assign/',
+                {'student_group': 'clasa-9a'},
+                format='json',
+            )
+
+        self.assertEqual(response.status_code, 202)
+        job = BackgroundJob.objects.get(pk=response.data['job_id'])
+        self.assertEqual(job.status, BackgroundJob.STATUS_SUCCEEDED)
+        self.assertEqual(job.progress, 100)
+        self.assertEqual(Presentation.objects.exclude(owner=teacher).count(), 3)
+
+    def test_students_cannot_assign(self):
+        student = User.objects.create_user(username='student', password='pass')
+        student.groups.add(Group.objects.get_or_create(name='ELEV')[0])
+        presentation = create_presentation(student, title='Proiect', num_frames=1)
+        create_class(2)
+        client = APIClient()
+        client.force_authenticate(student)
+
+        response = client.post(
+            f'/api/presentations/{presentation.id}/assign/',
+            {'student_group': 'clasa-9a'},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(BackgroundJob.objects.exists())
+        self.assertEqual(Presentation.objects.count(), 1)
@@ -0,0 +1,100 @@
+import json
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api.autosave import autosave_presentations, dirty_presentations, thin_versions
+from api.models import Element, PresentationVersion
+from api.revisions import bump_revision
+from api.tests.utils import create_presentation
+from api.versioning import create_version, load_snapshot, reconstruct, snapshot_cache
+
+
+@override_settings(VERSION_AUTOSAVE_INTERVAL=300, VERSION_KEYFRAME_INTERVAL=4)
+class AutosaveTests(TestCase):
+    def setUp(self):
+        snapshot_cache.clear()
+        self.owner = User.objects.create_user(username='owner', password='pass')
+        self.presentation = create_presentation(self.owner, num_frames=2, elements_per_frame=2)
+        self.element = Element.objects.filter(frame__presentation=self.presentation).first()
+
+    def edit(self, text, at):
+        Element.objects.filter(pk=self.element.pk).update(content=json.dumps({'text': text}), updated_at=at)
+        bump_revision([self.presentation.id])
+
+    def test_autosave_only_dirty_presentations_once_per_interval(self):
+        now = timezone.now()
+        untouched = create_presentation(self.owner, title='Untouched')
+        old = now - timedelta(days=3)
+        type(untouched).objects.filter(pk=untouched.pk).update(revision=int(old.timestamp() * 1_000_000))
+
+        summary = autosave_presentations(now)
+        self.assertEqual(summary['created'], 1)
+        version = self.presentation.versions.get()
+        self.assertTrue(version.is_autosave)
+
+        # editat imediat după: prea devreme pentru o nouă versiune
+        PresentationVersion.objects.filter(pk=version.pk).update(created_at=now)
+        self.edit('changed', now + timedelta(minutes=1))
+        self.assertFalse(dirty_presentations(now + timedelta(minutes=2)).exists())
+        self.assertEqual(list(dirty_presentations(now + timedelta(minutes=6))), [self.presentation])
+
+        # după o versiune fără modificări nu mai e nimic de salvat
+        self.assertEqual(autosave_presentations(now + timedelta(minutes=6))['created'], 1)
+        self.assertFalse(dirty_presentations(now + timedelta(hours=1)).exists())
+
+    def test_unchanged_content_with_a_new_revision_is_checked_once(self):
+        create_version(self.presentation, self.owner, autosave=True)
+        PresentationVersion.objects.update(created_at=timezone.now() - timedelta(hours=1))
+        # Revision-ul avansează și fără modificări de conținut (ex. thumbnail-uri)
+        bump_revision([self.presentation.id])
+        self.assertEqual(list(dirty_presentations()), [self.presentation])
+
+        self.assertEqual(autosave_presentations()['created'], 0)
+
+        self.assertFalse(dirty_presentations().exists())
+        self.assertEqual(self.presentation.versions.count(), 1)
+
+    def test_unchanged_content_is_skipped(self):
+        create_version(self.presentation, self.owner)
+        self.assertIsNone(create_version(self.presentation, self.owner, skip_unchanged=True))
+        self.assertEqual(self.presentation.versions.count(), 1)
+
+    def test_version_numbers_are_unique(self):
+        create_version(self.presentation, self.owner)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            PresentationVersion.objects.create(
+                presentation=self.presentation, version_number=1, snapshot='{}',
+                created_by=self.owner, created_at=timezone.now(), notes='',
+            )
+        self.assertEqual(create_version(self.presentation, self.owner).version_number, 2)
+
+    def test_retention_keeps_hourly_then_daily_and_rebases_diffs(self):
+        now = timezone.now().replace(hour=12, minute=30)
+        ages = [
+            timedelta(days=3, hours=2), timedelta(days=3, hours=1),   # aceeași zi
+            timedelta(days=2),
+            timedelta(hours=5, minutes=20), timedelta(hours=5, minutes=10),  # aceeași oră
+            timedelta(hours=3),
+            timedelta(minutes=20), timedelta(minutes=10),
+        ]
+        expected = {}
+        for index, age in enumerate(ages):
+            self.edit(f'edit {index}', now - age)
+            version = create_version(self.presentation, self.owner, autosave=True)
+            PresentationVersion.objects.filter(pk=version.pk).update(created_at=now - age)
+            expected[version.version_number] = load_snapshot(self.presentation)
+        manual = create_version(self.presentation, self.owner, notes='manual')
+        PresentationVersion.objects.filter(pk=manual.pk).update(created_at=now - timedelta(days=3, hours=3))
+        expected[manual.version_number] = load_snapshot(self.presentation)
+
+        self.assertEqual(thin_versions(self.presentation, now), 2)
+
+        kept = list(self.presentation.versions.order_by('version_number'))
+        self.assertEqual([v.version_number for v in kept], [2, 3, 5, 6, 7, 8, 9])
+        snapshot_cache.clear()
+        for version in kept:
+            self.assertEqual(reconstruct(version), expected[version.version_number])
@@ -0,0 +1,68 @@
+import io
+import json
+import zipfile
+
+from django.contrib.auth.models import Group, User
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import PresentationAccess
+
+from .utils import create_presentation
+
+
+class BulkExportTests(APITestCase):
+    def setUp(self):
+        self.teacher = User.objects.create_user(username='teacher', password='TeacherPass456!')
+        self.other = User.objects.create_user(username='other', password='OtherPass456!')
+        self.client.force_authenticate(self.teacher)
+
+    def test_archive_contains_pdfs_and_reports_failures(self):
+        first = create_presentation(self.teacher, title='Algebra', num_frames=2)
+        second = create_presentation(self.teacher, title='Geometrie', num_frames=1)
+        foreign = create_presentation(self.other, title='Private')
+
+        response = self.client.post(
+            reverse('export-bulk'),
+            {'presentation_ids': [first.id, second.id, foreign.id, 999999]},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        names = set(archive.namelist())
+        self.assertIn(f'{first.id}-algebra.pdf', names)
+        self.assertIn(f'{second.id}-geometrie.pdf', names)
+
+        manifest = {item['id']: item for item in json.loads(archive.read('manifest.json'))['items']}
+        self.assertEqual(manifest[first.id]['status'], 'ok')
+        self.assertEqual(manifest[foreign.id]['error'], 'No access')
+        self.assertEqual(manifest[999999]['error'], 'Not found')
+
+    def test_same_access_rule_as_single_export(self):
+        group = Group.objects.create(name='clasa-6')
+        self.teacher.groups.add(group)
+        shared = create_presentation(self.other, title='Shared')
+        group_only = create_presentation(self.other, title='Group')
+        group_only.group = group
+        group_only.save()
+        PresentationAccess.objects.create(presentation=shared, user=self.teacher, permission='VIEWER',
+                                          granted_by=self.other, granted_at=timezone.now())
+
+        response = self.client.post(
+            reverse('export-bulk'), {'presentation_ids': [shared.id, group_only.id]}, format='json',
+        )
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        manifest = {item['id']: item for item in json.loads(archive.read('manifest.json'))['items']}
+
+        self.assertEqual(manifest[shared.id]['status'], 'ok')
+        self.assertEqual(manifest[group_only.id]['error'], 'No access')
+        self.assertEqual(self.client.get(reverse('export-pdf', args=[group_only.id])).status_code, 403)
+
+    def test_requires_ids_or_group(self):
+        response = self.client.post(reverse('export-bulk'), {}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
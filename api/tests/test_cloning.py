@@ -0,0 +1,108 @@
+import json
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api.cloning import clone_presentations
+from api.models import Element, Frame, FrameConnection, Presentation
+from api.tests.test_materializers import without_returning_bulk_insert
+from api.tests.utils import create_presentation
+
+
+class ClonePresentationTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='teacher', password='pass')
+        self.original = create_presentation(self.owner, title='Deck', num_frames=3, elements_per_frame=2)
+        self.frames = list(self.original.frames.order_by('order'))
+        Frame.objects.filter(pk=self.frames[0].pk).update(transition_settings='{"type": "zoom"}')
+        Element.objects.filter(frame=self.frames[0]).update(animation_settings='{"type": "slide"}')
+        FrameConnection.objects.create(from_frame=self.frames[0], to_frame=self.frames[2], label='skip')
+        self.original.presentation_path = json.dumps([self.frames[2].id, self.frames[0].id])
+        self.original.save()
+
+    def test_clone_for_many_users_uses_constant_queries(self):
+        students = [User.objects.create_user(username=f's{i}') for i in range(5)]
+        targets = [{'owner': student} for student in students]
+
+        # sursa (2), savepoint, prezentări, frames, elements, conexiuni, path, release
+        with self.assertNumQueries(9):
+            copies = clone_presentations(self.original, targets)
+
+        self.assertEqual([copy.owner_id for copy in copies], [s.id for s in students])
+        for copy in copies:
+            frames = list(copy.frames.order_by('order'))
+            self.assertEqual(len(frames), 3)
+            self.assertEqual(frames[0].transition_settings, '{"type": "zoom"}')
+            self.assertEqual(
+                list(Element.objects.filter(frame=frames[0]).values_list('animation_settings', flat=True)),
+                ['{"type": "slide"}'] * 2,
+            )
+            connection = FrameConnection.objects.get(from_frame__presentation=copy)
+            self.assertEqual((connection.from_frame_id, connection.to_frame_id), (frames[0].id, frames[2].id))
+            copy.refresh_from_db()
+            self.assertEqual(json.loads(copy.presentation_path), [frames[2].id, frames[0].id])
+
+    def test_clone_without_returning_bulk_insert(self):
+        targets = [{'owner': self.owner, 'title': f'Copy {i}'} for i in range(3)]
+
+        with without_returning_bulk_insert():
+            copies = clone_presentations(self.original, targets)
+
+        for copy in copies:
+            frames = list(copy.frames.order_by('order'))
+            self.assertEqual([frame.title for frame in frames], ['Slide 1', 'Slide 2', 'Slide 3'])
+            self.assertEqual(json.loads(copy.presentation_path), [frames[2].id, frames[0].id])
+            self.assertEqual(
+                list(frames[1].elements.values_list('content', flat=True)),
+                list(self.frames[1].elements.values_list('content', flat=True)),
+            )
+
+    def test_duplicate_endpoint_copies_a_subset(self):
+        client = APIClient()
+        client.force_authenticate(self.owner)
+        Frame.objects.filter(presentation=self.original).update(thumbnail_url='/media/thumbnails/frames/1-abc.png')
+
+        with mock.patch('api.presentation_views.schedule_thumbnails') as schedule:
+            response = client.post(
+                f'/api/presentations/{self.original.id}/duplicate/',
+                {'frame_ids': [self.frames[0].id, self.frames[1].id]},
+                format='json',
+            )
+
+        self.assertEqual(response.status_code, 201)
+        # Preview-urile originalului aparțin frame-urilor lui; copia își randează propriile fișiere
+        schedule.assert_called_once_with(response.data['id'])
+        self.assertEqual([frame['thumbnail_url'] for frame in response.data['frames']], ['', ''])
+        self.assertEqual(response.data['title'], 'Deck (Copy)')
+        copied = list(Frame.objects.filter(presentation_id=response.data['id']).order_by('order'))
+        self.assertEqual(len(copied), 2)
+        self.assertEqual(json.loads(response.data['presentation_path']), [copied[0].id])
+        self.assertFalse(FrameConnection.objects.filter(from_frame__in=copied).exists())
+
+    def test_duplicate_endpoint_rejects_invalid_frame_ids(self):
+        client = APIClient()
+        client.force_authenticate(self.owner)
+
+        for frame_ids in ('1,2', [self.frames[0].id, 'abc'], [{'id': 1}]):
+            response = client.post(
+                f'/api/presentations/{self.original.id}/duplicate/', {'frame_ids': frame_ids}, format='json',
+            )
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('frame_ids', response.data)
+        self.assertEqual(Presentation.objects.filter(owner=self.owner).count(), 1)
+
+    def test_frame_duplicate_keeps_settings(self):
+        client = APIClient()
+        client.force_authenticate(self.owner)
+
+        with self.settings(THUMBNAILS_ENABLED=False):
+            response = client.post(f'/api/frames/{self.frames[0].id}/duplicate/?presentation_id={self.original.id}')
+
+        self.assertEqual(response.status_code, 201)
+        new_frame = Frame.objects.get(pk=response.data['id'])
+        self.assertEqual(new_frame.title, 'Slide 1 (Copy)')
+        self.assertEqual(new_frame.order, 1)
+        self.assertEqual(new_frame.transition_settings, '{"type": "zoom"}')
+        self.assertEqual(new_frame.elements.count(), 2)
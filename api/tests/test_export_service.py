@@ -0,0 +1,58 @@
+import io
+
+from django.test import SimpleTestCase
+from pypdf import PdfReader
+
+from api.export_service import get_pdf_render_pool, render_pdf_pages, render_pdf_parallel
+
+
+def make_frames(count):
+    return [
+        {
+            'background_color': '#ffffff',
+            'elements': [
+                {
+                    'type': 'TEXT',
+                    'position': {'x': 100, 'y': 100, 'width': 800, 'height': 100},
+                    'content': {'text': f'Slide {index}', 'fontSize': 32},
+                },
+                {
+                    'type': 'SHAPE',
+                    'position': {'x': 100, 'y': 400, 'width': 200, 'height': 200},
+                    'content': {'shape': 'circle'},
+                },
+            ],
+        }
+        for index in range(count)
+    ]
+
+
+class PdfRenderingTests(SimpleTestCase):
+    def test_parallel_render_keeps_every_page_in_order(self):
+        frames = make_frames(7)
+
+        pdf_bytes = render_pdf_parallel(frames, workers=2, chunk_size=2)
+
+        reader = PdfReader(io.BytesIO(pdf_bytes))
+        self.assertEqual(len(reader.pages), 7)
+        self.assertIn('Slide 0', reader.pages[0].extract_text())
+        self.assertIn('Slide 6', reader.pages[6].extract_text())
+
+    def test_single_worker_falls_back_to_sequential(self):
+        frames = make_frames(3)
+
+        pdf_bytes = render_pdf_parallel(frames, workers=1)
+
+        self.assertEqual(len(PdfReader(io.BytesIO(pdf_bytes)).pages), 3)
+        self.assertEqual(
+            len(PdfReader(io.BytesIO(render_pdf_pages(frames))).pages), 3
+        )
+
+    def test_pool_is_shared_whatever_the_requested_workers(self):
+        pool = get_pdf_render_pool()
+
+        render_pdf_parallel(make_frames(4), workers=2, chunk_size=1)
+        render_pdf_parallel(make_frames(8), workers=8, chunk_size=1)
+
+        # Niciun request nu înlocuiește pool-ul în care alții încă trimit
+        self.assertIs(get_pdf_render_pool(), pool)
@@ -0,0 +1,93 @@
+from asgiref.sync import async_to_sync
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth.models import User
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from api.instrumentation import registry
+from api.models import BackgroundJob
+from api.routing import websocket_urlpatterns
+
+from .utils import create_presentation
+
+
+class HTTPInstrumentationTests(TestCase):
+    def setUp(self):
+        registry.clear()
+        self.owner = User.objects.create_user(username='teacher', password='pass')
+        self.presentation = create_presentation(self.owner, num_frames=2)
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def test_request_costs_are_recorded(self):
+        self.client.get(f'/api/presentations/{self.presentation.id}/')
+
+        (count, queries, db_time, serializer_time, latency), = [
+            values for labels, values in registry.snapshot('http').items()
+            if labels == ('GET', 'presentation-detail', '200')
+        ]
+        self.assertEqual(count, 1)
+        self.assertGreater(queries, 1)
+        self.assertGreater(serializer_time, 0)
+        self.assertGreaterEqual(latency, serializer_time)
+        self.assertGreater(db_time, 0)
+
+    def test_metrics_endpoint(self):
+        self.client.get(f'/api/presentations/{self.presentation.id}/')
+
+        with self.settings(INSTRUMENTATION_METRICS_TOKEN='s3cret'):
+            response = self.client.get('/api/metrics/', HTTP_AUTHORIZATION='Bearer s3cret')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('# TYPE smarthack_http_requests_total counter', body)
+        self.assertIn('smarthack_http_requests_total{method="GET",view="presentation-detail",status="200"} 1', body)
+        self.assertIn('smarthack_http_request_duration_seconds_bucket{method="GET",view="presentation-detail",'
+                      'status="200",le="+Inf"} 1', body)
+
+    def test_metrics_endpoint_requires_token_or_staff(self):
+        # Adresa clientului nu contează: în spatele proxy-ului toate cererile vin de la 127.0.0.1
+        self.assertEqual(self.client.get('/api/metrics/', REMOTE_ADDR='127.0.0.1').status_code, 404)
+        with self.settings(INSTRUMENTATION_METRICS_TOKEN='s3cret'):
+            self.assertEqual(self.client.get('/api/metrics/', HTTP_AUTHORIZATION='Bearer wrong').status_code, 404)
+        # Fără token configurat, un header "Bearer " gol nu deschide endpoint-ul
+        self.assertEqual(self.client.get('/api/metrics/', HTTP_AUTHORIZATION='Bearer ').status_code, 404)
+
+        staff = User.objects.create_user(username='admin', password='pass', is_staff=True)
+        self.client.force_login(staff)
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 200)
+
+    def test_slow_log_is_off_under_tests(self):
+        with self.settings(INSTRUMENTATION_SLOW_QUERIES=0), self.assertNoLogs('api.instrumentation.slow'):
+            self.client.get(f'/api/presentations/{self.presentation.id}/')
+
+    @override_settings(INSTRUMENTATION_SLOW_LOG=True, INSTRUMENTATION_SLOW_QUERIES=0)
+    def test_slow_requests_are_logged_with_sql(self):
+        with self.assertLogs('api.instrumentation.slow', 'WARNING') as logs:
+            self.client.get(f'/api/presentations/{self.presentation.id}/')
+
+        self.assertIn(f'request GET /api/presentations/{self.presentation.id}/', logs.output[0])
+        self.assertIn('FROM "api_frame"', logs.output[0])
+
+
+class ConsumerInstrumentationTests(TransactionTestCase):
+    def test_messages_are_recorded(self):
+        registry.clear()
+        user = User.objects.create_user(username='teacher', password='pass')
+        job = BackgroundJob.objects.create(kind='ai_rewrite', payload='{}', created_by=user)
+
+        async def connect():
+            communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), f'/ws/jobs/{job.id}/')
+            communicator.scope['user'] = user
+            await communicator.connect()
+            await communicator.receive_json_from()
+            await communicator.disconnect()
+
+        async_to_sync(connect)()
+
+        metrics = registry.snapshot('ws')
+        count, queries = metrics[('JobConsumer', 'websocket.connect')][:2]
+        self.assertEqual((count, queries), (1, 1))
+        self.assertIn(('JobConsumer', 'websocket.disconnect'), metrics)
@@ -0,0 +1,54 @@
+import json
+
+from django.test import SimpleTestCase
+
+from api.json_stream import JSONObjectStream
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class JSONObjectStreamTests(SimpleTestCase):
+    document = {
+        'title': 'Deck, "quoted" }',
+        'frames': [
+            {'title': 'Intro', 'elements': [{'content': {'text': '[not, an] array'}}]},
+            {'title': 'Outro', 'elements': []},
+        ],
+        'description': 'Two slides',
+    }
+
+    def test_reports_members_and_array_items_in_order(self):
+        text = '```json\n' + json.dumps(self.document, indent=2) + '\n```'
+
+        for size in (1, 5, len(text)):
+            parser = JSONObjectStream()
+            events = []
+            for chunk in chunked(text, size):
+                events.extend(parser.feed(chunk))
+            parser.close()
+
+            self.assertEqual(events, [
+                ('title', None, self.document['title']),
+                ('frames', 0, self.document['frames'][0]),
+                ('frames', 1, self.document['frames'][1]),
+                ('description', None, 'Two slides'),
+            ])
+
+    def test_item_is_reported_before_the_array_closes(self):
+        parser = JSONObjectStream()
+        text = json.dumps(self.document)
+        cut = text.index('{"title": "Outro"')
+
+        events = parser.feed(text[:cut])
+
+        self.assertEqual([key for key, _, _ in events], ['title', 'frames'])
+        self.assertFalse(parser.done)
+
+    def test_close_rejects_truncated_object(self):
+        parser = JSONObjectStream()
+        parser.feed('{"title": "Deck", "frames": [')
+
+        with self.assertRaises(ValueError):
+            parser.close()
@@ -0,0 +1,148 @@
+import json
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.materializers import materialize_game, materialize_presentation
+from api.models import Element, Frame, FrameConnection, PresentationTemplate
+from api.tests.utils import create_presentation
+
+
+def without_returning_bulk_insert():
+    """Behave like MySQL: bulk_create does not set primary keys."""
+    return mock.patch.object(
+        type(connection.features), 'can_return_rows_from_bulk_insert',
+        new_callable=mock.PropertyMock, return_value=False,
+    )
+
+
+def deck_structure(num_frames=10, elements_per_frame=8):
+    return {
+        'title': 'Generated',
+        'description': 'From a structure',
+        'frames': [
+            {
+                'id': 100 + order,
+                'title': f'Slide {order + 1}',
+                'order': order,
+                'elements': [
+                    {
+                        'type': 'TEXT',
+                        'position': {'x': 100, 'y': 100 * index, 'width': 800, 'height': 80},
+                        'content': {'text': f'Text {order}.{index}'},
+                    }
+                    for index in range(elements_per_frame)
+                ],
+            }
+            for order in range(num_frames)
+        ],
+        'presentation_path': [101, 100],
+        'connections': [{'from_frame': 100, 'to_frame': 101, 'label': 'next'}],
+    }
+
+
+class MaterializePresentationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='teacher', password='pass')
+
+    def test_constant_number_of_queries(self):
+        # savepoint, presentation, frames, elements, connections, path, release
+        with self.assertNumQueries(7):
+            presentation = materialize_presentation(self.user, deck_structure())
+
+        frames = list(presentation.frames.order_by('order'))
+        self.assertEqual(len(frames), 10)
+        self.assertEqual(Element.objects.filter(frame__presentation=presentation).count(), 80)
+        self.assertEqual(json.loads(presentation.presentation_path), [frames[1].id, frames[0].id])
+        connection_row = FrameConnection.objects.get(from_frame=frames[0])
+        self.assertEqual(connection_row.to_frame_id, frames[1].id)
+
+    def test_ids_are_refetched_when_backend_cannot_return_them(self):
+        create_presentation(self.user, num_frames=3)
+
+        with without_returning_bulk_insert():
+            presentation = materialize_presentation(self.user, deck_structure(num_frames=4))
+
+        frames = list(presentation.frames.order_by('order'))
+        self.assertEqual([frame.title for frame in frames], ['Slide 1', 'Slide 2', 'Slide 3', 'Slide 4'])
+        self.assertEqual(json.loads(presentation.presentation_path), [frames[1].id, frames[0].id])
+        for frame in frames:
+            self.assertEqual(frame.elements.count(), 8)
+
+    def test_game_is_created_in_bulk(self):
+        questions = [
+            {'text': 'Q1', 'time_limit': 500, 'choices': [{'text': 'A'}, {'text': 'B', 'is_correct': True}]},
+            {'text': ''},
+            {'text': 'Q2'},
+        ]
+
+        with without_returning_bulk_insert():
+            game = materialize_game(self.user, 'Quiz', '', questions)
+
+        first, second = game.questions.order_by('order')
+        self.assertEqual(first.time_limit, 90)
+        self.assertEqual([c.is_correct for c in first.choices.order_by('order')], [False, True])
+        self.assertEqual([c.text for c in second.choices.order_by('order')], ['Adevărat', 'Fals'])
+
+
+class ImportEndpointsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='teacher', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_export_json_round_trip(self):
+        original = create_presentation(self.user, title='Original', num_frames=3, elements_per_frame=2)
+        exported = self.client.get(f'/api/presentations/{original.id}/export_json/').data
+
+        response = self.client.post('/api/presentations/import/', exported, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        imported = Frame.objects.filter(presentation_id=response.data['id'])
+        self.assertEqual(imported.count(), 3)
+        self.assertEqual(Element.objects.filter(frame__in=imported).count(), 6)
+        self.assertEqual(response.data['title'], 'Original')
+
+    def test_export_json_round_trip_keeps_connections(self):
+        original = create_presentation(self.user, title='Original', num_frames=3)
+        first, second, third = original.frames.order_by('order')
+        FrameConnection.objects.create(from_frame=first, to_frame=third, label='skip')
+        FrameConnection.objects.create(from_frame=third, to_frame=second, label='back')
+        exported = self.client.get(f'/api/presentations/{original.id}/export_json/').data
+
+        response = self.client.post('/api/presentations/import/', exported, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        orders = dict(Frame.objects.filter(presentation_id=response.data['id']).values_list('id', 'order'))
+        connections = FrameConnection.objects.filter(from_frame_id__in=orders)
+        self.assertEqual(
+            sorted((orders[c.from_frame_id], orders[c.to_frame_id], c.label) for c in connections),
+            [(0, 2, 'skip'), (2, 1, 'back')],
+        )
+
+    def test_import_rejects_malformed_frames(self):
+        response = self.client.post('/api/presentations/import/', {'frames': ['oops']}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_template_instantiation(self):
+        template = PresentationTemplate.objects.create(
+            name='Lecție',
+            description='',
+            category='education',
+            thumbnail_url='',
+            structure=json.dumps(deck_structure(num_frames=2, elements_per_frame=1)),
+            is_public=1,
+            created_at=timezone.now(),
+            created_by=self.user,
+        )
+
+        response = self.client.post(f'/api/templates/{template.id}/instantiate/', {}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['template'], template.id)
+        self.assertEqual(Frame.objects.filter(presentation_id=response.data['id']).count(), 2)
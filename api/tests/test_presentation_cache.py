@@ -0,0 +1,101 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.models import BrandKit, Comment, Element, Presentation, PresentationAccess
+from api.presentation_cache import payload_cache
+
+from .utils import create_presentation
+
+
+class PresentationHTTPCacheTests(TestCase):
+    def setUp(self):
+        payload_cache.clear()
+        self.owner = User.objects.create_user(username='teacher', password='pass')
+        self.presentation = create_presentation(self.owner)
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        self.url = f'/api/presentations/{self.presentation.id}/'
+
+    def revision(self):
+        return Presentation.objects.values_list('revision', flat=True).get(pk=self.presentation.pk)
+
+    def test_not_modified_skips_serializer(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first['ETag'].endswith('-owner"'))
+        self.assertIn('Last-Modified', first)
+
+        with mock.patch('api.presentation_views.PresentationSerializer') as serializer:
+            with self.assertNumQueries(1):
+                response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], first['ETag'])
+        serializer.assert_not_called()
+
+        # Alt client fără ETag primește payload-ul din cache
+        with mock.patch('api.presentation_views.PresentationSerializer') as serializer:
+            cached = self.client.get(self.url)
+        serializer.assert_not_called()
+        self.assertEqual(cached.data, first.data)
+
+    def test_if_modified_since_alone_is_not_trusted(self):
+        first = self.client.get(self.url)
+        # Editare în aceeași secundă: Last-Modified nu se schimbă, ETag-ul da
+        frame = self.presentation.frames.get()
+        frame.title = 'Renamed'
+        frame.save()
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['frames'][0]['title'], 'Renamed')
+
+    def test_brand_kit_changes_bump_revision(self):
+        kit = BrandKit.objects.create(name='Școala', created_at=timezone.now(), updated_at=timezone.now(),
+                                      colors='{}', fonts='{}', logos='[]', is_default=0, created_by=self.owner)
+        Presentation.objects.filter(pk=self.presentation.pk).update(brand_kit=kit)
+        etag = self.client.get(self.url)['ETag']
+
+        kit.colors = '{"primary": "#ff0000"}'
+        kit.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['brand_kit_data']['colors'], '{"primary": "#ff0000"}')
+
+    def test_child_changes_bump_revision(self):
+        revisions = [self.revision()]
+        element = Element.objects.get(frame__presentation=self.presentation)
+        element.content = '{"text": "changed"}'
+        element.save()
+        revisions.append(self.revision())
+        Comment.objects.create(presentation=self.presentation, author=self.owner, text='Nice', position='{}',
+                               is_resolved=0, created_at=timezone.now(), updated_at=timezone.now())
+        revisions.append(self.revision())
+        element.delete()
+        revisions.append(self.revision())
+
+        self.assertEqual(revisions, sorted(set(revisions)))
+
+    def test_etag_changes_after_edit_and_per_permission(self):
+        etag = self.client.get(self.url)['ETag']
+        frame = self.presentation.frames.get()
+        frame.title = 'Renamed'
+        frame.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['frames'][0]['title'], 'Renamed')
+
+        viewer = User.objects.create_user(username='student')
+        PresentationAccess.objects.create(presentation=self.presentation, user=viewer, permission='VIEWER',
+                                          granted_by=self.owner, granted_at=timezone.now())
+        client = APIClient()
+        client.force_authenticate(viewer)
+        response = client.get(f'/api/presentations/by_token/?token={self.presentation.share_token}')
+        self.assertEqual(response.data['current_user_permission'], 'VIEWER')
+        self.assertTrue(response['ETag'].endswith('-viewer"'))
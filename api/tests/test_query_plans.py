@@ -0,0 +1,92 @@
+import json
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from api.models import Comment, Element, Frame, Presentation, PresentationAccess
+
+from .utils import create_presentation
+
+PRESENTATIONS = 20
+FRAMES = 30
+ELEMENTS = 10
+USERS = 40
+
+
+def analyze():
+    # Statistici la zi, ca planner-ul să aleagă ca în producție
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('ANALYZE')
+        elif connection.vendor == 'mysql':
+            for model in (Presentation, PresentationAccess, Frame, Element, Comment):
+                cursor.execute(f'ANALYZE TABLE {model._meta.db_table}')
+
+
+class PresentationQueryPlanTests(TestCase):
+    """The hot queries of presentation_views.py use the composite indexes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.owner = User.objects.create_user(username='teacher')
+        users = User.objects.bulk_create([User(username=f'student{index}') for index in range(USERS)])
+        presentations = [create_presentation(cls.owner, title=f'Deck {index}', num_frames=0)
+                         for index in range(PRESENTATIONS)]
+        Frame.objects.bulk_create([
+            Frame(presentation=presentation, title=f'Slide {order}', position='{}', background_color='#ffffff',
+                  background_image='', order=order, thumbnail_url='', created_at=now,
+                  updated_at=now - timedelta(minutes=order))
+            for presentation in presentations for order in range(FRAMES)
+        ])
+        frames = list(Frame.objects.order_by('id'))
+        Element.objects.bulk_create([
+            Element(frame=frame, element_type='TEXT', position='{}', content=json.dumps({'text': 'x'}),
+                    created_at=now, updated_at=now - timedelta(minutes=index))
+            for frame in frames for index in range(ELEMENTS)
+        ])
+        PresentationAccess.objects.bulk_create([
+            PresentationAccess(presentation=presentation, user=user, permission='VIEWER', granted_at=now)
+            for presentation in presentations for user in users
+        ])
+        Comment.objects.bulk_create([
+            Comment(presentation_id=frame.presentation_id, frame=frame, author=cls.owner, text='Nice', position='{}',
+                    is_resolved=0, created_at=now - timedelta(minutes=frame.order), updated_at=now)
+            for frame in frames
+        ])
+        analyze()
+        cls.presentation = presentations[PRESENTATIONS // 2]
+        cls.frame = frames[len(frames) // 2]
+        cls.user = users[USERS // 2]
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, plan)
+        # Ordinea vine din index, fără sortare separată
+        self.assertNotIn('TEMP B-TREE', plan, plan)
+
+    def test_frames_of_presentation_in_order(self):
+        self.assertUsesIndex(Frame.objects.filter(presentation=self.presentation).order_by('order'),
+                             'frame_pres_order_idx')
+
+    def test_permission_lookup(self):
+        self.assertUsesIndex(
+            PresentationAccess.objects.filter(presentation=self.presentation, user=self.user, permission='EDITOR'),
+            'access_pres_user_perm_idx',
+        )
+
+    def test_comments_of_presentation(self):
+        self.assertUsesIndex(Comment.objects.filter(presentation=self.presentation).order_by('created_at'),
+                             'comment_pres_created_idx')
+
+    def test_sync_delta(self):
+        since = timezone.now()
+        plan = Element.objects.filter(frame__presentation=self.presentation, updated_at__gt=since).explain()
+        self.assertIn('element_frame_updated_idx', plan, plan)
+        for queryset in (Frame.objects.filter(presentation=self.presentation, updated_at__gt=since),
+                         Comment.objects.filter(presentation=self.presentation, updated_at__gt=since)):
+            plan = queryset.explain()
+            self.assertNotRegex(plan, r'\bSCAN\b', plan)
@@ -0,0 +1,66 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.cloning import clone_frames
+from api.models import Element, Presentation
+from api.revisions import coalesce_revision_bumps, get_revision
+from api.versioning import create_version, restore_version
+
+from .utils import create_presentation
+
+
+def revision_updates(queries):
+    return [query for query in queries if query['sql'].startswith('UPDATE') and '"revision"' in query['sql']]
+
+
+class RevisionTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='teacher', password='pass')
+        self.presentation = create_presentation(self.owner, num_frames=2, elements_per_frame=3)
+
+    def test_bulk_paths_bump_revision(self):
+        revision = get_revision(self.presentation.id)
+
+        clone_frames([self.presentation.frames.first()], self.presentation)
+
+        self.assertGreater(get_revision(self.presentation.id), revision)
+
+    def test_deletes_are_coalesced(self):
+        revision = get_revision(self.presentation.id)
+        elements = list(Element.objects.filter(frame__presentation=self.presentation))
+
+        with CaptureQueriesContext(connection) as queries:
+            with coalesce_revision_bumps():
+                for element in elements:
+                    element.delete()
+
+        self.assertEqual(len(revision_updates(queries.captured_queries)), 1)
+        self.assertGreater(get_revision(self.presentation.id), revision)
+
+    def test_restore_bumps_once(self):
+        version = create_version(self.presentation, self.owner)
+        Element.objects.filter(frame__presentation=self.presentation).delete()
+        revision = get_revision(self.presentation.id)
+
+        with CaptureQueriesContext(connection) as queries:
+            restore_version(self.presentation, version, self.owner)
+
+        self.assertEqual(len(revision_updates(queries.captured_queries)), 1)
+        self.assertGreater(get_revision(self.presentation.id), revision)
+
+    def test_revision_endpoint_is_read_only(self):
+        client = APIClient()
+        client.force_authenticate(self.owner)
+        url = f'/api/presentations/{self.presentation.id}/'
+
+        client.patch(url, {'title': 'New', 'revision': 1}, format='json')
+        revision = get_revision(self.presentation.id)
+        self.assertGreater(revision, 1)
+
+        with self.assertNumQueries(1):
+            response = client.get(url + 'revision/')
+        self.assertEqual(response.data, {'id': self.presentation.id, 'revision': revision})
+        self.assertEqual(Presentation.objects.get(pk=self.presentation.id).title, 'New')
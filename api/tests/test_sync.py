@@ -0,0 +1,139 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.models import Comment, DeletedRecord, Element, Frame, Presentation
+from api.revisions import get_revision
+from api.versioning import create_version, restore_version
+
+from .utils import create_presentation
+
+
+class IncrementalSyncTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='teacher', password='pass')
+        self.presentation = create_presentation(self.owner, num_frames=2, elements_per_frame=2)
+        self.comment = Comment.objects.create(
+            presentation=self.presentation, author=self.owner, text='Nice', position='{}',
+            is_resolved=0, created_at=timezone.now(), updated_at=timezone.now(),
+        )
+        # Conținutul existent e "vechi": clientul l-a încărcat acum o oră
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        Frame.objects.update(updated_at=an_hour_ago)
+        Element.objects.update(updated_at=an_hour_ago)
+        Comment.objects.update(updated_at=an_hour_ago)
+        loaded_at = timezone.now() - timedelta(minutes=30)
+        Presentation.objects.update(revision=int(loaded_at.timestamp() * 1_000_000))
+        self.revision = get_revision(self.presentation.id)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        self.url = f'/api/presentations/{self.presentation.id}/sync/'
+
+    def sync(self, revision=None):
+        response = self.client.get(self.url, {'since_revision': self.revision if revision is None else revision})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_only_changed_rows_are_returned(self):
+        element = Element.objects.filter(frame__presentation=self.presentation).first()
+        self.client.patch(f'/api/elements/{element.id}/', {'content': '{"text": "Edited"}'}, format='json')
+
+        delta = self.sync()
+
+        self.assertFalse(delta['full'])
+        self.assertEqual(delta['revision'], get_revision(self.presentation.id))
+        self.assertEqual([row['id'] for row in delta['elements']], [element.id])
+        self.assertEqual(delta['elements'][0]['content_parsed'], {'text': 'Edited'})
+        self.assertEqual((delta['frames'], delta['connections'], delta['comments']), ([], [], []))
+
+    def test_resolved_comment_is_synced(self):
+        response = self.client.post(
+            f'/api/comments/{self.comment.id}/resolve/?presentation_id={self.presentation.id}'
+        )
+        self.assertEqual(response.status_code, 200)
+
+        delta = self.sync()
+
+        self.assertEqual([(row['id'], row['is_resolved']) for row in delta['comments']], [(self.comment.id, 1)])
+
+    def test_deletions_are_reported_as_tombstones(self):
+        element = Element.objects.filter(frame__presentation=self.presentation).first()
+        comment_id = self.comment.id
+        self.client.delete(f'/api/elements/{element.id}/')
+        self.comment.delete()
+
+        delta = self.sync()
+
+        self.assertEqual(delta['deleted']['elements'], [element.id])
+        self.assertEqual(delta['deleted']['comments'], [comment_id])
+        self.assertEqual(delta['elements'], [])
+
+    def test_up_to_date_and_stale_clients(self):
+        with self.assertNumQueries(1):
+            delta = self.sync()
+        self.assertEqual((delta['elements'], delta['deleted']['frames']), ([], []))
+
+        self.assertTrue(self.sync(revision=0)['full'])
+        long_ago = timezone.now() - timedelta(days=365)
+        self.assertTrue(self.sync(revision=int(long_ago.timestamp() * 1_000_000))['full'])
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+
+    def test_restored_rows_are_synced(self):
+        version = create_version(self.presentation, self.owner)
+        frame = self.presentation.frames.first()
+        Frame.objects.filter(pk=frame.pk).update(title='Changed')
+        revision = get_revision(self.presentation.id)
+
+        restore_version(self.presentation, version, self.owner)
+
+        delta = self.sync(revision)
+        self.assertEqual([(row['id'], row['title']) for row in delta['frames']], [(frame.id, 'Slide 1')])
+        self.assertNotIn('elements', delta['frames'][0])
+
+    def test_restore_writes_tombstones_in_bulk(self):
+        version = create_version(self.presentation, self.owner)
+        frames = list(self.presentation.frames.order_by('order'))
+        for frame in frames:
+            Element.objects.bulk_create([
+                Element(frame=frame, element_type='TEXT', position='{}', content='{}',
+                        created_at=timezone.now(), updated_at=timezone.now())
+                for _ in range(5)
+            ])
+        added = list(Element.objects.filter(frame__in=frames).order_by('-id').values_list('id', flat=True)[:10])
+
+        with CaptureQueriesContext(connection) as queries:
+            restore_version(self.presentation, version, self.owner)
+        statements = [query['sql'] for query in queries.captured_queries]
+
+        self.assertEqual(sorted(self.sync()['deleted']['elements']), sorted(added))
+        self.assertEqual(len([sql for sql in statements if sql.startswith('INSERT INTO "api_deletedrecord"')]), 1)
+        # presentation_id se caută o dată per frame, nu per element
+        lookups = [sql for sql in statements if 'SELECT "api_frame"."presentation_id"' in sql]
+        self.assertLessEqual(len(lookups), len(frames))
+
+    def test_deleting_a_loaded_element_needs_no_lookup(self):
+        element = Element.objects.filter(frame__presentation=self.presentation).select_related('frame').first()
+        element_id = element.id
+
+        with CaptureQueriesContext(connection) as queries:
+            element.delete()
+
+        self.assertFalse([query for query in queries.captured_queries
+                          if 'SELECT "api_frame"."presentation_id"' in query['sql']])
+        self.assertEqual(self.sync()['deleted']['elements'], [element_id])
+
+    def test_prune_command(self):
+        self.comment.delete()
+        DeletedRecord.objects.update(deleted_at=timezone.now() - timedelta(days=60))
+
+        call_command('prune_deleted_records', stdout=StringIO())
+
+        self.assertFalse(DeletedRecord.objects.exists())
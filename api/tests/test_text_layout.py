@@ -0,0 +1,41 @@
+from django.test import SimpleTestCase
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from api.management.commands.benchmark_text_layout import naive_wrap
+from api.text_layout import TextLayoutEngine, resolve_font
+
+
+class TextLayoutEngineTests(SimpleTestCase):
+    def test_matches_prefix_measuring_wrap(self):
+        engine = TextLayoutEngine()
+        text = (
+            "Fotosinteza este procesul prin care plantele verzi transformă energia "
+            "luminoasă în energie chimică supercalifragilisticexpialidocious ok"
+        )
+
+        for width in (40, 120, 300, 1000):
+            self.assertEqual(
+                engine.wrap(text, 'Helvetica', 16, width),
+                naive_wrap(text, 'Helvetica', 16, width),
+            )
+
+    def test_each_word_is_measured_once_and_layouts_are_memoized(self):
+        calls = []
+
+        def measure(text, font, size):
+            calls.append(text)
+            return stringWidth(text, font, size)
+
+        engine = TextLayoutEngine(measure=measure)
+        first = engine.wrap('a b a b a b', 'Helvetica', 12, 20)
+        measured = len(calls)
+        second = engine.wrap('a b a b a b', 'Helvetica', 12, 20)
+
+        self.assertEqual(first, second)
+        self.assertEqual(measured, 3)  # ' ', 'a', 'b'
+        self.assertEqual(len(calls), measured)
+
+    def test_resolve_font_maps_bold_variants(self):
+        self.assertEqual(resolve_font('Arial', 'bold'), 'Helvetica-Bold')
+        self.assertEqual(resolve_font('Times New Roman'), 'Times-Roman')
+        self.assertEqual(resolve_font('Comic Sans'), 'Helvetica')
@@ -0,0 +1,69 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api.models import Element
+from api.thumbnail_service import generate_presentation_thumbnails
+
+from .utils import create_presentation
+
+
+class ThumbnailGenerationTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        owner = User.objects.create_user(username='teacher', password='TeacherPass456!')
+        self.presentation = create_presentation(owner)
+        self.frame = self.presentation.frames.get()
+        self.element = self.frame.elements.get()
+
+    def test_renders_frame_and_sets_urls(self):
+        rendered = generate_presentation_thumbnails(self.presentation.id)
+
+        self.frame.refresh_from_db()
+        self.presentation.refresh_from_db()
+        self.assertEqual(rendered, 1)
+        self.assertTrue(self.frame.thumbnail_url.startswith('/media/thumbnails/frames/'))
+        self.assertEqual(self.presentation.thumbnail_url, self.frame.thumbnail_url)
+        files = list(Path(self.media_root).rglob('*.png'))
+        self.assertEqual(len(files), 1)
+
+    def test_rendering_does_not_bump_the_revision(self):
+        self.presentation.refresh_from_db()
+        revision = self.presentation.revision
+
+        generate_presentation_thumbnails(self.presentation.id)
+
+        self.presentation.refresh_from_db()
+        self.assertEqual(self.presentation.revision, revision)
+
+    def test_only_changed_frames_are_rendered_again(self):
+        generate_presentation_thumbnails(self.presentation.id)
+        self.assertEqual(generate_presentation_thumbnails(self.presentation.id), 0)
+
+        Element.objects.filter(pk=self.element.pk).update(
+            updated_at=timezone.now() + timedelta(seconds=5)
+        )
+
+        self.assertEqual(generate_presentation_thumbnails(self.presentation.id), 1)
+        self.assertEqual(len(list(Path(self.media_root).rglob('*.png'))), 1)
+
+    def test_deleting_an_older_element_renders_again(self):
+        newer = Element.objects.create(frame=self.frame, element_type='TEXT', position='{}',
+                                       content='{"text": "Newer"}', created_at=timezone.now(),
+                                       updated_at=timezone.now() + timedelta(seconds=5))
+        generate_presentation_thumbnails(self.presentation.id)
+
+        self.element.delete()
+
+        self.assertEqual(generate_presentation_thumbnails(self.presentation.id), 1)
+        self.assertTrue(Element.objects.filter(pk=newer.pk).exists())
@@ -0,0 +1,184 @@
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.models import Element, Frame, PresentationVersion
+from api.tests.utils import create_presentation
+from api.versioning import (
+    ENCODING_ZLIB, apply_diff, create_version, decode_payload, diff_json, encode_payload,
+    load_snapshot, reconstruct, restore_version, snapshot_cache, structural_diff,
+)
+
+
+class DiffTests(TestCase):
+    def test_diff_roundtrip(self):
+        old = {'a': 1, 'b': {'x': 1, 'y': 2}, 'c': [1, 2], 'gone': True}
+        new = {'a': 1, 'b': {'x': 1, 'y': 3, 'z': 0}, 'c': [1, 2, 3], 'added': 'v'}
+
+        diff = diff_json(old, new)
+
+        self.assertEqual(diff['del'], ['gone'])
+        self.assertEqual(diff['sub'], {'b': {'set': {'y': 3, 'z': 0}}})
+        self.assertEqual(apply_diff(old, diff), new)
+        self.assertIn('gone', old)
+        self.assertIsNone(diff_json(new, new))
+
+
+@override_settings(VERSION_KEYFRAME_INTERVAL=3, VERSION_COMPRESS_MIN_BYTES=64)
+class PresentationVersionTests(TestCase):
+    def setUp(self):
+        snapshot_cache.clear()
+        self.owner = User.objects.create_user(username='owner', password='pass')
+        self.presentation = create_presentation(self.owner, num_frames=4, elements_per_frame=3)
+        self.frame = self.presentation.frames.order_by('order').first()
+
+    def edit(self, index):
+        Element.objects.filter(frame=self.frame).update(content=json.dumps({'text': f'edit {index}'}))
+
+    def test_snapshot_loader_uses_one_query_per_table(self):
+        with self.assertNumQueries(3):
+            snapshot = load_snapshot(self.presentation)
+
+        self.assertEqual(len(snapshot['frames']), 4)
+        self.assertEqual(len(snapshot['elements']), 12)
+        self.assertNotIn('comments', snapshot)
+
+    def test_diffs_between_keyframes(self):
+        expected = []
+        for index in range(5):
+            self.edit(index)
+            create_version(self.presentation, self.owner)
+            expected.append(load_snapshot(self.presentation))
+
+        versions = list(self.presentation.versions.order_by('version_number'))
+        self.assertEqual([v.is_keyframe for v in versions], [True, False, False, True, False])
+
+        # diff-ul conține doar elementele modificate
+        diff = decode_payload(versions[1].snapshot, versions[1].encoding)
+        self.assertEqual(set(diff), {'sub'})
+        self.assertEqual(
+            set(diff['sub']['elements']['sub']),
+            {str(e.id) for e in Element.objects.filter(frame=self.frame)},
+        )
+        self.assertEqual(versions[0].encoding, ENCODING_ZLIB)
+
+        snapshot_cache.clear()
+        for version, snapshot in zip(versions, expected):
+            self.assertEqual(reconstruct(version), snapshot)
+
+    def test_reconstruct_is_cached(self):
+        for index in range(3):
+            self.edit(index)
+            version = create_version(self.presentation, self.owner)
+
+        snapshot_cache.clear()
+        with self.assertNumQueries(2):
+            reconstruct(version)
+        with self.assertNumQueries(0):
+            reconstruct(version)
+
+    def test_legacy_snapshot_is_followed_by_keyframe(self):
+        PresentationVersion.objects.create(
+            presentation=self.presentation, version_number=1,
+            snapshot=json.dumps({'id': self.presentation.id, 'frames': []}),
+            created_by=self.owner, created_at=timezone.now(), notes='',
+        )
+
+        version = create_version(self.presentation, self.owner)
+
+        self.assertEqual(version.version_number, 2)
+        self.assertTrue(version.is_keyframe)
+
+    def test_create_version_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(self.owner)
+
+        response = client.post(
+            f'/api/presentations/{self.presentation.id}/create_version/', {'notes': 'first'}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('snapshot', response.data)
+        self.assertEqual(response.data['snapshot_parsed'], load_snapshot(self.presentation))
+
+
+class VersionDiffRestoreTests(TestCase):
+    def setUp(self):
+        snapshot_cache.clear()
+        self.owner = User.objects.create_user(username='owner', password='pass')
+        self.presentation = create_presentation(self.owner, num_frames=3, elements_per_frame=2)
+        self.frames = list(self.presentation.frames.order_by('order'))
+        self.presentation.presentation_path = json.dumps([frame.id for frame in self.frames])
+        self.presentation.save()
+        self.v1 = create_version(self.presentation, self.owner)
+        self.original = load_snapshot(self.presentation)
+
+        self.changed, self.deleted = Element.objects.filter(frame=self.frames[0]).order_by('id')
+        self.untouched = Element.objects.filter(frame=self.frames[1]).first()
+        Element.objects.filter(pk=self.changed.pk).update(content='{"text": "edited"}')
+        Element.objects.filter(pk=self.deleted.pk).delete()
+        self.new_frame = create_presentation(self.owner, title='Other').frames.get()
+        Frame.objects.filter(pk=self.new_frame.pk).update(presentation=self.presentation, order=3)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def test_diff_endpoint(self):
+        response = self.client.get(f'/api/presentations/{self.presentation.id}/versions/diff/?from=1')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['summary']['frames'], {'added': 1, 'removed': 0, 'changed': 0})
+        self.assertEqual(response.data['summary']['elements'], {'added': 1, 'removed': 1, 'changed': 1})
+        self.assertEqual(response.data['elements']['removed'], [self.deleted.id])
+        self.assertEqual(
+            response.data['elements']['changed'][str(self.changed.id)]['content']['to'], '{"text": "edited"}'
+        )
+
+    def test_restore_writes_only_changed_rows(self):
+        before = Element.objects.get(pk=self.untouched.pk).updated_at
+
+        response = self.client.post(f'/api/presentations/{self.presentation.id}/versions/1/restore/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['backup_version'], 2)
+        self.assertEqual(load_snapshot(self.presentation), self.original)
+        self.assertTrue(Element.objects.filter(pk=self.deleted.pk).exists())
+        self.assertFalse(Frame.objects.filter(pk=self.new_frame.pk).exists())
+        self.assertEqual(Element.objects.get(pk=self.untouched.pk).updated_at, before)
+
+        # restaurarea înapoi la backup refă editările
+        restore_version(self.presentation, self.presentation.versions.get(version_number=2), self.owner)
+        self.assertEqual(self.presentation.frames.count(), 4)
+
+    def test_restore_keeps_current_thumbnails(self):
+        Frame.objects.filter(pk=self.frames[1].pk).update(thumbnail_url='/media/thumbnails/frames/new.png')
+        # Versiune salvată înainte ca thumbnail_url să fie scos din snapshot
+        stale = PresentationVersion.objects.get(pk=self.v1.pk)
+        snapshot = load_snapshot(self.presentation)
+        for row in snapshot['frames'].values():
+            row['thumbnail_url'] = '/media/thumbnails/frames/old.png'
+        stale.snapshot, stale.encoding = encode_payload(snapshot)
+        stale.is_keyframe = True
+        stale.save()
+        snapshot_cache.clear()
+
+        self.assertEqual(structural_diff(snapshot, load_snapshot(self.presentation))['frames']['changed'], {})
+        restore_version(self.presentation, stale, self.owner)
+
+        self.assertEqual(Frame.objects.get(pk=self.frames[1].pk).thumbnail_url, '/media/thumbnails/frames/new.png')
+
+    def test_restore_with_reused_id(self):
+        other = create_presentation(self.owner, title='Elsewhere')
+        Element.objects.create(
+            id=self.deleted.id, frame=other.frames.get(), element_type='TEXT', position='{}',
+            content='{}', created_at=timezone.now(), updated_at=timezone.now(),
+        )
+
+        restore_version(self.presentation, self.v1, self.owner)
+
+        restored = Element.objects.get(frame=self.frames[0], content=self.deleted.content)
+        self.assertNotEqual(restored.id, self.deleted.id)
+        self.assertEqual(Element.objects.get(pk=self.deleted.id).frame.presentation, other)
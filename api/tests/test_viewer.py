@@ -0,0 +1,61 @@
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.models import Comment, Element
+from api.viewer import document_cache, revision_cache
+
+from .utils import create_presentation
+
+
+class PublicViewerTests(TestCase):
+    def setUp(self):
+        document_cache.clear()
+        revision_cache.clear()
+        self.owner = User.objects.create_user(username='teacher', password='pass')
+        self.presentation = create_presentation(self.owner, num_frames=2, elements_per_frame=2)
+        Comment.objects.create(presentation=self.presentation, author=self.owner, text='private', position='{}',
+                               is_resolved=0, created_at=timezone.now(), updated_at=timezone.now())
+        self.client = APIClient()
+        self.url = f'/api/viewer/{self.presentation.share_token}/'
+
+    def test_anonymous_render_document(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        document = json.loads(response.content)
+        self.assertEqual(set(document), {'format', 'id', 'title', 'revision', 'canvas_settings', 'path',
+                                         'frames', 'connections'})
+        self.assertEqual(len(document['frames']), 2)
+        self.assertEqual(document['frames'][0]['elements'][0]['content']['fontSize'], 32)
+        self.assertNotIn('private', response.content.decode())
+        self.assertIn('public', response['Cache-Control'])
+
+    def test_conditional_and_cached_requests_skip_the_database(self):
+        etag = self.client.get(self.url)['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_edits_invalidate_after_ttl(self):
+        # fără TTL, fiecare cerere citește revision-ul curent
+        self.addCleanup(setattr, revision_cache, 'ttl', revision_cache.ttl)
+        revision_cache.ttl = 0
+        etag = self.client.get(self.url)['ETag']
+        element = Element.objects.filter(frame__presentation=self.presentation).first()
+        element.content = json.dumps({'text': 'Edited'})
+        element.save()
+
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Edited', response.content.decode())
+
+    def test_unknown_token(self):
+        self.assertEqual(self.client.get('/api/viewer/nope/').status_code, 404)
@@ -0,0 +1,46 @@
+import json
+import secrets
+
+from django.utils import timezone
+
+from api.models import Element, Frame, Presentation
+
+
+def create_presentation(owner, title='Deck', num_frames=1, elements_per_frame=1, **extra):
+    """Create a presentation with simple text frames for tests."""
+    now = timezone.now()
+    presentation = Presentation.objects.create(
+        title=title,
+        description=extra.pop('description', ''),
+        canvas_settings=json.dumps({'zoom': 1.0}),
+        presentation_path='[]',
+        thumbnail_url='',
+        share_token=secrets.token_urlsafe(16),
+        is_public=extra.pop('is_public', 0),
+        created_at=now,
+        updated_at=now,
+        owner=owner,
+        **extra,
+    )
+    for order in range(num_frames):
+        frame = Frame.objects.create(
+            presentation=presentation,
+            title=f'Slide {order + 1}',
+            position=json.dumps({'x': 0, 'y': 0, 'width': 1920, 'height': 1080}),
+            background_color='#ffffff',
+            background_image='',
+            order=order,
+            thumbnail_url='',
+            created_at=now,
+            updated_at=now,
+        )
+        for index in range(elements_per_frame):
+            Element.objects.create(
+                frame=frame,
+                element_type='TEXT',
+                position=json.dumps({'x': 100, 'y': 100 + index * 150, 'width': 800, 'height': 100}),
+                content=json.dumps({'text': f'{title} slide {order + 1} text {index + 1}', 'fontSize': 32}),
+                created_at=now,
+                updated_at=now,
+            )
+    return presentation
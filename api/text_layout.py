@@ -0,0 +1,121 @@
+"""
+Text layout engine shared by the PDF export and the thumbnail renderer.
+
+Words are measured once per (font, size) and lines are built from cumulative
+widths, instead of re-measuring every growing prefix of the line. Wrapped
+results are memoized by (text, font, size, width), so identical text boxes are
+laid out only once across exports.
+"""
+
+import threading
+from collections import OrderedDict
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+FONT_MAP = {
+    'Arial': 'Helvetica',
+    'Inter': 'Helvetica',
+    'Times New Roman': 'Times-Roman',
+    'Courier': 'Courier',
+    'Helvetica': 'Helvetica',
+}
+
+BOLD_FONT_MAP = {
+    'Helvetica': 'Helvetica-Bold',
+    'Times-Roman': 'Times-Bold',
+    'Courier': 'Courier-Bold',
+}
+
+
+def resolve_font(font_family, font_weight=None):
+    """Map an editor font family to one of the standard (built-in) PDF fonts."""
+    font = FONT_MAP.get(font_family, 'Helvetica')
+    if font_weight == 'bold':
+        font = BOLD_FONT_MAP.get(font, font)
+    return font
+
+
+class TextLayoutEngine:
+    """Greedy word wrapping with per-word width and per-layout caches."""
+
+    def __init__(self, measure=stringWidth, max_layouts=4096, max_words=65536):
+        self.measure = measure
+        self.max_layouts = max_layouts
+        self.max_words = max_words
+        self._layouts = OrderedDict()
+        self._word_widths = {}
+        self._lock = threading.Lock()
+
+    def word_width(self, word, font, size):
+        """Width of a single word, measured at most once per (font, size)."""
+        widths = self._word_widths.get((font, size))
+        if widths is None:
+            widths = self._word_widths.setdefault((font, size), {})
+        width = widths.get(word)
+        if width is None:
+            width = self.measure(word, font, size)
+            if len(widths) < self.max_words:
+                widths[word] = width
+        return width
+
+    def wrap(self, text, font, size, max_width):
+        """
+        Split text into lines no wider than max_width.
+
+        A word wider than max_width is kept on a line of its own.
+
+        Returns:
+            tuple of line strings
+        """
+        key = (text, font, size, max_width)
+        with self._lock:
+            lines = self._layouts.get(key)
+            if lines is not None:
+                self._layouts.move_to_end(key)
+                return lines
+
+        lines = self._layout(text, font, size, max_width)
+
+        with self._lock:
+            self._layouts[key] = lines
+            if len(self._layouts) > self.max_layouts:
+                self._layouts.popitem(last=False)
+        return lines
+
+    def _layout(self, text, font, size, max_width):
+        space = self.word_width(' ', font, size)
+        lines = []
+        current = []
+        current_width = 0.0
+
+        for word in text.split():
+            width = self.word_width(word, font, size)
+            # Fonturile standard nu au kerning, deci lățimea liniei e aditivă
+            line_width = current_width + space + width if current else width
+
+            if line_width <= max_width:
+                current.append(word)
+                current_width = line_width
+            elif current:
+                lines.append(' '.join(current))
+                current = [word]
+                current_width = width
+            else:
+                lines.append(word)
+
+        if current:
+            lines.append(' '.join(current))
+        return tuple(lines)
+
+    def clear(self):
+        with self._lock:
+            self._layouts.clear()
+            self._word_widths.clear()
+
+
+_default_engine = TextLayoutEngine()
+
+
+def get_text_layout_engine():
+    """Process-wide engine, so the caches are shared between exports."""
+    return _default_engine
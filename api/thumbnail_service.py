@@ -0,0 +1,191 @@
+"""
+Thumbnail Service for rendering low-resolution frame previews.
+
+Frames are rendered from their elements with Pillow and stored on local disk
+under MEDIA_ROOT. Each file name carries a fingerprint of the frame content,
+so only frames that changed since the last run are rendered again.
+"""
+
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageDraw, ImageFont
+
+from .export_service import PresentationExportService, frame_to_pdf_spec
+from .models import Frame, Presentation
+from .text_layout import get_text_layout_engine, resolve_font
+
+logger = logging.getLogger(__name__)
+
+SOURCE_WIDTH = 1920
+SOURCE_HEIGHT = 1080
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = set()
+
+
+def _thumbnail_root():
+    return Path(settings.MEDIA_ROOT) / settings.THUMBNAIL_DIR
+
+
+def _thumbnail_url(relative_path):
+    return f"{settings.MEDIA_URL}{settings.THUMBNAIL_DIR}/{relative_path}"
+
+
+def frame_fingerprint(frame, elements=()):
+    """
+    Short hash identifying the rendered state of a frame.
+
+    Covers the frame's updated_at, the latest element updated_at and the set
+    of element ids, so deleting any element (not only the newest) changes it.
+    """
+    stamps = [frame.updated_at.isoformat() if frame.updated_at else '']
+    elements_updated_at = max((element.updated_at for element in elements if element.updated_at), default=None)
+    if elements_updated_at:
+        stamps.append(elements_updated_at.isoformat())
+    stamps.append(','.join(str(element_id) for element_id in sorted(element.id for element in elements)))
+    raw = f"{frame.id}:{'|'.join(stamps)}:{settings.THUMBNAIL_WIDTH}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:12]
+
+
+def render_frame_thumbnail(spec, width=None):
+    """Render a frame spec (see frame_to_pdf_spec) to a small RGB image."""
+    width = width or settings.THUMBNAIL_WIDTH
+    height = round(width * SOURCE_HEIGHT / SOURCE_WIDTH)
+    scale = width / SOURCE_WIDTH
+
+    hex_to_rgb = PresentationExportService._hex_to_rgb
+    image = Image.new('RGB', (width, height), hex_to_rgb(spec['background_color']))
+    draw = ImageDraw.Draw(image)
+
+    for element in spec['elements']:
+        position = element['position']
+        content = element['content'] or {}
+        x = position.get('x', 0) * scale
+        y = position.get('y', 0) * scale
+        box_width = position.get('width', 0) * scale
+        box_height = position.get('height', 0) * scale
+
+        if element['type'] == 'SHAPE':
+            box = [x, y, x + box_width, y + box_height]
+            fill = hex_to_rgb(content.get('fill', '#818cf8'))
+            outline = hex_to_rgb(content.get('stroke', '#6366f1'))
+            if content.get('shape') == 'circle':
+                draw.ellipse(box, fill=fill, outline=outline)
+            else:
+                draw.rectangle(box, fill=fill, outline=outline)
+            continue
+
+        text = content.get('text', '')
+        if not text:
+            continue
+        font_size = max(4, round(content.get('fontSize', 24) * scale))
+        font = ImageFont.load_default(size=font_size)
+        color = hex_to_rgb(content.get('color', '#000000'))
+
+        # Liniile sunt calculate cu aceleași metrici ca exportul PDF
+        layout_font = resolve_font(content.get('fontFamily', 'Helvetica'), content.get('fontWeight'))
+        lines = get_text_layout_engine().wrap(text, layout_font, font_size, box_width)
+
+        line_height = font_size * 1.2
+        for index, line in enumerate(lines):
+            line_y = y + index * line_height
+            if line_y > height:
+                break
+            draw.text((x, line_y), line, fill=color, font=font)
+
+    return image
+
+
+def generate_presentation_thumbnails(presentation_id, force=False):
+    """
+    Render thumbnails for the frames of a presentation whose content changed.
+
+    Returns the number of frames rendered.
+    """
+    frames = list(
+        Frame.objects.filter(presentation_id=presentation_id)
+        .prefetch_related('elements')
+        .order_by('order')
+    )
+    root = _thumbnail_root() / 'frames'
+    root.mkdir(parents=True, exist_ok=True)
+
+    rendered = 0
+    for frame in frames:
+        fingerprint = frame_fingerprint(frame, frame.elements.all())
+        relative_path = f"frames/{frame.id}-{fingerprint}.png"
+        url = _thumbnail_url(relative_path)
+        target = root / f"{frame.id}-{fingerprint}.png"
+
+        if not force and frame.thumbnail_url == url and target.exists():
+            continue
+
+        image = render_frame_thumbnail(frame_to_pdf_spec(frame))
+        image.save(target, format='PNG', optimize=True)
+
+        # Șterge preview-urile vechi ale frame-ului
+        for stale in root.glob(f"{frame.id}-*.png"):
+            if stale != target:
+                stale.unlink(missing_ok=True)
+
+        # update() nu modifică updated_at, deci nu invalidează fingerprint-ul
+        Frame.objects.filter(pk=frame.pk).update(thumbnail_url=url)
+        frame.thumbnail_url = url
+        rendered += 1
+
+    # Preview-urile nu sunt conținut: fără bump_revision, altfel fiecare randare
+    # ar marca prezentarea ca modificată (versiuni, sync, ETag)
+    cover_url = frames[0].thumbnail_url if frames else ''
+    Presentation.objects.filter(pk=presentation_id).exclude(
+        thumbnail_url=cover_url
+    ).update(thumbnail_url=cover_url)
+
+    return rendered
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.THUMBNAIL_WORKERS,
+                thread_name_prefix='thumbnails',
+            )
+        return _executor
+
+
+def _run_in_background(presentation_id):
+    with _executor_lock:
+        _pending.discard(presentation_id)
+    close_old_connections()
+    try:
+        generate_presentation_thumbnails(presentation_id)
+    except Exception:
+        logger.exception("Thumbnail generation failed for presentation %s", presentation_id)
+    finally:
+        close_old_connections()
+
+
+def schedule_thumbnails(presentation_id):
+    """
+    Queue thumbnail regeneration for a presentation once the current
+    transaction commits. Repeated calls while a job is pending are merged.
+    """
+    if not presentation_id or not settings.THUMBNAILS_ENABLED:
+        return
+
+    def submit():
+        with _executor_lock:
+            if presentation_id in _pending:
+                return
+            _pending.add(presentation_id)
+        _get_executor().submit(_run_in_background, presentation_id)
+
+    transaction.on_commit(submit)
@@ -0,0 +1,71 @@
+"""
+DeletedRecord tombstones for incremental sync (see api/sync.py).
+
+The post_delete handlers in api/signals.py call record_deletion() once per
+deleted row. Elements and connections only know their frame, so the owning
+presentation is resolved with frame_presentation_id(), preferring the frame
+already loaded on the instance.
+
+Inside coalesce_deletions() the tombstones are collected and inserted with
+one bulk_create when the block exits, and each frame's presentation is
+looked up once, so deleting N rows costs one INSERT instead of N INSERTs
+and N SELECTs.
+"""
+
+import threading
+from contextlib import contextmanager
+
+from .materializers import BULK_BATCH_SIZE
+from .models import DeletedRecord, Frame
+
+_state = threading.local()
+
+
+def _pending():
+    return getattr(_state, 'pending', None)
+
+
+def record_deletion(presentation_id, kind, object_id):
+    if presentation_id is None:
+        return
+    record = DeletedRecord(presentation_id=presentation_id, kind=kind, object_id=object_id)
+    pending = _pending()
+    if pending is not None:
+        pending[0].append(record)
+    else:
+        record.save()
+
+
+def frame_presentation_id(instance, field_name):
+    """presentation_id of the frame `instance` points to through field_name."""
+    field = instance._meta.get_field(field_name)
+    # Frame-ul deja încărcat (ex. perform_destroy) nu mai costă un SELECT
+    if field.is_cached(instance):
+        frame = getattr(instance, field_name)
+        return frame.presentation_id if frame is not None else None
+
+    frame_id = getattr(instance, field.attname)
+    pending = _pending()
+    if pending is not None and frame_id in pending[1]:
+        return pending[1][frame_id]
+    presentation_id = Frame.objects.filter(pk=frame_id).values_list('presentation_id', flat=True).first()
+    if pending is not None:
+        pending[1][frame_id] = presentation_id
+    return presentation_id
+
+
+@contextmanager
+def coalesce_deletions():
+    """Collect the tombstones recorded inside the block and insert them at once."""
+    if _pending() is not None:
+        # Imbricat: blocul exterior scrie tombstone-urile
+        yield
+        return
+    _state.pending = ([], {})
+    try:
+        yield
+        records = _state.pending[0]
+    finally:
+        _state.pending = None
+
+    DeletedRecord.objects.bulk_create(records, batch_size=BULK_BATCH_SIZE)
@@ -2,6 +2,7 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
 from . import views
+from .instrumentation import metrics_view
 from .management_views import (
     ManagementUserViewSet,
     StudentGroupViewSet,
@@ -25,6 +26,8 @@ urlpatterns = [
     path('register/', views.register, name='register'),
     path('user/', views.get_user, name='get_user'),
     path('roles/', views.list_roles, name='list_roles'),
+    # Metrici Prometheus (doar local)
+    path('metrics/', metrics_view, name='metrics'),
     # Management endpoints
     path('', include(router.urls)),
     # Presentation endpoints (mounted at root level to match /api/presentations/)
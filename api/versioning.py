@@ -0,0 +1,526 @@
+"""
+Delta-encoded presentation versions.
+
+A PresentationVersion stores either a full snapshot (keyframe) or a JSON diff
+against the previous version of the same presentation. A keyframe is written
+every VERSION_KEYFRAME_INTERVAL versions, or whenever the diff would not be
+smaller than the snapshot, so reconstructing any version applies a bounded
+number of diffs. Payloads above VERSION_COMPRESS_MIN_BYTES are stored zlib
+compressed (base64 text). Reconstructed snapshots are kept in a small LRU.
+Deleting versions (retention, see api/autosave.py) re-encodes the survivors
+whose diff base went away. structural_diff() compares two snapshots row by
+row and restore_version() writes back only the rows that differ.
+
+Snapshots come from load_snapshot(), which reads only the editable content
+(presentation fields, frames, elements, connections) with one query per
+table, keyed by id so diffs line up row by row:
+
+    {
+        "format": 2,
+        "presentation": {"title": ..., "canvas_settings": "...", ...},
+        "frames": {"<id>": {"title": ..., "order": 0, ...}},
+        "elements": {"<id>": {"frame_id": 12, "element_type": "TEXT", ...}},
+        "connections": {"<id>": {"from_frame_id": 12, "to_frame_id": 13, "label": ""}}
+    }
+
+JSON-as-text columns are kept as the stored strings.
+"""
+
+import base64
+import copy
+import json
+import threading
+import zlib
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .materializers import BULK_BATCH_SIZE, bulk_create_returning
+from .models import Comment, Element, Frame, FrameConnection, Presentation, PresentationVersion
+from .revisions import bump_revision, coalesce_revision_bumps
+from .tombstones import coalesce_deletions
+
+SNAPSHOT_FORMAT = 2
+
+ENCODING_JSON = 'json'
+ENCODING_ZLIB = 'zlib'
+
+PRESENTATION_FIELDS = ('title', 'description', 'canvas_settings', 'presentation_path')
+# thumbnail_url nu e conținut: preview-urile se regenerează după restore
+FRAME_FIELDS = (
+    'title', 'position', 'background_color', 'background_image',
+    'order', 'transition_settings',
+)
+ELEMENT_FIELDS = (
+    'frame_id', 'element_type', 'position', 'content', 'animation_settings', 'link_url',
+)
+CONNECTION_FIELDS = ('from_frame_id', 'to_frame_id', 'label')
+
+
+# ----- snapshot -----
+def _rows_by_id(queryset, fields):
+    return {str(row.pop('id')): row for row in queryset.values('id', *fields)}
+
+
+def load_snapshot(presentation):
+    """Editable content of a presentation, without serializers (4 queries)."""
+    frames = _rows_by_id(
+        Frame.objects.filter(presentation=presentation).order_by('order', 'id'), FRAME_FIELDS
+    )
+    frame_ids = [int(frame_id) for frame_id in frames]
+    return {
+        'format': SNAPSHOT_FORMAT,
+        'presentation': {field: getattr(presentation, field) for field in PRESENTATION_FIELDS},
+        'frames': frames,
+        'elements': _rows_by_id(
+            Element.objects.filter(frame_id__in=frame_ids).order_by('id'), ELEMENT_FIELDS
+        ),
+        'connections': _rows_by_id(
+            FrameConnection.objects.filter(from_frame_id__in=frame_ids).order_by('id'),
+            CONNECTION_FIELDS,
+        ),
+    }
+
+
+# ----- diffs -----
+def diff_json(old, new):
+    """
+    Diff between two JSON objects (dicts), or None when they are equal.
+
+    {"set": {key: value}, "del": [key], "sub": {key: <nested diff>}}; nested
+    diffs are only used when both sides are objects.
+    """
+    changed, nested = {}, {}
+    for key, value in new.items():
+        if key not in old:
+            changed[key] = value
+            continue
+        previous = old[key]
+        if previous == value:
+            continue
+        if isinstance(previous, dict) and isinstance(value, dict):
+            nested[key] = diff_json(previous, value)
+        else:
+            changed[key] = value
+    removed = [key for key in old if key not in new]
+
+    diff = {}
+    if changed:
+        diff['set'] = changed
+    if removed:
+        diff['del'] = removed
+    if nested:
+        diff['sub'] = nested
+    return diff or None
+
+
+def apply_diff(base, diff):
+    """Return base with diff applied; base itself is not modified."""
+    if not diff:
+        return base
+    result = dict(base)
+    for key in diff.get('del', ()):
+        result.pop(key, None)
+    for key, value in diff.get('set', {}).items():
+        result[key] = copy.deepcopy(value)
+    for key, nested in diff.get('sub', {}).items():
+        result[key] = apply_diff(result.get(key) or {}, nested)
+    return result
+
+
+# ----- encoding -----
+def encode_payload(data):
+    """(text, encoding) for a snapshot or diff."""
+    text = json.dumps(data, separators=(',', ':'))
+    if settings.VERSION_COMPRESS and len(text) >= settings.VERSION_COMPRESS_MIN_BYTES:
+        packed = base64.b64encode(zlib.compress(text.encode('utf-8'))).decode('ascii')
+        if len(packed) < len(text):
+            return packed, ENCODING_ZLIB
+    return text, ENCODING_JSON
+
+
+def decode_payload(text, encoding):
+    if encoding == ENCODING_ZLIB:
+        text = zlib.decompress(base64.b64decode(text)).decode('utf-8')
+    return json.loads(text or '{}')
+
+
+# ----- reconstruction -----
+class _SnapshotCache:
+    """LRU of reconstructed snapshots, keyed by version id."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, version_id):
+        with self._lock:
+            snapshot = self._entries.get(version_id)
+            if snapshot is not None:
+                self._entries.move_to_end(version_id)
+            return snapshot
+
+    def set(self, version_id, snapshot):
+        with self._lock:
+            self._entries[version_id] = snapshot
+            self._entries.move_to_end(version_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, version_id):
+        with self._lock:
+            self._entries.pop(version_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+snapshot_cache = _SnapshotCache(settings.VERSION_CACHE_MAX_ENTRIES)
+
+
+def _version_chain(presentation_id, version_number):
+    """The latest keyframe at or before version_number and the versions after it."""
+    versions = PresentationVersion.objects.filter(presentation_id=presentation_id)
+    keyframe_number = (
+        versions.filter(is_keyframe=True, version_number__lte=version_number)
+        .aggregate(number=Max('version_number'))['number']
+    )
+    if keyframe_number is None:
+        raise PresentationVersion.DoesNotExist(
+            f"No keyframe for version {version_number} of presentation {presentation_id}"
+        )
+    return list(
+        versions.filter(version_number__gte=keyframe_number, version_number__lte=version_number)
+        .only('id', 'version_number', 'is_keyframe', 'encoding', 'snapshot')
+        .order_by('version_number')
+    )
+
+
+def reconstruct(version):
+    """Full snapshot of a version (cached; treat it as read-only)."""
+    snapshot = snapshot_cache.get(version.id)
+    if snapshot is not None:
+        return snapshot
+
+    chain = _version_chain(version.presentation_id, version.version_number)
+    # Pornește de la cea mai recentă versiune din lanț aflată deja în cache
+    start = 0
+    snapshot = None
+    for index in range(len(chain) - 1, -1, -1):
+        cached = snapshot_cache.get(chain[index].id)
+        if cached is not None:
+            snapshot, start = cached, index + 1
+            break
+
+    for item in chain[start:]:
+        payload = decode_payload(item.snapshot, item.encoding)
+        snapshot = payload if item.is_keyframe else apply_diff(snapshot, payload)
+        snapshot_cache.set(item.id, snapshot)
+    return snapshot
+
+
+# ----- writing -----
+def encode_version(previous_snapshot, snapshot, keyframe=False):
+    """
+    (text, encoding, is_keyframe) for snapshot stored after previous_snapshot.
+
+    A diff is stored unless a keyframe is requested, there is no usable base
+    (none, or an old full-serializer snapshot), or the diff is not smaller.
+    """
+    full_text, full_encoding = encode_payload(snapshot)
+    if keyframe or not previous_snapshot or previous_snapshot.get('format') != SNAPSHOT_FORMAT:
+        return full_text, full_encoding, True
+
+    text, encoding = encode_payload(diff_json(previous_snapshot, snapshot) or {})
+    if len(full_text) <= len(text):
+        return full_text, full_encoding, True
+    return text, encoding, False
+
+
+def create_version(presentation, user, notes='', autosave=False, skip_unchanged=False):
+    """
+    Snapshot the presentation's current content as its next version.
+
+    The presentation row is locked while the number is allocated, so
+    concurrent calls get consecutive numbers (the unique constraint on
+    (presentation, version_number) is the backstop). With skip_unchanged,
+    returns None when nothing changed since the previous version.
+
+    The version records the presentation's revision; when the content is
+    unchanged the previous version is moved to the current revision instead,
+    so autosave does not look at the presentation again.
+    """
+    with transaction.atomic():
+        revision = (
+            Presentation.objects.select_for_update().filter(pk=presentation.pk)
+            .values_list('revision', flat=True).first()
+        )
+        snapshot = load_snapshot(presentation)
+
+        previous = presentation.versions.order_by('-version_number').first()
+        next_number = (previous.version_number + 1) if previous else 1
+        previous_snapshot = reconstruct(previous) if previous else None
+        if skip_unchanged and previous_snapshot == snapshot:
+            PresentationVersion.objects.filter(pk=previous.pk).update(revision=revision)
+            return None
+
+        text, encoding, is_keyframe = encode_version(
+            previous_snapshot, snapshot,
+            keyframe=not (next_number - 1) % settings.VERSION_KEYFRAME_INTERVAL,
+        )
+        version = PresentationVersion.objects.create(
+            presentation=presentation,
+            version_number=next_number,
+            snapshot=text,
+            encoding=encoding,
+            is_keyframe=is_keyframe,
+            is_autosave=autosave,
+            revision=revision or 0,
+            created_by=user,
+            created_at=timezone.now(),
+            notes=notes or '',
+        )
+    snapshot_cache.set(version.id, snapshot)
+    return version
+
+
+def delete_versions(presentation, version_ids):
+    """
+    Delete versions, re-encoding the survivors whose base disappeared.
+
+    Every version is rebuilt once in memory from the first keyframe; a
+    surviving diff that followed a deleted version is stored again against
+    its new predecessor (or as a keyframe when the interval is reached).
+    """
+    version_ids = set(version_ids)
+    if not version_ids:
+        return 0
+
+    with transaction.atomic():
+        Presentation.objects.select_for_update().filter(pk=presentation.pk).values_list('pk').first()
+        versions = list(
+            presentation.versions.only('id', 'version_number', 'is_keyframe', 'encoding', 'snapshot')
+            .order_by('version_number')
+        )
+
+        rewritten = []
+        snapshot = None
+        previous_snapshot = None
+        base_deleted = False
+        since_keyframe = 0
+        for version in versions:
+            payload = decode_payload(version.snapshot, version.encoding)
+            snapshot = payload if version.is_keyframe else apply_diff(snapshot, payload)
+            if version.id in version_ids:
+                base_deleted = True
+                continue
+
+            if base_deleted and not version.is_keyframe:
+                version.snapshot, version.encoding, version.is_keyframe = encode_version(
+                    previous_snapshot, snapshot,
+                    keyframe=since_keyframe + 1 >= settings.VERSION_KEYFRAME_INTERVAL,
+                )
+                rewritten.append(version)
+            since_keyframe = 0 if version.is_keyframe else since_keyframe + 1
+            previous_snapshot = snapshot
+            base_deleted = False
+
+        PresentationVersion.objects.bulk_update(rewritten, ['snapshot', 'encoding', 'is_keyframe'])
+        deleted, _ = presentation.versions.filter(id__in=version_ids).delete()
+
+    # Conținutul versiunilor rămase nu se schimbă, doar forma stocată
+    for version_id in version_ids:
+        snapshot_cache.discard(version_id)
+    return deleted
+
+
+# ----- diff & restore -----
+SECTIONS = ('frames', 'elements', 'connections')
+SECTION_FIELDS = {'frames': FRAME_FIELDS, 'elements': ELEMENT_FIELDS, 'connections': CONNECTION_FIELDS}
+
+
+class VersionFormatError(ValueError):
+    """The version predates row-keyed snapshots and cannot be diffed or restored."""
+
+
+def _require_format(snapshot):
+    if not isinstance(snapshot, dict) or snapshot.get('format') != SNAPSHOT_FORMAT:
+        raise VersionFormatError("This version was stored in an older format and cannot be compared")
+    return snapshot
+
+
+def _field_changes(old_row, new_row):
+    return {
+        field: {'from': old_row.get(field), 'to': value}
+        for field, value in new_row.items()
+        if old_row.get(field) != value
+    }
+
+
+def _only_fields(rows, fields):
+    return {row_id: {field: row[field] for field in fields if field in row} for row_id, row in rows.items()}
+
+
+def structural_diff(old, new):
+    """
+    Row-level diff between two snapshots, keyed by id:
+
+        {"presentation": {field: {"from", "to"}},
+         "frames": {"added": [{"id": 1, ...}], "removed": [2], "changed": {"3": {field: {"from", "to"}}}},
+         "elements": {...}, "connections": {...}}
+    """
+    _require_format(old)
+    _require_format(new)
+    diff = {'presentation': _field_changes(old['presentation'], new['presentation'])}
+    for section in SECTIONS:
+        # Versiunile mai vechi pot avea câmpuri scoase între timp (ex. thumbnail_url)
+        old_rows = _only_fields(old[section], SECTION_FIELDS[section])
+        new_rows = _only_fields(new[section], SECTION_FIELDS[section])
+        changed = {}
+        for row_id, row in new_rows.items():
+            if row_id in old_rows and old_rows[row_id] != row:
+                changed[row_id] = _field_changes(old_rows[row_id], row)
+        diff[section] = {
+            'added': [{'id': int(row_id), **row} for row_id, row in new_rows.items() if row_id not in old_rows],
+            'removed': [int(row_id) for row_id in old_rows if row_id not in new_rows],
+            'changed': changed,
+        }
+    return diff
+
+
+def summarize_diff(diff):
+    summary = {'presentation': sorted(diff['presentation'])}
+    for section in SECTIONS:
+        summary[section] = {kind: len(diff[section][kind]) for kind in ('added', 'removed', 'changed')}
+    return summary
+
+
+def _bulk_update_changed(model, changes, target_rows, id_map=None, remap=None, now=None):
+    """bulk_update only the changed rows, and only the fields that changed (plus updated_at)."""
+    if not changes:
+        return
+    fields = sorted({field for row_changes in changes.values() for field in row_changes})
+    objs = []
+    for row_id in changes:
+        row = dict(target_rows[row_id])
+        if remap:
+            remap(row)
+        objs.append(model(id=int(row_id), updated_at=now or timezone.now(), **row))
+    # Câmpurile FK se actualizează prin numele relației (frame, nu frame_id)
+    update_fields = [field[:-3] if field.endswith('_id') else field for field in fields]
+    # updated_at nou: rândurile restaurate apar în sync-ul incremental (api/sync.py)
+    update_fields.append('updated_at')
+    model.objects.bulk_update(objs, update_fields, batch_size=BULK_BATCH_SIZE)
+
+
+def _insert_rows(model, rows, build, scope):
+    """
+    Insert rows keeping their original ids when those are still free.
+
+    Returns {original id: new id} for the rows whose id is taken by another row.
+    """
+    if not rows:
+        return {}
+    taken = set(model.objects.filter(id__in=[row['id'] for row in rows]).values_list('id', flat=True))
+    kept = [build(row, row['id']) for row in rows if row['id'] not in taken]
+    moved_rows = [row for row in rows if row['id'] in taken]
+    moved = [build(row, None) for row in moved_rows]
+    bulk_create_returning(model, moved, scope)
+    model.objects.bulk_create(kept, batch_size=BULK_BATCH_SIZE)
+    return {row['id']: obj.id for row, obj in zip(moved_rows, moved)}
+
+
+def restore_version(presentation, version, user):
+    """
+    Make the presentation's content match a version, in one transaction.
+
+    The current content is saved as a new version first (unless it is
+    identical to the latest one). Only rows that differ are written: missing
+    rows are re-inserted (with their original ids when free), changed rows
+    are bulk-updated on the changed fields, extra rows are deleted.
+    """
+    target = _require_format(reconstruct(version))
+    now = timezone.now()
+
+    # Ștergerile trimit câte un semnal per rând; bump-urile devin un singur UPDATE,
+    # tombstone-urile un singur INSERT
+    with transaction.atomic(), coalesce_revision_bumps(), coalesce_deletions():
+        backup = create_version(
+            presentation, user, notes=f'Before restoring v{version.version_number}', skip_unchanged=True
+        )
+        current = load_snapshot(presentation)
+        diff = structural_diff(current, target)
+
+        # 1. Șterge ce nu există în versiune (comentariile rămân, fără legătură)
+        removed_frames = diff['frames']['removed']
+        removed_elements = diff['elements']['removed']
+        Comment.objects.filter(element_id__in=removed_elements).update(element=None, updated_at=now)
+        Comment.objects.filter(frame_id__in=removed_frames).update(frame=None, updated_at=now)
+        FrameConnection.objects.filter(id__in=diff['connections']['removed']).delete()
+        Element.objects.filter(id__in=removed_elements).delete()
+        Frame.objects.filter(id__in=removed_frames).delete()
+
+        # 2. Frames
+        frame_map = _insert_rows(
+            Frame, diff['frames']['added'],
+            lambda row, row_id: Frame(
+                id=row_id, presentation_id=presentation.id, created_at=now, updated_at=now,
+                **{field: row[field] for field in FRAME_FIELDS},
+            ),
+            {'presentation_id': presentation.id},
+        )
+        _bulk_update_changed(Frame, diff['frames']['changed'], target['frames'], now=now)
+
+        def remap_frames(row):
+            for field in ('frame_id', 'from_frame_id', 'to_frame_id'):
+                if field in row:
+                    row[field] = frame_map.get(row[field], row[field])
+
+        # 3. Elements și conexiuni, cu frame ids remapate
+        for row in diff['elements']['added'] + diff['connections']['added']:
+            remap_frames(row)
+        _insert_rows(
+            Element, diff['elements']['added'],
+            lambda row, row_id: Element(
+                id=row_id, created_at=now, updated_at=now,
+                **{field: row[field] for field in ELEMENT_FIELDS},
+            ),
+            {'frame_id__in': [row['frame_id'] for row in diff['elements']['added']]},
+        )
+        _bulk_update_changed(Element, diff['elements']['changed'], target['elements'], remap=remap_frames, now=now)
+        _insert_rows(
+            FrameConnection, diff['connections']['added'],
+            lambda row, row_id: FrameConnection(
+                id=row_id, **{field: row[field] for field in CONNECTION_FIELDS}
+            ),
+            {'from_frame_id__in': [row['from_frame_id'] for row in diff['connections']['added']]},
+        )
+        _bulk_update_changed(
+            FrameConnection, diff['connections']['changed'], target['connections'], remap=remap_frames, now=now
+        )
+
+        # 4. Câmpurile prezentării (traseul remapat dacă unele frames au primit id nou)
+        fields = {field: target['presentation'][field] for field in diff['presentation']}
+        if frame_map:
+            try:
+                path = json.loads(target['presentation']['presentation_path'] or '[]')
+            except ValueError:
+                path = []
+            fields['presentation_path'] = json.dumps([frame_map.get(frame_id, frame_id) for frame_id in path])
+        if fields or any(diff[section][kind] for section in SECTIONS for kind in ('added', 'removed', 'changed')):
+            Presentation.objects.filter(pk=presentation.pk).update(updated_at=now, **fields)
+            bump_revision([presentation.id])
+            for field, value in fields.items():
+                setattr(presentation, field, value)
+            presentation.updated_at = now
+
+    return {
+        'restored_version': version.version_number,
+        'backup_version': backup.version_number if backup else None,
+        'changes': summarize_diff(diff),
+    }
@@ -0,0 +1,151 @@
+"""
+Public viewer for share links.
+
+    GET /api/viewer/<share_token>/
+
+Serves a minimal, read-only render document (frames, elements, connections,
+path, transitions; no comments, access grants or owner details) to anyone
+holding the share token, without authentication. The document is compiled
+to JSON bytes once per (token, revision) and kept in an in-process LRU.
+
+Resolving a token to its current revision is the only database read, and
+its result is reused for VIEWER_REVISION_TTL seconds, so a viewer may see an
+edit that much later. Responses carry a strong ETag and Last-Modified; a
+matching If-None-Match is answered with 304 before any document work.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .models import Element, Frame, FrameConnection, Presentation
+from .presentation_cache import revision_last_modified
+
+DOCUMENT_FORMAT = 1
+
+FRAME_FIELDS = ('id', 'title', 'position', 'background_color', 'background_image', 'order',
+                'thumbnail_url', 'transition_settings')
+ELEMENT_FIELDS = ('id', 'frame_id', 'element_type', 'position', 'content', 'animation_settings', 'link_url')
+JSON_FIELDS = ('position', 'content', 'animation_settings', 'transition_settings')
+
+
+class _LRU:
+    """Thread-safe LRU; entries older than `ttl` seconds are dropped (ttl=None: no expiry)."""
+
+    def __init__(self, max_entries, ttl=None, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if self.ttl is not None and self.clock() - stored_at >= self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (self.clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+document_cache = _LRU(settings.VIEWER_CACHE_MAX_ENTRIES)
+revision_cache = _LRU(settings.VIEWER_CACHE_MAX_ENTRIES * 4, ttl=settings.VIEWER_REVISION_TTL)
+
+
+def _parse(raw, default):
+    try:
+        return json.loads(raw) if raw else default
+    except (TypeError, ValueError):
+        return default
+
+
+def _row(values):
+    return {key: _parse(value, {}) if key in JSON_FIELDS else value for key, value in values.items()}
+
+
+def build_render_document(presentation):
+    """The viewer document of a presentation (3 queries)."""
+    frames = [_row(frame) for frame in
+              Frame.objects.filter(presentation=presentation).order_by('order', 'id').values(*FRAME_FIELDS)]
+    by_id = {frame['id']: frame for frame in frames}
+    for frame in frames:
+        frame['elements'] = []
+    for element in Element.objects.filter(frame_id__in=by_id).order_by('id').values(*ELEMENT_FIELDS):
+        by_id[element.pop('frame_id')]['elements'].append(_row(element))
+
+    return {
+        'format': DOCUMENT_FORMAT,
+        'id': presentation.id,
+        'title': presentation.title,
+        'revision': presentation.revision,
+        'canvas_settings': _parse(presentation.canvas_settings, {}),
+        'path': _parse(presentation.presentation_path, []),
+        'frames': frames,
+        'connections': list(
+            FrameConnection.objects.filter(from_frame_id__in=by_id).order_by('id')
+            .values('from_frame_id', 'to_frame_id', 'label')
+        ),
+    }
+
+
+def _lookup(token):
+    presentation = revision_cache.get(token)
+    if presentation is None:
+        presentation = (
+            Presentation.objects.filter(share_token=token)
+            .only('id', 'title', 'canvas_settings', 'presentation_path', 'revision', 'updated_at')
+            .first()
+        )
+        if presentation is not None:
+            revision_cache.set(token, presentation)
+    return presentation
+
+
+def viewer_response(request, token):
+    """HttpResponse with the render document for a share token (404 when unknown)."""
+    presentation = _lookup(token) if token else None
+    if presentation is None:
+        return HttpResponse(json.dumps({'error': 'Presentation not found'}), status=404,
+                            content_type='application/json')
+
+    etag = f'"{presentation.id}-{presentation.revision}"'
+    last_modified = revision_last_modified(presentation)
+    last_modified_ts = int(last_modified.timestamp()) if last_modified else None
+
+    # Ca în presentation_cache: If-Modified-Since are rezoluție de o secundă, doar ETag-ul validează
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        key = (token, presentation.revision)
+        body = document_cache.get(key)
+        if body is None:
+            body = json.dumps(build_render_document(presentation), separators=(',', ':')).encode()
+            document_cache.set(key, body)
+        response = HttpResponse(body, content_type='application/json')
+
+    response['ETag'] = etag
+    if last_modified_ts is not None:
+        response['Last-Modified'] = http_date(last_modified_ts)
+    # Același document pentru toți; cache-urile intermediare revalidează cu ETag
+    patch_cache_control(response, public=True, no_cache=True)
+    return response
@@ -2,6 +2,7 @@
 
 import { useCallback, useEffect, useMemo, useState, type MouseEvent } from 'react';
 import { getStoredToken } from '@/lib/authToken';
+import { readJobResponse } from '@/lib/jobs';
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL ?? 'http://127.0.0.1:8000/api';
 
@@ -85,7 +86,9 @@ export default function AIGenerateDialog({ open, onOpenChange, onSuccess }: AIGe
         throw new Error(data.error || 'Failed to generate presentation.');
       }
 
-      const data = await response.json();
+      const data = await readJobResponse(response, token, (job) => {
+        if (job.progress_message) setStatus(job.progress_message);
+      });
       setStatus('Presentation ready. Opening it now.');
       onOpenChange(false);
       onSuccess(data.presentation_id);
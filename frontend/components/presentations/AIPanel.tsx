@@ -6,6 +6,7 @@ import { Sparkles, Loader2, Lightbulb, CheckCircle, AlertCircle } from 'lucide-r
 import { usePresentation } from '@/contexts/PresentationContext';
 import { getStoredToken } from '@/lib/authToken';
 import { API_BASE_URL } from '@/lib/api';
+import { readJobResponse } from '@/lib/jobs';
 
 export default function AIPanel() {
   const { presentation, createElement, selectedFrame, canEdit } = usePresentation();
@@ -58,7 +59,7 @@ export default function AIPanel() {
       });
 
       if (response.ok) {
-        const data = await response.json();
+        const data = await readJobResponse(response, token);
         setAdvice(data);
       } else {
         const error = await response.json();
@@ -98,7 +99,7 @@ export default function AIPanel() {
       });
 
       if (response.ok) {
-        const data = await response.json();
+        const data = await readJobResponse(response, token);
         setRewrittenText(data.rewritten);
       } else {
         const error = await response.json();
@@ -136,7 +137,7 @@ export default function AIPanel() {
       });
 
       if (response.ok) {
-        const data = await response.json();
+        const data = await readJobResponse(response, token);
         setSuggestions(data.suggestions);
       } else {
         const error = await response.json();
@@ -21,6 +21,7 @@ import {
 import { usePresentation } from '@/contexts/PresentationContext';
 import { getStoredToken } from '@/lib/authToken';
 import { API_BASE_URL } from '@/lib/api';
+import { readJobResponse } from '@/lib/jobs';
 
 const primaryButton =
   'rounded-full bg-gradient-to-r from-indigo-500 via-purple-500 to-pink-500 px-5 py-2 text-sm font-semibold text-white shadow-lg shadow-indigo-500/30 transition hover:scale-[1.01] hover:shadow-indigo-500/50';
@@ -251,7 +252,7 @@ export default function Toolbar({ onOpenShare }: ToolbarProps) {
         throw new Error(error.error || 'Unable to generate game');
       }
 
-      await response.json();
+      await readJobResponse(response, token);
       Swal.fire({
         icon: 'success',
         title: 'Game ready!',
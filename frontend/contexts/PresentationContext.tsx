@@ -433,6 +433,15 @@ const mergeElementData = (element: Element, changes: Partial<Element>): Element
         }
         break;
 
+      case 'frame_create':
+        if (data.frame) {
+          setPresentation((prev) => {
+            if (!prev || prev.frames.some((frame) => frame.id === data.frame.id)) return prev;
+            return { ...prev, frames: [...prev.frames, data.frame] };
+          });
+        }
+        break;
+
       case 'frame_update':
         setPresentation((prev) => {
           if (!prev) return prev;
@@ -0,0 +1,56 @@
+import { API_BASE_URL } from '@/lib/api';
+
+const POLL_INTERVAL_MS = 1000;
+
+export interface BackgroundJob<T = any> {
+  id: number;
+  kind: string;
+  status: 'queued' | 'running' | 'succeeded' | 'failed';
+  progress: number;
+  progress_message: string;
+  result: T | null;
+  error: string | null;
+}
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+export async function waitForJob<T = any>(
+  jobId: number,
+  token: string | null,
+  onProgress?: (job: BackgroundJob<T>) => void
+): Promise<T> {
+  for (;;) {
+    const response = await fetch(`${API_BASE_URL}/jobs/${jobId}/`, {
+      headers: token ? { Authorization: `Token ${token}` } : undefined,
+    });
+    if (!response.ok) {
+      throw new Error('Could not check the status of the AI request.');
+    }
+
+    const job: BackgroundJob<T> = await response.json();
+    onProgress?.(job);
+    if (job.status === 'succeeded') {
+      return job.result as T;
+    }
+    if (job.status === 'failed') {
+      throw new Error(job.error || 'The AI request failed.');
+    }
+    await sleep(POLL_INTERVAL_MS);
+  }
+}
+
+/**
+ * Body of an AI endpoint response. The endpoints answer 202 + job_id and run
+ * in the background; the result is then read from /api/jobs/<id>/.
+ */
+export async function readJobResponse<T = any>(
+  response: Response,
+  token: string | null,
+  onProgress?: (job: BackgroundJob<T>) => void
+): Promise<T> {
+  const data = await response.json();
+  if (response.status !== 202 || !data.job_id) {
+    return data as T;
+  }
+  return waitForJob<T>(data.job_id, token, onProgress);
+}
@@ -0,0 +1,40 @@
+"""
+Recording player answers.
+
+An answer is accepted at most once per (player, question): the database's
+unique constraint decides, not a prior SELECT, so two submissions racing
+each other (a double tap, a reconnect that resends) cannot both score.
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Value
+
+from .models import Answer, Player
+
+
+def record_answer(player, question, choice, time_taken, points_awarded, is_correct):
+    """
+    Insert the answer and add its points to the player, in one transaction.
+
+    Returns True when the answer was accepted, False when the player had
+    already answered this question (nothing is written then). Score and
+    streak are updated with F() expressions, so concurrent answers of the
+    same player never overwrite each other's increments.
+    """
+    try:
+        with transaction.atomic():
+            Answer.objects.create(
+                player=player,
+                question=question,
+                choice=choice,
+                time_taken=time_taken,
+                points_awarded=points_awarded,
+            )
+            Player.objects.filter(pk=player.pk).update(
+                score=F('score') + points_awarded,
+                streak=F('streak') + 1 if is_correct else Value(0),
+            )
+    except IntegrityError:
+        # Constrângerea (player, question): răspunsul există deja
+        return False
+    return True
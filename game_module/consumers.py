@@ -1,15 +1,19 @@
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
 from asgiref.sync import sync_to_async
-from django.db.models import F, Sum, Count 
 import asyncio # Adăugat: Esențial pentru timer
 import json
+import logging
 
 # Importă modelele și serializatoarele tale
-from .models import GameSession, Player, Question, Answer, Choice
+from .models import LEADERBOARD_ORDER, GameSession, Player, Question, Answer, Choice
 from .serializers import PlayerSerializer, QuestionSerializer 
+from .answers import record_answer
+from api.instrumentation import InstrumentedConsumerMixin
 
+logger = logging.getLogger(__name__)
 
-class GameConsumer(AsyncJsonWebsocketConsumer):
+
+class GameConsumer(InstrumentedConsumerMixin, AsyncJsonWebsocketConsumer):
     
     # Stocăm referința la task-ul de timer pentru a-l putea anula
     # Acest lucru este crucial pentru a preveni rularea timer-ului dacă Gazda apasă "Next" manual
@@ -25,29 +29,27 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
             self.group_name = f'game_{self.pin}'
             self.is_player = False
 
-            print(f"WebSocket connection attempt for PIN: {self.pin}")
+            logger.debug("WebSocket connection attempt for PIN: %s", self.pin)
 
             # Preluarea sesiunii de joc
             try:
                 self.session = await sync_to_async(GameSession.objects.get)(pin=self.pin)
-                print(f"Session found: {self.session.id}, status: {self.session.status}")
+                logger.debug("Session found: %s, status: %s", self.session.id, self.session.status)
             except GameSession.DoesNotExist:
-                print(f"Session not found for PIN: {self.pin}")
+                logger.debug("Session not found for PIN: %s", self.pin)
                 await self.close()
                 return
 
             await self.channel_layer.group_add(self.group_name, self.channel_name)
             await self.accept()
-            print(f"WebSocket accepted for PIN: {self.pin}")
+            logger.debug("WebSocket accepted for PIN: %s", self.pin)
 
             # Odată conectat, trimite imediat starea curentă a lobby-ului (Playeri existenți)
             await self.send_current_lobby_state()
-            print(f"Lobby state sent for PIN: {self.pin}")
+            logger.debug("Lobby state sent for PIN: %s", self.pin)
 
-        except Exception as e:
-            print(f"Error in WebSocket connect: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error in WebSocket connect")
             await self.close() 
 
 
@@ -65,7 +67,7 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
     
     async def receive_json(self, content):
         action = content.get('type')
-        print(f"Received message: {action}, content: {content}")
+        logger.debug("Received message: %s, content: %s", action, content)
 
         if action == 'join':
             nickname = content.get('payload', {}).get('name') or content.get('payload', {}).get('nickname')
@@ -78,7 +80,7 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
         # Acțiunile Gazdei (Host)
         elif action == 'host_start' or action == 'host_next':
             is_host_result = await self.is_host()
-            print(f"Is host check: {is_host_result}, user: {self.scope.get('user')}")
+            logger.debug("Is host check: %s, user: %s", is_host_result, self.scope.get('user'))
 
             if is_host_result:
                 # Dacă Gazda apasă Next/Start, anulăm timer-ul automat
@@ -86,10 +88,10 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
                     self.question_timer_task.cancel()
                     self.question_timer_task = None
 
-                print(f"Processing host action: {action}, session status: {self.session.status}")
+                logger.debug("Processing host action: %s, session status: %s", action, self.session.status)
                 await self.process_host_action(self.session.status)
             else:
-                print(f"User is not host, ignoring action: {action}")
+                logger.debug("User is not host, ignoring action: %s", action)
 
 
     # ----------------------------------------------------
@@ -104,7 +106,7 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
             self.session = await sync_to_async(GameSession.objects.get)(pin=self.pin)
             current_status = self.session.status
 
-            print(f"Processing host action for status: {current_status}")
+            logger.debug("Processing host action for status: %s", current_status)
 
             if current_status == 'lobby':
                 await self.start_next_question()
@@ -119,10 +121,8 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
             elif current_status == 'finished':
                 pass
 
-        except Exception as e:
-            print(f"Error in process_host_action: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error in process_host_action")
             
 
     @sync_to_async
@@ -148,7 +148,7 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
         self.player_id = player.id  # Store player ID for later reference
         self.player_nickname = nickname
 
-        print(f"Player {nickname} joined with ID: {player.id}")
+        logger.debug("Player %s joined with ID: %s", nickname, player.id)
 
         # Get all players data
         players_data = await self.get_all_players_data()
@@ -172,7 +172,7 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
     @sync_to_async
     def get_all_players_data(self):
         """Preia toți jucătorii dintr-o sesiune, sortați după scor."""
-        players = Player.objects.filter(session=self.session).order_by('-score', 'id')
+        players = Player.objects.filter(session=self.session).order_by(*LEADERBOARD_ORDER)
         return PlayerSerializer(players, many=True).data
 
     
@@ -184,7 +184,7 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
             await asyncio.sleep(time_limit) 
         except asyncio.CancelledError:
             # Dacă Gazda a apăsat 'Next' manual, task-ul este anulat și ieșim
-            print("Timer canceled by host action.")
+            logger.debug("Timer canceled by host action.")
             return
         
         # Forțează publicarea scorurilor după expirarea timpului
@@ -249,12 +249,12 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
 
         # Verifică dacă sesiunea este în starea corectă pentru a primi răspunsuri
         if self.session.status != 'running':
-            print(f"Answer rejected: session status is {self.session.status}")
+            logger.debug("Answer rejected: session status is %s", self.session.status)
             return
 
         # 1. Identifică Jucătorul folosind player_id stocat
         if not hasattr(self, 'player_id'):
-            print("Answer rejected: no player_id found")
+            logger.debug("Answer rejected: no player_id found")
             return
 
         # Get player and process answer
@@ -263,7 +263,7 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
             return
 
         total_answered, points_awarded = result
-        print(f"Answer processed: player {self.player_nickname}, points: {points_awarded}, total answered: {total_answered}")
+        logger.debug("Answer processed: player %s, points: %s, total answered: %s", self.player_nickname, points_awarded, total_answered)
 
         # Send answered count to group
         await self.channel_layer.group_send(self.group_name, {
@@ -276,10 +276,14 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
         try:
             player = Player.objects.get(id=self.player_id, session=self.session)
         except Player.DoesNotExist:
-            print(f"Player not found: {self.player_id}")
+            logger.debug("Player not found: %s", self.player_id)
             return None
 
         question = self.session.current_question
+        if not question:
+            logger.debug("Question not found")
+            return None
+
         submitted_choice_index = content.get('answer')
         time_taken = content.get('time_taken', 1.0)
         try:
@@ -287,15 +291,11 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
         except (TypeError, ValueError):
             time_taken = question.time_limit
 
-        if not question or Answer.objects.filter(player=player, question=question).exists():
-            print(f"Question not found or already answered")
-            return None
-
         # 2. Identifică Opțiunea
         try:
             submitted_choice = question.choices.order_by('order')[submitted_choice_index]
         except IndexError:
-            print(f"Invalid choice index: {submitted_choice_index}")
+            logger.debug("Invalid choice index: %s", submitted_choice_index)
             return None
             
         is_correct = submitted_choice.is_correct
@@ -310,19 +310,10 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
             current_streak
         )
 
-        # 4. Salvează Răspunsul și Actualizează Jucătorul
-        Answer.objects.create(
-            player=player,
-            question=question,
-            choice=submitted_choice,
-            time_taken=time_taken,
-            points_awarded=points_awarded
-        )
-
-        player.score = F('score') + points_awarded
-        player.streak = F('streak') + 1 if is_correct else 0
-        player.save()
-        player.refresh_from_db()
+        # 4. Salvează Răspunsul și Actualizează Jucătorul (o singură dată per întrebare)
+        if not record_answer(player, question, submitted_choice, time_taken, points_awarded, is_correct):
+            logger.debug("Question already answered")
+            return None
 
         # 5. Get total answered count
         total_answered = Answer.objects.filter(question=question).count()
@@ -397,7 +388,7 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
             await sync_to_async(self.session.refresh_from_db)()
             players_data = await self.get_all_players_data()
 
-            print(f"Sending current state: {self.session.status}")
+            logger.debug("Sending current state: %s", self.session.status)
 
             # Send different messages based on current game state
             if self.session.status == 'lobby':
@@ -441,10 +432,8 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
                     'payload': {'players': players_data, 'status': self.session.status}
                 })
 
-        except Exception as e:
-            print(f"Error sending current state: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error sending current state")
         
     async def send_lobby_update(self, event):
         """Handler pentru 'send.lobby_update' (Actualizare Playeri)."""
@@ -455,8 +444,8 @@ class GameConsumer(AsyncJsonWebsocketConsumer):
                 'type': 'lobby_update',
                 'payload': {'players': event['players'], 'status': self.session.status}
             })
-        except Exception as e:
-            print(f"Error sending lobby update: {e}")
+        except Exception:
+            logger.exception("Error sending lobby update")
         
     async def send_question(self, event):
         """Handler pentru 'send.question' (Trimite noua întrebare)."""
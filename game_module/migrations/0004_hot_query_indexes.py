@@ -0,0 +1,60 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:14
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, Min
+
+
+def remove_duplicate_answers(apps, schema_editor):
+    """Keep the first answer per (player, question); the points of the others are taken back."""
+    Answer = apps.get_model('game_module', 'Answer')
+    Player = apps.get_model('game_module', 'Player')
+    duplicates = (
+        Answer.objects.values('player_id', 'question_id')
+        .annotate(first_id=Min('id'), count=Count('id'))
+        .filter(count__gt=1)
+    )
+    for row in duplicates:
+        extra = Answer.objects.filter(
+            player_id=row['player_id'], question_id=row['question_id']
+        ).exclude(id=row['first_id'])
+        points = sum(extra.values_list('points_awarded', flat=True))
+        extra.delete()
+        if points:
+            Player.objects.filter(pk=row['player_id']).update(score=F('score') - points)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game_module', '0003_gamesession_host'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='answer',
+            index=models.Index(fields=['question', 'points_awarded'], name='answer_question_points_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='choice',
+            index=models.Index(fields=['question', 'order'], name='choice_question_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['session', '-score', 'id'], name='player_session_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['session', 'nickname'], name='player_session_nickname_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['game', 'order'], name='question_game_order_idx'),
+        ),
+        migrations.RunPython(remove_duplicate_answers, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='answer',
+            constraint=models.UniqueConstraint(fields=('player', 'question'), name='answer_player_question_uniq'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-19 19:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game_module', '0004_hot_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='player',
+            name='player_session_score_idx',
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['session', '-score', '-streak', 'id'], name='player_session_score_idx'),
+        ),
+    ]
@@ -62,6 +62,10 @@ class Question(models.Model):
     order = models.IntegerField(default=0)
     media_url = models.URLField(blank=True, null=True)
 
+    class Meta:
+        # Întrebarea următoare: game + order > curent, ordonat după order
+        indexes = [models.Index(fields=['game', 'order'], name='question_game_order_idx')]
+
     def __str__(self):
         return f"Q{self.order}: {self.text[:50]}..."
 
@@ -72,10 +76,18 @@ class Choice(models.Model):
 
     order = models.IntegerField(default=0) 
 
+    class Meta:
+        indexes = [models.Index(fields=['question', 'order'], name='choice_question_order_idx')]
+
     def __str__(self):
         return f"{self.text[:30]} ({'C' if self.is_correct else 'I'})"
 
 
+# Ordinea clasamentului (REST și WebSocket), acoperită de player_session_score_idx:
+# la egalitate de scor câștigă seria mai lungă, apoi cine a intrat primul
+LEADERBOARD_ORDER = ('-score', '-streak', 'id')
+
+
 class Player(models.Model):
     """Reprezintă o participare unică la o sesiune de joc."""
     session = models.ForeignKey(GameSession, related_name='players', on_delete=models.CASCADE) 
@@ -87,7 +99,15 @@ class Player(models.Model):
     streak = models.IntegerField(default=0) 
 
     joined_at = models.DateTimeField(auto_now_add=True)
-    
+
+    class Meta:
+        indexes = [
+            # Clasamentul: jucătorii sesiunii în ordinea LEADERBOARD_ORDER
+            models.Index(fields=['session', '-score', '-streak', 'id'], name='player_session_score_idx'),
+            # Reconectarea după nickname (get_or_create)
+            models.Index(fields=['session', 'nickname'], name='player_session_nickname_idx'),
+        ]
+
     def __str__(self):
         return f"{self.nickname} in {self.session.pin}"
 
@@ -106,5 +126,13 @@ class Answer(models.Model):
     
     answered_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            # Un singur răspuns per jucător și întrebare
+            models.UniqueConstraint(fields=['player', 'question'], name='answer_player_question_uniq'),
+        ]
+        # Câte răspunsuri / câte corecte la o întrebare
+        indexes = [models.Index(fields=['question', 'points_awarded'], name='answer_question_points_idx')]
+
     def __str__(self):
         return f"Ans by {self.player.nickname} to Q{self.question.order}"
\ No newline at end of file
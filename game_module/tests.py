@@ -1,3 +1,145 @@
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, transaction
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
-# Create your tests here.
+from .answers import record_answer
+from .consumers import GameConsumer
+from .models import LEADERBOARD_ORDER, Answer, Choice, Game, GameSession, Player, Question
+
+User = get_user_model()
+
+SESSIONS = 10
+PLAYERS = 50
+QUESTIONS = 20
+
+
+class GameQueryPlanTests(TestCase):
+    """The hot queries of consumers.py and views.py use the composite indexes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        host = User.objects.create_user(username='host')
+        cls.game = Game.objects.create(title='Quiz', host=host)
+        Question.objects.bulk_create([
+            Question(game=cls.game, text=f'Q{order}', order=order) for order in range(QUESTIONS)
+        ])
+        questions = list(Question.objects.order_by('order'))
+        Choice.objects.bulk_create([
+            Choice(question=question, text=f'C{order}', is_correct=order == 0, order=order)
+            for question in questions for order in range(4)
+        ])
+        sessions = [GameSession.objects.create(game=cls.game, host=host, pin=f'{index:06d}')
+                    for index in range(SESSIONS)]
+        Player.objects.bulk_create([
+            Player(session=session, nickname=f'p{index}', score=index * 37 % 1000)
+            for session in sessions for index in range(PLAYERS)
+        ])
+        players = list(Player.objects.order_by('id'))
+        Answer.objects.bulk_create([
+            Answer(player=player, question=question, points_awarded=(player.id + question.id) % 2 * 500)
+            for player in players for question in questions[:5]
+        ])
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+        cls.session = sessions[SESSIONS // 2]
+        cls.question = questions[2]
+        cls.unanswered = questions[-1]
+        cls.player = players[len(players) // 2]
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, plan)
+        # Ordinea vine din index, fără sortare separată
+        self.assertNotIn('TEMP B-TREE', plan, plan)
+
+    def test_leaderboard(self):
+        self.assertUsesIndex(Player.objects.filter(session=self.session).order_by(*LEADERBOARD_ORDER),
+                             'player_session_score_idx')
+
+    def test_leaderboard_endpoint(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/games/session_leaderboard/', {'pin': self.session.pin})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['leaderboard']), PLAYERS)
+
+        sql, = [query['sql'] for query in queries.captured_queries if 'FROM "game_module_player"' in query['sql']]
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plan = '\n'.join(str(row) for row in cursor.fetchall())
+        self.assertIn('player_session_score_idx', plan, plan)
+        self.assertNotIn('TEMP B-TREE', plan, plan)
+
+    def test_next_question(self):
+        self.assertUsesIndex(
+            Question.objects.filter(game=self.game, order__gt=self.question.order).order_by('order'),
+            'question_game_order_idx',
+        )
+
+    def test_choice_by_index(self):
+        self.assertUsesIndex(self.question.choices.order_by('order'), 'choice_question_order_idx')
+
+    def test_answer_counts(self):
+        self.assertUsesIndex(Answer.objects.filter(question=self.question, points_awarded__gt=0),
+                             'answer_question_points_idx')
+        # Constrângerea unică e indexul căutării "a răspuns deja?" (SQLite o numește autoindex)
+        plan = Answer.objects.filter(player=self.player, question=self.question).explain()
+        self.assertRegex(plan, r'player_id=\? AND question_id=\?', plan)
+
+    def test_one_answer_per_player_and_question(self):
+        Answer.objects.create(player=self.player, question=self.unanswered)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Answer.objects.create(player=self.player, question=self.unanswered)
+
+
+class AnswerRecordingTests(TestCase):
+    def setUp(self):
+        host = User.objects.create_user(username='host')
+        game = Game.objects.create(title='Quiz', host=host)
+        self.question = Question.objects.create(game=game, text='2 + 2?', order=0)
+        self.right = Choice.objects.create(question=self.question, text='4', is_correct=True, order=0)
+        Choice.objects.create(question=self.question, text='5', order=1)
+        self.session = GameSession.objects.create(game=game, host=host, status='running',
+                                                  current_question=self.question)
+        self.player = Player.objects.create(session=self.session, nickname='ana', streak=2)
+
+    def test_second_answer_is_ignored(self):
+        self.assertTrue(record_answer(self.player, self.question, self.right, 1.0, 800, True))
+        self.assertFalse(record_answer(self.player, self.question, self.right, 1.0, 800, True))
+
+        self.player.refresh_from_db()
+        self.assertEqual((self.player.score, self.player.streak), (800, 3))
+        self.assertEqual(Answer.objects.filter(player=self.player).count(), 1)
+
+    def test_consumer_double_tap_scores_once(self):
+        consumer = GameConsumer()
+        consumer.session = self.session
+        consumer.player_id = self.player.id
+
+        total_answered, points = consumer._process_answer({'answer': 0, 'time_taken': 2})
+        self.assertIsNone(consumer._process_answer({'answer': 1, 'time_taken': 3}))
+
+        self.player.refresh_from_db()
+        self.assertEqual(total_answered, 1)
+        self.assertEqual(self.player.score, points)
+        self.assertEqual(Answer.objects.get(player=self.player).choice, self.right)
+
+
+class LeaderboardOrderTests(TestCase):
+    def test_ties_break_on_streak_then_join_order(self):
+        host = User.objects.create_user(username='host')
+        game = Game.objects.create(title='Quiz', host=host)
+        session = GameSession.objects.create(game=game, host=host, pin='424242')
+        for nickname, score, streak in [('ana', 500, 1), ('ion', 800, 0), ('dan', 500, 3), ('eva', 500, 1)]:
+            Player.objects.create(session=session, nickname=nickname, score=score, streak=streak)
+        expected = ['ion', 'dan', 'ana', 'eva']
+
+        response = self.client.get('/api/games/session_leaderboard/', {'pin': session.pin})
+        self.assertEqual([player['nickname'] for player in response.json()['leaderboard']], expected)
+
+        consumer = GameConsumer()
+        consumer.session = session
+        live = async_to_sync(consumer.get_all_players_data)()
+        self.assertEqual([player['nickname'] for player in live], expected)
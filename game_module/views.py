@@ -9,7 +9,7 @@ from django.contrib.auth import get_user_model
 from rest_framework.exceptions import PermissionDenied
 
 # Importă modelele și serializatoarele tale
-from .models import Game, GameSession, Player, Answer, Question
+from .models import LEADERBOARD_ORDER, Game, GameSession, Player, Answer, Question
 from .serializers import GameSerializer, GameSessionSerializer, PlayerSerializer
 
 User = get_user_model()
@@ -105,7 +105,8 @@ class GameViewSet(viewsets.ModelViewSet):
         except GameSession.DoesNotExist:
             return Response({"detail": "Session not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        players = Player.objects.filter(session=session).order_by('-score', '-streak', 'joined_at')
+        # Aceeași ordine ca în clasamentul live (egalitățile după serie, apoi ordinea intrării în joc)
+        players = Player.objects.filter(session=session).order_by(*LEADERBOARD_ORDER)
         
         serializer = PlayerSerializer(players, many=True)
         return Response({
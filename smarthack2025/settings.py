@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -48,6 +49,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.instrumentation.InstrumentationMiddleware',  # primul: măsoară tot request-ul
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -149,6 +151,10 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Fișiere generate local (thumbnails, upload-uri)
+MEDIA_URL = '/media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -178,3 +184,85 @@ CORS_ALLOW_CREDENTIALS = True
 
 # AI Configuration
 ANTHROPIC_API_KEY = os.environ.get('ANTHROPIC_API_KEY', 'sk-ant-REDACTED')
+# Permite un server AI local/fake (ex. în teste); None = API-ul Anthropic
+ANTHROPIC_BASE_URL = os.environ.get('ANTHROPIC_BASE_URL') or None
+# Client AI comun: concurență, retry cu backoff, limită per utilizator
+AI_REQUEST_TIMEOUT = 120  # secunde
+AI_MAX_CONCURRENCY = 8
+AI_QUEUE_TIMEOUT = 30  # secunde de așteptare pentru un slot liber
+AI_MAX_RETRIES = 3
+AI_RETRY_BACKOFF = 0.5  # secunde, dublat la fiecare reîncercare
+AI_RETRY_BACKOFF_MAX = 8
+AI_RATE_LIMIT_PER_USER = 20  # cereri AI per utilizator
+AI_RATE_LIMIT_WINDOW = 60  # secunde
+# Cache pentru răspunsuri AI (rewrite / visuals / slide advice)
+AI_CACHE_ENABLED = True
+AI_CACHE_TTL = 60 * 60  # secunde
+AI_CACHE_MAX_ENTRIES = 1000
+
+# PDF export
+# Deck-urile mari sunt randate în paralel (bucăți de frame-uri pe un pool de procese)
+PDF_EXPORT_WORKERS = int(os.environ.get('PDF_EXPORT_WORKERS', os.cpu_count() or 1))
+PDF_EXPORT_CHUNK_SIZE = 25
+PDF_EXPORT_PARALLEL_MIN_FRAMES = 40
+BULK_EXPORT_MAX_PRESENTATIONS = 200
+
+# Frame thumbnails (preview-uri low-res generate în background)
+THUMBNAILS_ENABLED = True
+THUMBNAIL_DIR = 'thumbnails'
+THUMBNAIL_WIDTH = 320
+THUMBNAIL_WORKERS = 2
+
+# Background jobs (AI generation, operații bulk)
+JOB_WORKERS = 8
+JOBS_RUN_INLINE = False  # True = job-urile rulează sincron (teste, debugging)
+JOB_HEARTBEAT_INTERVAL = 30  # secunde între heartbeat-urile job-urilor ținute de un proces
+JOB_STALE_AFTER = 5 * 60  # job queued/running fără heartbeat de atâtea secunde = proces mort
+ASSIGNMENT_BATCH_SIZE = 50  # elevi per batch la distribuirea unei prezentări
+# Endpoint-urile AI răspund cu 202 + job_id; "async": false le rulează în request (doar pentru debugging)
+AI_JOBS_DEFAULT_ASYNC = os.environ.get('AI_JOBS_DEFAULT_ASYNC', '1') == '1'
+
+# Versiuni de prezentare (keyframes + diffs)
+VERSION_KEYFRAME_INTERVAL = 20  # un snapshot complet la fiecare N versiuni
+VERSION_COMPRESS = True
+VERSION_COMPRESS_MIN_BYTES = 1024
+VERSION_CACHE_MAX_ENTRIES = 256  # snapshot-uri reconstruite ținute în memorie
+
+# Cache pentru citirea prezentărilor (ETag după revision + payload serializat)
+PRESENTATION_CACHE_MAX_ENTRIES = 512  # (prezentare, revision, permisiune)
+VIEWER_CACHE_MAX_ENTRIES = 256  # documente compilate pentru viewer-ul public, (token, revision)
+VIEWER_REVISION_TTL = 2  # secunde cât e refolosit revision-ul unui token fără a citi din DB
+SYNC_OVERLAP = 5  # secunde scăzute din cut-off-ul sync-ului incremental (scrieri încă necomise)
+SYNC_TOMBSTONE_RETENTION = 30 * 24 * 60 * 60  # secunde păstrate ștergerile; mai vechi -> reîncărcare completă
+VERSION_AUTOSAVE_INTERVAL = 5 * 60  # secunde între două versiuni automate ale aceleiași prezentări
+VERSION_AUTOSAVE_LOOKBACK = 24 * 60 * 60  # prezentări fără versiuni: editate în ultimele N secunde
+VERSION_RETAIN_ALL = 60 * 60  # păstrează toate versiunile automate mai noi de o oră
+VERSION_RETAIN_HOURLY = 24 * 60 * 60  # apoi una pe oră timp de o zi, apoi una pe zi
+
+# Instrumentare: query-uri, timp DB/serializare și latență (vezi api/instrumentation.py)
+TESTING = sys.argv[1:2] == ['test']
+INSTRUMENTATION_ENABLED = os.environ.get('INSTRUMENTATION_ENABLED', '1') == '1'
+# Log-ul de request-uri lente (cu SQL-ul lor); oprit implicit la rularea testelor
+INSTRUMENTATION_SLOW_LOG = os.environ.get('INSTRUMENTATION_SLOW_LOG', '0' if TESTING else '1') == '1'
+INSTRUMENTATION_SLOW_MS = int(os.environ.get('INSTRUMENTATION_SLOW_MS', 500))  # request-urile mai lente sunt logate
+INSTRUMENTATION_SLOW_QUERIES = int(os.environ.get('INSTRUMENTATION_SLOW_QUERIES', 50))  # la fel, după nr. de query-uri
+INSTRUMENTATION_SQL_LIMIT = 50  # câte instrucțiuni SQL se păstrează pentru log-ul de request-uri lente
+# /api/metrics/: "Authorization: Bearer <token>" (scraper-ul Prometheus) sau un user staff logat
+INSTRUMENTATION_METRICS_TOKEN = os.environ.get('INSTRUMENTATION_METRICS_TOKEN', '')
+
+# Assets (upload pe bucăți, stocare după hash)
+ASSET_UPLOAD_DIR = 'uploads'  # fișiere parțiale, sub MEDIA_ROOT
+ASSET_STORAGE_DIR = 'assets'  # assets/ab/<sha256>.ext
+ASSET_BLOB_GC_GRACE = 24 * 60 * 60  # fișierele fără referințe sunt șterse după o zi
+ASSET_UPLOAD_MAX_SIZE = 2 * 1024 ** 3  # 2 GB
+ASSET_UPLOAD_CHUNK_SIZE = 8 * 1024 ** 2  # mărimea recomandată clienților
+ASSET_UPLOAD_READ_SIZE = 64 * 1024  # bucăți citite din request și scrise pe disc
+
+# Derivate pentru imagini (thumbnail + lățimi responsive, generate în background)
+ASSET_DERIVATIVES_ENABLED = True
+ASSET_DERIVATIVE_DIR = 'asset_derivatives'  # asset_derivatives/ab/<sha256>/<kind>-<width>.<ext>
+ASSET_DERIVATIVE_WIDTHS = (480, 960, 1440, 1920)  # nu se face upscale
+ASSET_DERIVATIVE_WEBP = True  # variantă WebP pentru fiecare lățime
+ASSET_DERIVATIVE_QUALITY = 80
+ASSET_DERIVATIVE_WORKERS = 2
+ASSET_THUMBNAIL_WIDTH = 320